@@ -0,0 +1,136 @@
+"""
+Benchmark: per-driver HTTP pools versus the shared connection pool
+Runs the same command load against a local stand-in Appium server twice:
+once with a default AppiumConnection per driver (what webdriver.Remote builds
+on its own) and once with open_connection(). Each driver issues its commands
+from several threads at once, like the suites do with their screenshot and
+pre-warm threads. Reports the per-command latency and how many TCP
+connections the server had to accept. --connect-ms adds a set-up cost to
+every new connection, to model a remote Appium host on the device farm.
+
+Usage:
+    python benchmarks/bench_connection_pool.py [--drivers 7] [--commands 200] [--threads 4] [--connect-ms 0]
+"""
+
+# ===== Imports =====
+import argparse
+import json
+import logging
+import socket
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from typing import Callable, Dict, List
+
+from appium.webdriver.appium_connection import AppiumConnection
+from selenium.webdriver.remote.command import Command
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+from mobile_automation.connection import PoolSettings, close_shared_pools, open_connection
+
+# ===== Stand-in Server =====
+class StandInHandler(BaseHTTPRequestHandler):
+    """Answers every WebDriver request with an empty success value over a kept-alive connection"""
+
+    protocol_version = "HTTP/1.1"
+    connections = 0
+    connect_seconds = 0.0
+    lock = threading.Lock()
+
+    def setup(self):
+        super().setup()
+        # Send headers and body without waiting for the client's delayed ACK
+        self.connection.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+        with StandInHandler.lock:
+            StandInHandler.connections += 1
+        time.sleep(self.connect_seconds)
+
+    def _reply(self):
+        length = int(self.headers.get("Content-Length") or 0)
+        if length:
+            self.rfile.read(length)
+        body = json.dumps({"value": None}).encode()
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json; charset=utf-8")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    do_GET = do_POST = do_DELETE = _reply
+
+    def log_message(self, format, *args):
+        pass
+
+def start_server() -> ThreadingHTTPServer:
+    server = ThreadingHTTPServer(("127.0.0.1", 0), StandInHandler)
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+# ===== Scenarios =====
+def run_scenario(make_connection: Callable, drivers: int, commands: int, threads: int) -> Dict:
+    """Issue commands through one connection per driver, from several threads per driver"""
+    StandInHandler.connections = 0
+    latencies: List[float] = []
+    lock = threading.Lock()
+
+    def worker(connection, count):
+        local = []
+        for _ in range(count):
+            start = time.perf_counter()
+            connection.execute(Command.GET_PAGE_SOURCE, {"sessionId": "bench"})
+            local.append(time.perf_counter() - start)
+        with lock:
+            latencies.extend(local)
+
+    start = time.perf_counter()
+    for _ in range(drivers):
+        connection = make_connection()
+        with ThreadPoolExecutor(max_workers=threads) as executor:
+            for _ in range(threads):
+                executor.submit(worker, connection, commands // threads)
+        connection.close()
+    wall = time.perf_counter() - start
+    latencies.sort()
+    return {
+        "commands": len(latencies),
+        "mean_ms": sum(latencies) / len(latencies) * 1000,
+        "p95_ms": latencies[int(0.95 * len(latencies)) - 1] * 1000,
+        "wall_s": wall,
+        "tcp_connections": StandInHandler.connections,
+    }
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Compare per-driver HTTP pools with the shared connection pool")
+    parser.add_argument("--drivers", type=int, default=7, help="sessions created one after another (default: 7 suites)")
+    parser.add_argument("--commands", type=int, default=200, help="commands per driver")
+    parser.add_argument("--threads", type=int, default=4, help="threads issuing commands on each driver")
+    parser.add_argument("--connect-ms", type=float, default=0.0, help="set-up cost of each new TCP connection")
+    args = parser.parse_args(argv)
+    StandInHandler.connect_seconds = args.connect_ms / 1000
+
+    # urllib3 warns each time a per-driver pool throws away a surplus connection
+    logging.getLogger("urllib3.connectionpool").setLevel(logging.ERROR)
+    server = start_server()
+    url = f"http://127.0.0.1:{server.server_address[1]}"
+    try:
+        scenarios = {
+            "per-driver pools": lambda: AppiumConnection(url, keep_alive=True),
+            "shared pool": lambda: open_connection(url, PoolSettings(pool_size=args.threads)),
+        }
+        print(f"\n=== CONNECTION POOL BENCHMARK ({args.drivers} drivers x {args.commands} commands, "
+              f"{args.threads} threads each, {args.connect_ms:g}ms connection set-up) ===")
+        print(f"  {'Scenario':<18}{'Mean':>9}{'p95':>9}{'Wall':>9}{'TCP conns':>11}")
+        for name, factory in scenarios.items():
+            result = run_scenario(factory, args.drivers, args.commands, args.threads)
+            print(f"  {name:<18}{result['mean_ms']:>7.2f}ms{result['p95_ms']:>7.2f}ms"
+                  f"{result['wall_s']:>8.2f}s{result['tcp_connections']:>11}")
+    finally:
+        close_shared_pools()
+        server.shutdown()
+
+if __name__ == "__main__":
+    main()
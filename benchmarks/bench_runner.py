@@ -0,0 +1,263 @@
+"""
+Benchmark: end-to-end runner wall time and per-suite overhead
+Runs 00main_test_runner.main and each run_zoomcat_* entry point against the
+local fake Appium server (fake_appium_server.py), so every run sees the same
+screens and the same command latencies. For each scenario it reports:
+
+  wall      total time of the run
+  sleep     time.sleep calls made by the suites outside explicit waits
+  wait      time inside WebDriverWait.until/until_not (polls and their sleeps)
+  commands  Appium round trips issued outside explicit waits
+  overhead  everything else: Python, report writing, locator compilation
+  count     commands the fake server answered
+  report    bytes written to the report directory
+
+Results are written as JSON (default benchmarks/results/bench_runner_<commit>.json);
+pass --compare with an earlier file to print the change per scenario.
+
+Usage:
+    python benchmarks/bench_runner.py [--only runner,logout] [--latency-ms 0] [--compare OLD.json]
+"""
+
+# ===== Imports =====
+import argparse
+import contextlib
+import importlib.util
+import io
+import json
+import os
+import shutil
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+from pathlib import Path
+from typing import Callable, Dict, Optional
+
+from selenium.webdriver.remote.remote_connection import RemoteConnection
+from selenium.webdriver.support.wait import WebDriverWait
+
+REPO_ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(REPO_ROOT))
+sys.path.insert(0, str(REPO_ROOT / "tests"))
+sys.path.insert(0, str(REPO_ROOT / "benchmarks"))
+from fake_appium_server import SERVER_THREAD_NAME, FakeDevice, parse_command_latency, start_fake_server
+from mobile_automation.config import Config
+from mobile_automation.connection import close_shared_pools
+from mobile_automation.profiler import PROFILE
+from mobile_automation.screenshots import flush_screenshots, reset_screenshot_store
+from mobile_automation.session_pool import create_driver
+
+RESULTS_DIR = REPO_ROOT / "benchmarks" / "results"
+
+# ===== Time Accounting =====
+class TimeAccount:
+    """
+    Splits the suites' time into sleeps, explicit waits and Appium commands.
+    Every thread but the fake server's is measured; with one device the
+    runner's suites run one at a time, so the buckets add up to at most the
+    wall time.
+    """
+
+    def __init__(self):
+        self.sleep = self.wait = self.commands = 0.0
+        self._local = threading.local()
+        self._lock = threading.Lock()
+        self._originals = {}
+
+    def _measured(self, bucket: str, function: Callable) -> Callable:
+        account = self
+
+        def _wrapper(*args, **kwargs):
+            # The fake server's own delays and calls nested in a measured call are not counted again
+            local = account._local
+            if getattr(local, "depth", 0) or threading.current_thread().name.startswith(SERVER_THREAD_NAME):
+                return function(*args, **kwargs)
+            local.depth = 1
+            start = time.perf_counter()
+            try:
+                return function(*args, **kwargs)
+            finally:
+                local.depth = 0
+                with account._lock:
+                    setattr(account, bucket, getattr(account, bucket) + time.perf_counter() - start)
+
+        return _wrapper
+
+    def install(self):
+        targets = [(time, "sleep", "sleep"), (WebDriverWait, "until", "wait"), (WebDriverWait, "until_not", "wait"),
+                   (RemoteConnection, "execute", "commands")]
+        for owner, attribute, bucket in targets:
+            original = getattr(owner, attribute)
+            self._originals[(owner, attribute)] = original
+            setattr(owner, attribute, self._measured(bucket, original))
+
+    def uninstall(self):
+        for (owner, attribute), original in self._originals.items():
+            setattr(owner, attribute, original)
+        self._originals.clear()
+
+    def reset(self):
+        self.sleep = self.wait = self.commands = 0.0
+
+def directory_bytes(path: Path) -> int:
+    """Bytes on disk under path, counting hard-linked screenshots once"""
+    inodes = {}
+    for file in path.rglob("*"):
+        if file.is_file():
+            stat = file.stat()
+            inodes[(stat.st_dev, stat.st_ino)] = stat.st_size
+    return sum(inodes.values())
+
+# ===== Scenarios =====
+def import_test_module(filename: str):
+    """Import a module from tests/ by file name (some contain spaces)"""
+    path = REPO_ROOT / "tests" / filename
+    spec = importlib.util.spec_from_file_location(path.stem.replace(" ", "_"), str(path))
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+def runner_scenario(url: str):
+    runner = import_test_module("00main_test_runner.py")
+    try:
+        runner.main(["--devices", f"{Config.CAPABILITIES['appium:deviceName']}@{url}"])
+    except SystemExit as e:
+        return "PASSED" if e.code == 0 else "FAILED"
+
+def entry_point_scenario(filename: str, function: str):
+    """Run one run_zoomcat_* entry point on a driver of its own"""
+    def _run(url: str):
+        driver = create_driver(url, Config.CAPABILITIES)
+        try:
+            return getattr(import_test_module(filename), function)(driver)
+        finally:
+            flush_screenshots()
+            driver.quit()
+    return _run
+
+# name -> (run, whether the test account starts logged in)
+SCENARIOS: Dict[str, tuple] = {
+    "runner": (runner_scenario, False),
+    "login": (entry_point_scenario("Login via Verification Code.py", "run_zoomcat_login_tests"), False),
+    "login_by_password": (entry_point_scenario("Login_by_Password.py", "run_zoomcat_password_login_tests"), False),
+    "purchase_history": (entry_point_scenario("Purchase_History_Test.py", "run_zoomcat_purchase_history_tests"), True),
+    "connection_flow": (entry_point_scenario("Connection_Flow_Test.py", "run_zoomcat_connection_flow_tests"), True),
+    "logout": (entry_point_scenario("Logout_Test.py", "run_zoomcat_logout_tests"), True),
+}
+
+def run_scenario(name: str, account: TimeAccount, server_options: Dict, keep_reports: bool) -> Dict:
+    """Run one scenario in a scratch working directory and measure it"""
+    run, logged_in = SCENARIOS[name]
+    server, url = start_fake_server(device=FakeDevice(logged_in=logged_in), **server_options)
+    workdir = Path(tempfile.mkdtemp(prefix=f"bench_{name}_"))
+    previous_cwd = os.getcwd()
+    output = io.StringIO()
+    PROFILE.clear()
+    account.reset()
+    os.chdir(workdir)
+    start = time.perf_counter()
+    try:
+        with contextlib.redirect_stdout(output):
+            try:
+                result = run(url)
+            finally:
+                # Manifests are written while the scratch directory still exists
+                reset_screenshot_store()
+    finally:
+        wall = time.perf_counter() - start
+        os.chdir(previous_cwd)
+        server.shutdown()
+        close_shared_pools()
+    (workdir / "output.log").write_text(output.getvalue(), encoding="utf-8")
+    counts = server.RequestHandlerClass.appium.command_counts
+    measured = {
+        "result": str(result),
+        "wall_seconds": round(wall, 3),
+        "sleep_seconds": round(account.sleep, 3),
+        "wait_seconds": round(account.wait, 3),
+        "command_seconds": round(account.commands, 3),
+        "overhead_seconds": round(max(wall - account.sleep - account.wait - account.commands, 0.0), 3),
+        "commands": sum(counts.values()),
+        "commands_by_name": dict(sorted(counts.items())),
+        "report_bytes": directory_bytes(workdir / "reports") if (workdir / "reports").exists() else 0,
+    }
+    if keep_reports:
+        measured["workdir"] = str(workdir)
+    else:
+        shutil.rmtree(workdir, ignore_errors=True)
+    return measured
+
+# ===== Results =====
+def git_commit() -> str:
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], cwd=REPO_ROOT, capture_output=True,
+                              text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return "unknown"
+
+def print_results(results: Dict, baseline: Optional[Dict] = None):
+    print(f"\n=== RUNNER BENCHMARK (commit {results['commit']}) ===")
+    print(f"  {'Scenario':<20}{'Wall':>9}{'Sleep':>9}{'Wait':>9}{'Cmds':>9}{'Other':>9}{'Count':>7}{'Report':>10}"
+          f"  Result")
+    for name, scenario in results["scenarios"].items():
+        print(f"  {name:<20}{scenario['wall_seconds']:>8.2f}s{scenario['sleep_seconds']:>8.2f}s"
+              f"{scenario['wait_seconds']:>8.2f}s{scenario['command_seconds']:>8.2f}s"
+              f"{scenario['overhead_seconds']:>8.2f}s{scenario['commands']:>7}"
+              f"{scenario['report_bytes'] / 1024:>8.0f}KB  {scenario['result']}")
+    if not baseline:
+        return
+    print(f"\n  Change since {baseline.get('commit', '?')}:")
+    for name, scenario in results["scenarios"].items():
+        before = baseline.get("scenarios", {}).get(name)
+        if not before:
+            continue
+        changes = []
+        for key, label in (("wall_seconds", "wall"), ("sleep_seconds", "sleep"), ("wait_seconds", "wait"),
+                           ("overhead_seconds", "other")):
+            changes.append(f"{label} {scenario[key] - before[key]:+.2f}s")
+        changes.append(f"commands {scenario['commands'] - before['commands']:+d}")
+        changes.append(f"report {(scenario['report_bytes'] - before['report_bytes']) / 1024:+.0f}KB")
+        print(f"    {name}: " + ", ".join(changes))
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark the runner and each suite against the fake Appium server")
+    parser.add_argument("--only", default="", help=f"comma-separated scenarios (default: all of {', '.join(SCENARIOS)})")
+    parser.add_argument("--latency-ms", type=float, default=0.0, help="fake server delay added to every command")
+    parser.add_argument("--command-latency", default="", metavar="CMD=MS[,...]", help="per-command fake server delays")
+    parser.add_argument("--session-ms", type=float, default=0.0, help="fake server session creation time")
+    parser.add_argument("--output", default=None, help="results file (default: benchmarks/results/bench_runner_<commit>.json)")
+    parser.add_argument("--compare", default=None, metavar="JSON", help="earlier results file to compare against")
+    parser.add_argument("--keep-reports", action="store_true", help="keep each scenario's working directory and log")
+    args = parser.parse_args(argv)
+
+    names = [name.strip() for name in args.only.split(",") if name.strip()] or list(SCENARIOS)
+    unknown = [name for name in names if name not in SCENARIOS]
+    if unknown:
+        parser.error(f"unknown scenarios: {', '.join(unknown)}")
+    server_options = {"latency_ms": args.latency_ms, "command_latency_ms": parse_command_latency(args.command_latency),
+                      "session_ms": args.session_ms}
+
+    results = {"commit": git_commit(), "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S"),
+               "options": {key: value for key, value in vars(args).items() if key not in ("output", "compare")},
+               "scenarios": {}}
+    account = TimeAccount()
+    account.install()
+    try:
+        for name in names:
+            print(f"Running {name}...", flush=True)
+            results["scenarios"][name] = run_scenario(name, account, server_options, args.keep_reports)
+    finally:
+        account.uninstall()
+
+    # Read the baseline first: it may be the file this run is about to overwrite
+    baseline = json.loads(Path(args.compare).read_text(encoding="utf-8")) if args.compare else None
+    output = Path(args.output) if args.output else RESULTS_DIR / f"bench_runner_{results['commit']}.json"
+    output.parent.mkdir(parents=True, exist_ok=True)
+    output.write_text(json.dumps(results, indent=2), encoding="utf-8")
+    print_results(results, baseline)
+    print(f"\nResults saved: {output}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,89 @@
+"""
+Check: every queued screenshot is written when the process exits
+The standalone suites capture a final frame and exit straight away. This
+check starts a child process that queues frames through capture_screenshot
+and calls sys.exit() without flushing, then verifies that the child exits
+in time and that every step file is on disk. It runs once per output format
+and once with the encoder pool already shut down, so the writer thread has to
+encode inline.
+
+Usage:
+    python benchmarks/check_screenshot_exit.py [--frames 24] [--timeout 30]
+"""
+
+# ===== Imports =====
+import argparse
+import os
+import subprocess
+import sys
+import tempfile
+from pathlib import Path
+
+REPO_ROOT = Path(__file__).resolve().parent.parent
+
+CHILD = """
+import base64, sys
+sys.path.insert(0, {repo!r})
+sys.path.insert(0, {benchmarks!r})
+from fake_appium_server import screenshot_png
+from mobile_automation import screenshots
+
+class Driver:
+    session_id = "exit-check"
+    frame = 0
+    def get_screenshot_as_base64(self):
+        self.frame += 1
+        return base64.b64encode(screenshot_png(f"frame {{self.frame}}")).decode("ascii")
+
+if {output_format!r}:
+    screenshots.set_output_format({output_format!r})
+driver = Driver()
+screenshots.capture_screenshot(driver, "reports/check/0_first.png")
+if {pool_shut_down!r}:
+    screenshots._writer.flush()
+    screenshots._writer._encoders.shutdown()
+for step in range(1, {frames}):
+    screenshots.capture_screenshot(driver, f"reports/check/{{step}}_step.png")
+sys.exit()
+"""
+
+# (name, output format, shut the encoder pool down before queueing)
+CASES = [
+    ("png", "", False),
+    ("webp", "webp:80:0.5", False),
+    ("pool shut down", "", True),
+]
+
+def run_case(output_format: str, pool_shut_down: bool, frames: int, timeout: float) -> str:
+    """Run one child; returns an error message, or an empty string when every frame was written"""
+    with tempfile.TemporaryDirectory(prefix="screenshot_exit_") as workdir:
+        script = CHILD.format(repo=str(REPO_ROOT), benchmarks=str(REPO_ROOT / "benchmarks"),
+                              output_format=output_format, pool_shut_down=pool_shut_down, frames=frames)
+        try:
+            result = subprocess.run([sys.executable, "-c", script], cwd=workdir, capture_output=True,
+                                    text=True, timeout=timeout)
+        except subprocess.TimeoutExpired:
+            return f"did not exit within {timeout:g}s"
+        if result.returncode != 0:
+            return f"exited with {result.returncode}: {result.stderr.strip().splitlines()[-1:]}"
+        report_dir = Path(workdir) / "reports" / "check"
+        written = [name for name in os.listdir(report_dir) if name != "manifest.json"] if report_dir.exists() else []
+        if len(written) != frames:
+            return f"wrote {len(written)} of {frames} frames"
+        return ""
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--frames", type=int, default=24)
+    parser.add_argument("--timeout", type=float, default=30)
+    args = parser.parse_args(argv)
+
+    failures = 0
+    for name, output_format, pool_shut_down in CASES:
+        error = run_case(output_format, pool_shut_down, args.frames, args.timeout)
+        print(f"  {name:<16} {'FAILED: ' + error if error else 'ok'}")
+        failures += bool(error)
+    return 1 if failures else 0
+
+if __name__ == "__main__":
+    sys.exit(main())
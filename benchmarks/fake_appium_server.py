@@ -0,0 +1,726 @@
+"""
+Local stand-in for an Appium server driving the ZoomCat app
+Speaks enough of the W3C WebDriver and Appium protocol for the suites in
+tests/ (sessions, element lookup by every strategy the suites use, click,
+send keys, clear, page source, screenshots, app activation, keyboard and
+recording commands) and serves scripted ZoomCat screens instead of a phone.
+
+Each screen lists the Locators names visible on it. Its UiAutomator2-style
+hierarchy is generated from the XPaths of those names in
+mobile_automation/config.py and in the suites' own Locators classes, so the
+suites find their elements with their real locators. Clicking an element
+moves the app to the screen named in the screen's transitions. As on the
+device, a *_FIELD locator that selects a container gets an EditText inside
+it, and only editable classes accept a value.
+
+Every command can be delayed to model the device round trip:
+
+    python benchmarks/fake_appium_server.py --port 4723 --latency-ms 30 \
+        --command-latency screenshot=250,getPageSource=120 --session-ms 3000
+
+then point APPIUM_SERVER (or the runner's --devices UDID@http://127.0.0.1:PORT)
+at it.
+"""
+
+# ===== Imports =====
+import argparse
+import base64
+import copy
+import hashlib
+import json
+import re
+import socket
+import struct
+import sys
+import threading
+import time
+import uuid
+import zlib
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+from lxml import etree
+from selenium.webdriver.common.keys import Keys
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+from mobile_automation.config import Config
+from mobile_automation.locator_compiler import REPO_ROOT, locators_in_file
+from mobile_automation.snapshot import to_xpath
+from mobile_automation.text_entry import EDITABLE_CLASSES
+
+APP_PACKAGE = Config.CAPABILITIES["appium:appPackage"]
+LAUNCHER_PACKAGE = "com.google.android.apps.nexuslauncher"
+ELEMENT_KEY = "element-6066-11e4-a52e-4f735466cecf"
+SCREEN_WIDTH, SCREEN_HEIGHT = 1080, 2340
+SERVER_THREAD_NAME = "fake-appium"
+
+# Private node attributes: the Locators names a node was built for, and its element id
+NAME_ATTRIBUTE = "zc-names"
+ID_ATTRIBUTE = "zc-id"
+
+# ===== Locators =====
+def load_locators() -> Dict[str, List[str]]:
+    """Every XPath of every Locators name in the repository (the suites do not all agree)"""
+    locators: Dict[str, List[str]] = {}
+    sources = [REPO_ROOT / "mobile_automation" / "config.py"] + sorted((REPO_ROOT / "tests").glob("*.py"))
+    for path in sources:
+        for name, xpath in locators_in_file(path).items():
+            if xpath not in locators.setdefault(name, []):
+                locators[name].append(xpath)
+    return locators
+
+# ===== Screens =====
+class Screen:
+    """One scripted app screen: the Locators names on it and where clicking them leads"""
+
+    def __init__(self, names: List[str], transitions: Optional[Dict[str, str]] = None,
+                 package: str = APP_PACKAGE, back: Optional[str] = None):
+        self.names = names
+        self.transitions = transitions or {}
+        self.package = package
+        self.back = back
+
+TABS = ["BUY_TAB", "BLOG_TAB", "CONNECT_TAB"]
+TAB_TRANSITIONS = {"BUY_TAB": "purchase", "BLOG_TAB": "blog", "CONNECT_TAB": "home"}
+
+SCREENS: Dict[str, Screen] = {
+    # Login / logout
+    "login": Screen(["EMAIL_FIELD", "VERIFICATION_CODE_FIELD", "TERMS_CHECKBOX", "LOGIN_BUTTON", "PASSWORD_BUTTON",
+                     "LOGIN_PAGE_VERIFICATION"],
+                    {"LOGIN_BUTTON": "home", "PASSWORD_BUTTON": "login_password"}),
+    "login_password": Screen(["EMAIL_FIELD", "PASSWORD_FIELD", "TERMS_CHECKBOX", "LOGIN_BUTTON"],
+                             {"LOGIN_BUTTON": "home"}, back="login"),
+    "profile": Screen(["PROFILE_ICON", "MY_ACCOUNT_SECTION", "MY_ACCOUNT_BUTTON", "ORDER_HISTORY_SECTION"],
+                      {"MY_ACCOUNT_SECTION": "my_account", "MY_ACCOUNT_BUTTON": "my_account",
+                       "ORDER_HISTORY_SECTION": "order_history"}, back="home"),
+    "my_account": Screen(["LOGOUT_BUTTON"], {"LOGOUT_BUTTON": "logout_confirm"}, back="profile"),
+    "logout_confirm": Screen(["CONFIRMATION_POPUP", "CONFIRM_BUTTON"], {"CONFIRM_BUTTON": "login"}, back="my_account"),
+    # Connect page and connection flow
+    "home": Screen(["PROFILE_ICON", "CONNECT_BUTTON"] + TABS,
+                   dict(TAB_TRANSITIONS, PROFILE_ICON="profile", CONNECT_BUTTON="connected")),
+    "connected": Screen(["PROFILE_ICON", "CONNECTION_TIMER", "IP_LIST_SCROLL_VIEW", "DISCONNECT_BUTTON"] + TABS,
+                        dict(TAB_TRANSITIONS, IP_LIST_SCROLL_VIEW="ip_list", DISCONNECT_BUTTON="home")),
+    "ip_list": Screen(["STICKY_IPS_TEXT", "AKTEST_116_SELECTION"], {"AKTEST_116_SELECTION": "ip_options"},
+                      back="connected"),
+    "ip_options": Screen(["STICKY_IPS_TEXT", "RANDOM_OPTION"], {"RANDOM_OPTION": "ip_confirm"}, back="ip_list"),
+    "ip_confirm": Screen(["CONFIRMATION_POPUP", "CONFIRM_BUTTON"], {"CONFIRM_BUTTON": "reconnected"},
+                         back="ip_options"),
+    "reconnected": Screen(["PROFILE_ICON", "CONNECTION_TIMER_AFTER_IP_SWITCH", "IP_LIST_SCROLL_VIEW",
+                           "DISCONNECT_BUTTON"] + TABS,
+                          dict(TAB_TRANSITIONS, IP_LIST_SCROLL_VIEW="ip_list", DISCONNECT_BUTTON="home")),
+    # Purchase and purchase history
+    "purchase": Screen(["PURCHASE_BUTTON"] + TABS, dict(TAB_TRANSITIONS, PURCHASE_BUTTON="google_play")),
+    "google_play": Screen(["GOOGLE_PLAY_IMAGE", "ONE_TAP_BUY_BUTTON"], {"ONE_TAP_BUY_BUTTON": "purchase_success"},
+                          package="com.android.vending", back="purchase"),
+    "purchase_success": Screen(["PURCHASE_SUCCESSFUL_SCREEN", "GO_TO_CONNECT_BUTTON"],
+                               {"GO_TO_CONNECT_BUTTON": "home"}),
+    "order_history": Screen(["ORDER_HISTORY_SECTION", "COPY_BUTTON", "BACK_BUTTON"], {"BACK_BUTTON": "home"},
+                            back="home"),
+    # Blog and complaint submission
+    "blog": Screen(["AT_9365"] + TABS, dict(TAB_TRANSITIONS, AT_9365="blog_category")),
+    "blog_category": Screen(["AT_ARTICLE_459461"], {"AT_ARTICLE_459461": "article"}, back="blog"),
+    "article": Screen(["COMPLAINT_BUTTON", "BACK_BUTTON"], {"COMPLAINT_BUTTON": "complaint", "BACK_BUTTON": "blog"},
+                      back="blog_category"),
+    "complaint": Screen(["COMPLAINT_DETAILS_FIELD", "SUBMIT_BUTTON"], {"SUBMIT_BUTTON": "complaint_submitted"},
+                        back="article"),
+    "complaint_submitted": Screen(["SUBMIT_SUCCESSFULLY_MESSAGE", "BACK_BUTTON"], {"BACK_BUTTON": "blog"},
+                                  back="blog"),
+}
+
+# ===== Hierarchy Builder =====
+_INSTANCE = re.compile(r"^\((?P<inner>.+)\)\[(?P<index>\d+)\]$")
+_STEP = re.compile(r"^(?P<tag>[\w.]+)(?:\[(?P<predicates>@[^\]]+)\])?(?:\[(?P<index>\d+)\])?$")
+_PREDICATE = re.compile(r'@(?P<attribute>[\w-]+)\s*=\s*"(?P<value>[^"]*)"')
+
+def _split_steps(path: str) -> List[str]:
+    """Split an XPath on the slashes outside predicates"""
+    steps, depth, current = [], 0, ""
+    for char in path:
+        if char == "[":
+            depth += 1
+        elif char == "]":
+            depth -= 1
+        if char == "/" and depth == 0:
+            steps.append(current)
+            current = ""
+        else:
+            current += char
+    steps.append(current)
+    return steps
+
+def _new_node(parent, tag: str, attributes: Dict[str, str]):
+    node = etree.SubElement(parent, tag)
+    node.set("class", tag)
+    for attribute, value in attributes.items():
+        node.set(attribute, value)
+    return node
+
+def _child_for_step(parent, step: str):
+    """Find (or create) the child of parent that the XPath step selects"""
+    match = _STEP.match(step)
+    if match is None:
+        raise ValueError(f"Unsupported XPath step: {step}")
+    tag = match.group("tag")
+    predicates = dict(_PREDICATE.findall(match.group("predicates") or ""))
+    candidates = [child for child in parent
+                  if child.tag == tag and all(child.get(key) == value for key, value in predicates.items())]
+    wanted = int(match.group("index") or 1)
+    while len(candidates) < wanted:
+        candidates.append(_new_node(parent, tag, predicates))
+    return candidates[wanted - 1]
+
+def materialize(root, xpath: str, name: str):
+    """Add the nodes xpath needs to the hierarchy and tag the node it selects with name"""
+    container = root[0]
+    instance = _INSTANCE.match(xpath)
+    path = instance.group("inner") if instance else xpath
+    steps = _split_steps(path)
+    if path.startswith("//"):
+        parent, steps = container, steps[2:]
+    elif path.startswith("/hierarchy"):
+        parent, steps = root, steps[2:]
+    else:
+        raise ValueError(f"Unsupported XPath: {xpath}")
+
+    if instance:
+        # (//X)[n]: the n-th X in document order, so add siblings until there are n of them
+        wanted = int(instance.group("index"))
+        while len(root.xpath(path)) < wanted:
+            node = parent
+            for step in steps:
+                match = _STEP.match(step)
+                node = _new_node(node, match.group("tag"), dict(_PREDICATE.findall(match.group("predicates") or "")))
+        node = root.xpath(path)[wanted - 1]
+    else:
+        node = parent
+        for step in steps:
+            node = _child_for_step(node, step)
+    names = node.get(NAME_ATTRIBUTE, "").split()
+    node.set(NAME_ATTRIBUTE, " ".join(names + [name]))
+
+def add_text_inputs(root):
+    """Put an EditText inside every field whose locator selects a container, as the ZoomCat layouts do"""
+    for node in list(root.iter()):
+        names = node.get(NAME_ATTRIBUTE, "").split()
+        if node.tag in EDITABLE_CLASSES or not any(name.endswith("_FIELD") for name in names):
+            continue
+        secret = any("PASSWORD" in name for name in names)
+        _new_node(node, "android.widget.EditText", {"password": "true" if secret else "false"})
+
+def build_hierarchy(screen: Screen, locators: Dict[str, List[str]]):
+    """The UiAutomator2-style page source tree of a screen"""
+    root = etree.Element("hierarchy", index="0", rotation="0", width=str(SCREEN_WIDTH), height=str(SCREEN_HEIGHT))
+    root.set("class", "hierarchy")
+    _new_node(root, "android.widget.FrameLayout", {})
+    for name in screen.names:
+        for xpath in locators.get(name, []):
+            materialize(root, xpath, name)
+    add_text_inputs(root)
+    root.set(ID_ATTRIBUTE, uuid.uuid4().hex)
+    row_height = 40
+    for position, node in enumerate(root.iter()):
+        if node is root:
+            continue
+        defaults = {"text": "", "content-desc": "", "resource-id": "", "package": screen.package,
+                    "checkable": "false", "checked": "false", "clickable": "true", "enabled": "true",
+                    "focusable": "true", "focused": "false", "displayed": "true"}
+        for attribute, value in defaults.items():
+            if node.get(attribute) is None:
+                node.set(attribute, value)
+        node.set("index", str(node.getparent().index(node)))
+        top = (position * row_height) % SCREEN_HEIGHT
+        node.set("bounds", f"[0,{top}][{SCREEN_WIDTH},{top + row_height}]")
+        node.set(ID_ATTRIBUTE, uuid.uuid4().hex)
+    return root
+
+def ambiguous_locators(locators: Optional[Dict[str, List[str]]] = None) -> List[str]:
+    """Locators whose first match on a screen is not the node built for them"""
+    locators = locators or load_locators()
+    problems = []
+    for screen_name, screen in SCREENS.items():
+        root = build_hierarchy(screen, locators)
+        for name in screen.names:
+            for xpath in locators.get(name, []):
+                matches = root.xpath(xpath)
+                if not matches or name not in matches[0].get(NAME_ATTRIBUTE, "").split():
+                    problems.append(f"{screen_name}: {name} -> {xpath}")
+    return problems
+
+def screenshot_png(seed: str, width: int = 36, height: int = 64) -> bytes:
+    """A small grayscale PNG whose blocks are derived from the screen contents"""
+    digest = hashlib.sha256(seed.encode("utf-8")).digest()
+    rows = b""
+    for y in range(height):
+        rows += b"\x00" + bytes(digest[(y // 8 * 4 + x // 9) % len(digest)] for x in range(width))
+
+    def chunk(kind: bytes, data: bytes) -> bytes:
+        return struct.pack(">I", len(data)) + kind + data + struct.pack(">I", zlib.crc32(kind + data) & 0xFFFFFFFF)
+
+    return (b"\x89PNG\r\n\x1a\n" + chunk(b"IHDR", struct.pack(">IIBBBBB", width, height, 8, 0, 0, 0, 0))
+            + chunk(b"IDAT", zlib.compress(rows)) + chunk(b"IEND", b""))
+
+# ===== Device =====
+class WebDriverError(Exception):
+    """A W3C error response"""
+
+    def __init__(self, error: str, message: str, status: int = 404):
+        super().__init__(message)
+        self.error = error
+        self.status = status
+
+class FakeDevice:
+    """The phone behind the fake server: the app's current screen and its login state"""
+
+    def __init__(self, locators: Optional[Dict[str, List[str]]] = None, logged_in: bool = False):
+        self.locators = locators or load_locators()
+        self.logged_in = logged_in
+        self.app_running = False
+        self.screen_name: Optional[str] = None
+        self.root = None
+        self.focused = None
+        self.keyboard_shown = False
+        self.lock = threading.RLock()
+
+    # ----- App state -----
+    def show(self, screen_name: Optional[str]):
+        self.screen_name = screen_name
+        self.focused = None
+        self.keyboard_shown = False
+        if screen_name == "home":
+            self.logged_in = True
+        elif screen_name == "login":
+            self.logged_in = False
+        screen = SCREENS[screen_name] if screen_name else Screen([], package=LAUNCHER_PACKAGE)
+        self.root = build_hierarchy(screen, self.locators)
+
+    def launch(self):
+        """Start the app (noReset: a logged-in user lands on the Connect page)"""
+        if not self.app_running:
+            self.app_running = True
+            self.show("home" if self.logged_in else "login")
+
+    def terminate(self) -> bool:
+        was_running = self.app_running
+        self.app_running = False
+        self.show(None)
+        return was_running
+
+    @property
+    def package(self) -> str:
+        return SCREENS[self.screen_name].package if self.screen_name else LAUNCHER_PACKAGE
+
+    def back(self):
+        screen = SCREENS.get(self.screen_name)
+        if self.keyboard_shown:
+            self.keyboard_shown = False
+        elif screen and screen.back:
+            self.show(screen.back)
+
+    # ----- Elements -----
+    def node(self, element_id: str):
+        nodes = self.root.xpath(f"//*[@{ID_ATTRIBUTE}='{element_id}']") if element_id.isalnum() else []
+        if not nodes:
+            raise WebDriverError("stale element reference", f"Element {element_id} is no longer attached to the page")
+        return nodes[0]
+
+    def find(self, using: str, value: str, parent_id: Optional[str] = None) -> List:
+        xpath = to_xpath((using, value))
+        if xpath is None:
+            raise WebDriverError("invalid selector", f"Locator strategy '{using}' is not supported", 400)
+        context = self.root
+        if parent_id is not None:
+            context = self.node(parent_id)
+            if xpath.startswith("//"):
+                xpath = "." + xpath
+        try:
+            return [node for node in context.xpath(xpath) if isinstance(node, etree._Element)]
+        except etree.XPathError as e:
+            raise WebDriverError("invalid selector", f"Invalid XPath {value}: {e}", 400)
+
+    @staticmethod
+    def editable(node):
+        """The node if it accepts text, otherwise the first text field inside it"""
+        if node.tag in EDITABLE_CLASSES:
+            return node
+        return next((child for child in node.iter() if child.tag in EDITABLE_CLASSES), None)
+
+    @staticmethod
+    def require_editable(node, text: str = ""):
+        """Setting a value on anything but a text field fails, as in UiAutomator2"""
+        if node.tag not in EDITABLE_CLASSES:
+            raise WebDriverError("invalid element state", f"Cannot set the element '{node.tag}' to '{text}'. "
+                                 "Did you interact with the correct element?", 400)
+
+    def click(self, node):
+        # Tapping a field's container focuses the text field inside it
+        self.focused = self.editable(node) or node
+        self.keyboard_shown = self.focused.tag in EDITABLE_CLASSES
+        screen = SCREENS.get(self.screen_name)
+        if screen is None:
+            return
+        # A click lands on the node or bubbles up to the nearest ancestor with a transition
+        while node is not None:
+            for name in node.get(NAME_ATTRIBUTE, "").split():
+                if name in screen.transitions:
+                    self.show(screen.transitions[name])
+                    return
+            node = node.getparent()
+
+    def type_text(self, node, text: str):
+        """Apply typed characters: printable ones replace the text, delete keys clear it"""
+        printable = "".join(char for char in text if not "" <= char <= "")
+        if printable:
+            node.set("text", printable)
+        elif any(char in text for char in (Keys.DELETE, Keys.BACKSPACE)):
+            node.set("text", "")
+        self.focused = node
+
+    def page_source(self) -> str:
+        tree = copy.deepcopy(self.root)
+        for node in tree.iter():
+            node.attrib.pop(NAME_ATTRIBUTE, None)
+            node.attrib.pop(ID_ATTRIBUTE, None)
+        return etree.tostring(tree, encoding="UTF-8", xml_declaration=True, standalone=True).decode("utf-8")
+
+    def screenshot(self) -> str:
+        seed = f"{self.screen_name}|" + "|".join(node.get("text", "") for node in self.root.iter())
+        return base64.b64encode(screenshot_png(seed)).decode("ascii")
+
+    @staticmethod
+    def rect(node) -> Dict:
+        left, top, right, bottom = (int(value) for value in re.findall(r"-?\d+", node.get("bounds", "[0,0][0,0]")))
+        return {"x": left, "y": top, "width": right - left, "height": bottom - top}
+
+# ===== Sessions =====
+# Legacy /appium/... endpoint -> (command name, equivalent mobile: script)
+LEGACY_COMMANDS = {
+    "device/current_package": ("getCurrentPackage", "mobile: getCurrentPackage"),
+    "device/current_activity": ("getCurrentActivity", "mobile: getCurrentActivity"),
+    "device/activate_app": ("activateApp", "mobile: activateApp"),
+    "device/terminate_app": ("terminateApp", "mobile: terminateApp"),
+    "device/app_state": ("queryAppState", "mobile: queryAppState"),
+    "device/hide_keyboard": ("hideKeyboard", "mobile: hideKeyboard"),
+    "device/is_keyboard_shown": ("isKeyboardShown", "mobile: isKeyboardShown"),
+    "device/press_keycode": ("pressKeyCode", "mobile: pressKey"),
+    "device/long_press_keycode": ("longPressKeyCode", "mobile: pressKey"),
+    "start_recording_screen": ("startRecordingScreen", "mobile: startRecordingScreen"),
+    "stop_recording_screen": ("stopRecordingScreen", "mobile: stopRecordingScreen"),
+}
+
+class Session:
+    def __init__(self, capabilities: Dict):
+        self.id = uuid.uuid4().hex
+        self.capabilities = capabilities
+        self.implicit_wait = 0.0
+
+class FakeAppium:
+    """Command handlers of the fake server, with per-command latency"""
+
+    def __init__(self, device: Optional[FakeDevice] = None, latency_ms: float = 0.0,
+                 command_latency_ms: Optional[Dict[str, float]] = None, session_ms: float = 0.0):
+        self.device = device or FakeDevice()
+        self.latency_ms = latency_ms
+        self.command_latency_ms = command_latency_ms or {}
+        self.session_ms = session_ms
+        self.sessions: Dict[str, Session] = {}
+        self.command_counts: Dict[str, int] = {}
+        self._counts_lock = threading.Lock()
+
+    def delay(self, command: str):
+        with self._counts_lock:
+            self.command_counts[command] = self.command_counts.get(command, 0) + 1
+        seconds = self.command_latency_ms.get(command, self.latency_ms) / 1000
+        if seconds:
+            time.sleep(seconds)
+
+    def session(self, session_id: str) -> Session:
+        session = self.sessions.get(session_id)
+        if session is None:
+            raise WebDriverError("invalid session id", f"Session {session_id} does not exist")
+        return session
+
+    @staticmethod
+    def element_reference(node) -> Dict:
+        return {ELEMENT_KEY: node.get(ID_ATTRIBUTE)}
+
+    # ----- Sessions -----
+    def new_session(self, body: Dict):
+        time.sleep(self.session_ms / 1000)
+        requested = body.get("capabilities", {}).get("alwaysMatch", {}) or body.get("desiredCapabilities", {})
+        capabilities = dict(requested, platformName="Android")
+        session = Session(capabilities)
+        self.sessions[session.id] = session
+        with self.device.lock:
+            self.device.terminate()
+            self.device.launch()
+        return {"sessionId": session.id, "capabilities": capabilities}
+
+    def delete_session(self, session_id: str):
+        self.sessions.pop(session_id, None)
+        return None
+
+    # ----- Elements -----
+    def find_elements(self, session: Session, body: Dict, parent_id: Optional[str] = None, single: bool = True):
+        deadline = time.monotonic() + session.implicit_wait
+        while True:
+            with self.device.lock:
+                nodes = self.device.find(body.get("using"), body.get("value"), parent_id)
+                if nodes:
+                    return self.element_reference(nodes[0]) if single else [self.element_reference(n) for n in nodes]
+            if time.monotonic() >= deadline:
+                if single:
+                    raise WebDriverError("no such element",
+                                         "An element could not be located on the page using the given search parameters.")
+                return []
+            time.sleep(min(0.1, max(deadline - time.monotonic(), 0)))
+
+    def handle(self, method: str, path: str, body: Dict):
+        """Route one request; returns (command name, value)"""
+        parts = [part for part in path.split("/") if part]
+        if parts[:2] == ["wd", "hub"]:
+            parts = parts[2:]
+        if parts == ["status"]:
+            return "status", {"ready": True, "message": "ZoomCat fake Appium server"}
+        if parts == ["session"] and method == "POST":
+            return "newSession", self.new_session(body)
+        if len(parts) < 2 or parts[0] != "session":
+            raise WebDriverError("unknown command", f"Unknown command {method} {path}")
+        session = self.session(parts[1])
+        rest, device = parts[2:], self.device
+        route = (method, "/".join("*" if index == 1 and len(rest) > 2 and rest[0] == "element" else part
+                                  for index, part in enumerate(rest)))
+
+        if route == ("DELETE", ""):
+            return "quit", self.delete_session(session.id)
+        if route == ("POST", "timeouts"):
+            if body.get("implicit") is not None:
+                session.implicit_wait = body["implicit"] / 1000
+            return "setTimeouts", None
+        if route == ("GET", "timeouts"):
+            return "getTimeouts", {"implicit": int(session.implicit_wait * 1000), "pageLoad": 300000, "script": 30000}
+        if route == ("POST", "element"):
+            return "findElement", self.find_elements(session, body)
+        if route == ("POST", "elements"):
+            return "findElements", self.find_elements(session, body, single=False)
+        if route in (("POST", "element/*/element"), ("POST", "element/*/elements")):
+            single = rest[-1] == "element"
+            return ("findChildElement" if single else "findChildElements",
+                    self.find_elements(session, body, rest[1], single))
+
+        with device.lock:
+            if rest and rest[0] == "element" and len(rest) >= 3:
+                node = device.node(rest[1])
+                action = "/".join(rest[2:3])
+                if method == "POST" and action == "click":
+                    device.click(node)
+                    return "clickElement", None
+                if method == "POST" and action == "value":
+                    text = body.get("text") or "".join(body.get("value", []))
+                    device.require_editable(node, text)
+                    device.type_text(node, text)
+                    return "sendKeysToElement", None
+                if method == "POST" and action == "clear":
+                    device.require_editable(node)
+                    node.set("text", "")
+                    return "clearElement", None
+                if action == "attribute":
+                    return "getElementAttribute", node.get(rest[3])
+                if action == "property":
+                    return "getElementProperty", node.get(rest[3])
+                if action == "text":
+                    return "getElementText", node.get("text", "")
+                if action == "displayed":
+                    return "isElementDisplayed", node.get("displayed") == "true"
+                if action == "enabled":
+                    return "isElementEnabled", node.get("enabled") == "true"
+                if action == "selected":
+                    return "isElementSelected", node.get("checked") == "true"
+                if action == "name":
+                    return "getElementTagName", node.tag
+                if action == "rect":
+                    return "getElementRect", device.rect(node)
+                if action == "screenshot":
+                    return "elementScreenshot", device.screenshot()
+            if route == ("GET", "source"):
+                return "getPageSource", device.page_source()
+            if route == ("GET", "screenshot"):
+                return "screenshot", device.screenshot()
+            if route == ("GET", "window/rect"):
+                return "getWindowRect", {"x": 0, "y": 0, "width": SCREEN_WIDTH, "height": SCREEN_HEIGHT}
+            if route == ("POST", "back"):
+                device.back()
+                return "goBack", None
+            if route == ("POST", "actions"):
+                self.perform_actions(body)
+                return "w3cActions", None
+            if route == ("DELETE", "actions"):
+                return "w3cClearActions", None
+            if route == ("POST", "execute/sync"):
+                return self.execute_script(body)
+            if route == ("GET", "contexts"):
+                return "getContexts", ["NATIVE_APP"]
+            if route == ("GET", "context"):
+                return "getCurrentContext", "NATIVE_APP"
+            if rest[:1] == ["appium"]:
+                return self.appium_command(method, "/".join(rest[1:]), body)
+        raise WebDriverError("unknown command", f"Unknown command {method} {path}")
+
+    def appium_command(self, method: str, command: str, body: Dict):
+        """Legacy /appium/... endpoints, served by the same handlers as their mobile: scripts"""
+        if command in LEGACY_COMMANDS:
+            name, script = LEGACY_COMMANDS[command]
+            return name, self.mobile_command(script, body)
+        if command == "settings":
+            return ("updateSettings", None) if method == "POST" else ("getSettings", {})
+        raise WebDriverError("unknown command", f"Unknown Appium command {method} {command}")
+
+    def execute_script(self, body: Dict):
+        script, args = body.get("script", ""), body.get("args", [])
+        if not script.startswith("mobile: "):
+            raise WebDriverError("unsupported operation", "Script execution is not supported in the native context", 500)
+        options = args[0] if args and isinstance(args[0], dict) else {}
+        return script, self.mobile_command(script, options)
+
+    def mobile_command(self, script: str, options: Dict):
+        device = self.device
+        if script == "mobile: getCurrentPackage":
+            return device.package
+        if script == "mobile: getCurrentActivity":
+            return ".MainActivity" if device.app_running else ".NexusLauncherActivity"
+        if script == "mobile: activateApp":
+            device.launch()
+            return None
+        if script == "mobile: terminateApp":
+            return device.terminate()
+        if script == "mobile: queryAppState":
+            return 4 if device.app_running else 1
+        if script == "mobile: hideKeyboard":
+            device.keyboard_shown = False
+            return True
+        if script == "mobile: isKeyboardShown":
+            return device.keyboard_shown
+        if script == "mobile: pressKey":
+            self.press_keycode(options.get("keycode"))
+            return None
+        if script in ("mobile: replaceElementValue", "mobile: type"):
+            node = device.node(options["elementId"]) if options.get("elementId") else device.focused
+            if node is None:
+                raise WebDriverError("invalid argument", "No element to type into", 400)
+            device.require_editable(node, options.get("text", ""))
+            node.set("text", options.get("text", ""))
+            return None
+        if script == "mobile: stopRecordingScreen":
+            return ""
+        # Other mobile: extensions (gestures, settings, recording start) succeed without effect
+        return None
+
+    def press_keycode(self, keycode):
+        device = self.device
+        if keycode == 4:  # KEYCODE_BACK
+            device.back()
+        elif keycode in (67, 112) and device.focused is not None \
+                and device.focused.tag in EDITABLE_CLASSES:  # KEYCODE_DEL / FORWARD_DEL
+            device.focused.set("text", device.focused.get("text", "")[:-1])
+
+    def perform_actions(self, body: Dict):
+        """Pointer taps on an element click it; key actions type into the focused element"""
+        device = self.device
+        for source in body.get("actions", []):
+            if source.get("type") == "pointer":
+                target, pressed = None, False
+                for action in source.get("actions", []):
+                    origin = action.get("origin")
+                    if action.get("type") == "pointerMove" and isinstance(origin, dict) and ELEMENT_KEY in origin:
+                        target = device.node(origin[ELEMENT_KEY])
+                    elif action.get("type") == "pointerDown":
+                        pressed = True
+                    elif action.get("type") == "pointerUp" and pressed and target is not None:
+                        device.click(target)
+                        pressed = False
+            elif source.get("type") == "key" and device.focused is not None \
+                    and device.focused.tag in EDITABLE_CLASSES:
+                typed = "".join(action.get("value", "") for action in source.get("actions", [])
+                                if action.get("type") == "keyDown")
+                device.type_text(device.focused, typed)
+
+# ===== HTTP Server =====
+class FakeAppiumHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    appium: FakeAppium = None
+
+    def setup(self):
+        super().setup()
+        threading.current_thread().name = f"{SERVER_THREAD_NAME}-request"
+        self.connection.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+
+    def _dispatch(self):
+        length = int(self.headers.get("Content-Length") or 0)
+        raw = self.rfile.read(length) if length else b""
+        try:
+            body = json.loads(raw) if raw else {}
+            command, value = self.appium.handle(self.command, self.path, body)
+            self.appium.delay(command)
+            status, payload = 200, {"value": value}
+        except WebDriverError as e:
+            status, payload = e.status, {"value": {"error": e.error, "message": str(e), "stacktrace": ""}}
+        except Exception as e:
+            status, payload = 500, {"value": {"error": "unknown error", "message": repr(e), "stacktrace": ""}}
+        data = json.dumps(payload).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json; charset=utf-8")
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    do_GET = do_POST = do_DELETE = _dispatch
+
+    def log_message(self, format, *args):
+        pass
+
+def start_fake_server(port: int = 0, host: str = "127.0.0.1", **options) -> Tuple[ThreadingHTTPServer, str]:
+    """Serve a FakeAppium on a background thread; returns the server and its URL"""
+    handler = type("BoundFakeAppiumHandler", (FakeAppiumHandler,), {"appium": FakeAppium(**options)})
+    server = ThreadingHTTPServer((host, port), handler)
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, name=SERVER_THREAD_NAME, daemon=True).start()
+    return server, f"http://{host}:{server.server_address[1]}"
+
+def parse_command_latency(spec: str) -> Dict[str, float]:
+    """Parse 'command=ms,command=ms'"""
+    latencies = {}
+    for entry in filter(None, (part.strip() for part in spec.split(","))):
+        command, _, milliseconds = entry.partition("=")
+        latencies[command] = float(milliseconds)
+    return latencies
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Fake Appium server serving scripted ZoomCat screens")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=4723)
+    parser.add_argument("--latency-ms", type=float, default=0.0, help="delay added to every command")
+    parser.add_argument("--command-latency", default="", metavar="CMD=MS[,...]",
+                        help="per-command delays, e.g. screenshot=250,getPageSource=120")
+    parser.add_argument("--session-ms", type=float, default=0.0, help="session creation time")
+    parser.add_argument("--logged-in", action="store_true", help="start with the test account already logged in")
+    parser.add_argument("--check", action="store_true", help="list locators the scripted screens cannot serve and exit")
+    args = parser.parse_args(argv)
+
+    if args.check:
+        problems = ambiguous_locators()
+        print("\n".join(problems) if problems else "Every scripted locator resolves to its own element")
+        return 1 if problems else 0
+    server, url = start_fake_server(args.port, args.host, device=FakeDevice(logged_in=args.logged_in),
+                                    latency_ms=args.latency_ms,
+                                    command_latency_ms=parse_command_latency(args.command_latency),
+                                    session_ms=args.session_ms)
+    print(f"Fake Appium server listening on {url}")
+    try:
+        while True:
+            time.sleep(3600)
+    except KeyboardInterrupt:
+        server.shutdown()
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
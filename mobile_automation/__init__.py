@@ -0,0 +1,3 @@
+"""
+Shared configuration and utilities for the ZoomCat mobile automation suites
+"""
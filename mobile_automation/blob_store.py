@@ -0,0 +1,134 @@
+"""
+Content-addressed screenshot store for the ZoomCat reports
+Consecutive steps often capture the same screen, and every nightly run
+captures the same screens again. Frames are therefore stored once per
+content hash under <reports root>/.blobs/<ab>/<sha256>.<ext>, shared by every
+report directory and every run that writes to the same reports root.
+
+The step file itself (e.g. reports/Logout Test_<ts>/1-2_app_loaded.png)
+is a hard link to its blob, so report directories keep their usual layout
+while a duplicate frame costs one link instead of a new file. Where hard
+links are not possible, the step file is written as a plain copy. Each
+report directory also gets a manifest.json mapping step names to blobs.
+
+Blobs that no manifest refers to any more (after old report directories are
+deleted) can be removed with:
+
+    python -m mobile_automation.blob_store prune reports
+"""
+
+# ===== Imports =====
+import hashlib
+import json
+import os
+import sys
+import threading
+from pathlib import Path
+from typing import Dict, Set
+
+BLOB_DIR = ".blobs"
+MANIFEST_FILE = "manifest.json"
+
+# ===== Store =====
+class BlobStore:
+    """Writes frames by content hash and links them into the report directories"""
+
+    def __init__(self):
+        self.frames = 0
+        self.unique = 0
+        self.duplicates = 0
+        self.bytes_written = 0
+        self.bytes_saved = 0
+        self.copies = 0
+        # report directory -> step file name -> blob path relative to that directory
+        self._manifests: Dict[str, Dict[str, str]] = {}
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def blob_path(path: str, digest: str) -> str:
+        """Blob location for a frame destined for path: in the reports root above its report directory"""
+        reports_root = os.path.dirname(os.path.dirname(os.path.abspath(path)))
+        extension = os.path.splitext(path)[1] or ".png"
+        return os.path.join(reports_root, BLOB_DIR, digest[:2], f"{digest}{extension}")
+
+    def put(self, data: bytes, path: str) -> str:
+        """Store the frame once and make path refer to it; returns the content hash"""
+        digest = hashlib.sha256(data).hexdigest()
+        blob = self.blob_path(path, digest)
+        with self._lock:
+            self.frames += 1
+            if os.path.exists(blob):
+                self.duplicates += 1
+                self.bytes_saved += len(data)
+            else:
+                os.makedirs(os.path.dirname(blob), exist_ok=True)
+                # Atomic: device-farm workers may write the same blob at once
+                tmp_path = f"{blob}.{os.getpid()}.{threading.get_ident()}.tmp"
+                with open(tmp_path, "wb") as tmp_file:
+                    tmp_file.write(data)
+                os.replace(tmp_path, blob)
+                self.unique += 1
+                self.bytes_written += len(data)
+
+        if os.path.lexists(path):
+            os.remove(path)
+        try:
+            os.link(blob, path)
+        except OSError:
+            with open(path, "wb") as step_file:
+                step_file.write(data)
+            self.copies += 1
+
+        report_dir = os.path.dirname(os.path.abspath(path))
+        with self._lock:
+            self._manifests.setdefault(report_dir, {})[os.path.basename(path)] = os.path.relpath(blob, report_dir)
+        return digest
+
+    def write_manifests(self):
+        """Write (or extend) manifest.json in every report directory written to since the last call"""
+        with self._lock:
+            manifests, self._manifests = self._manifests, {}
+        for report_dir, steps in manifests.items():
+            path = os.path.join(report_dir, MANIFEST_FILE)
+            try:
+                existing = json.loads(Path(path).read_text()) if os.path.exists(path) else {}
+                existing.update(steps)
+                Path(path).write_text(json.dumps(existing, indent=2, sort_keys=True))
+            except (OSError, ValueError) as e:
+                print(f"Failed to write screenshot manifest {path}: {e}")
+
+    def summary(self) -> str:
+        return (f"{self.frames} frames, {self.unique} new blobs, {self.duplicates} duplicates "
+                f"({self.bytes_written / 1024:.0f} KB written, {self.bytes_saved / 1024:.0f} KB saved)"
+                + (f", {self.copies} copied where hard links failed" if self.copies else ""))
+
+# ===== Maintenance =====
+def referenced_blobs(reports_root: Path) -> Set[Path]:
+    """Every blob a manifest under reports_root refers to"""
+    referenced = set()
+    for manifest in reports_root.rglob(MANIFEST_FILE):
+        try:
+            steps = json.loads(manifest.read_text())
+        except (OSError, ValueError):
+            continue
+        referenced.update((manifest.parent / blob).resolve() for blob in steps.values())
+    return referenced
+
+def prune(reports_root: Path) -> int:
+    """Delete the blobs no manifest refers to; returns how many were removed"""
+    referenced = referenced_blobs(reports_root)
+    removed = 0
+    for blob_dir in reports_root.rglob(BLOB_DIR):
+        for blob in blob_dir.rglob("*.*"):
+            if blob.suffix != ".tmp" and blob.resolve() not in referenced:
+                blob.unlink()
+                removed += 1
+    return removed
+
+if __name__ == "__main__":
+    """Remove unreferenced blobs: python -m mobile_automation.blob_store prune [REPORTS_ROOT]"""
+    if len(sys.argv) < 2 or sys.argv[1] != "prune":
+        print("Usage: python -m mobile_automation.blob_store prune [REPORTS_ROOT]")
+        sys.exit(2)
+    root = Path(sys.argv[2]) if len(sys.argv) > 2 else Path("reports")
+    print(f"Removed {prune(root)} unreferenced blobs from {root}")
@@ -12,6 +12,16 @@ class Config:
     # Appium Server
     APPIUM_SERVER = "http://localhost:4723"
 
+    # HTTP connection pool shared by every driver talking to an Appium server
+    HTTP_POOL_SIZE = 8          # kept-alive connections per server
+    HTTP_CONNECT_TIMEOUT = 10   # seconds
+    HTTP_READ_TIMEOUT = 300     # seconds; session creation and long waits can be slow
+    HTTP_POOL_TIMEOUT = 60      # seconds a command may wait for a free pooled connection
+
+    # Time a suite may spend in time.sleep when sleep accounting is on (see sleeps.py)
+    SLEEP_BUDGET_SECONDS = 15
+    SLEEP_BUDGETS = {}          # per-suite overrides, keyed by the suite's step trace name
+
     # Test Credentials
     TEST_EMAIL = "zoomcatcs01@gmail.com"
     TEST_VERIFICATION_CODE = "999999"
@@ -0,0 +1,113 @@
+"""
+Shared HTTP connection pool for the Appium client
+Each webdriver.Remote normally builds its own urllib3 pool, holding one
+kept-alive connection per server. Every new session then starts with a
+fresh TCP handshake, and concurrent callers (screenshot and pre-warm threads,
+scheduler workers) open extra connections that are thrown away after a
+single request, which leaves them in TIME_WAIT.
+
+open_connection() returns an AppiumConnection backed by one process-wide
+PoolManager per pool configuration, so every driver reuses the same
+kept-alive connections. Pool size and timeouts come from Config and can be
+overridden per run with ZOOMCAT_HTTP_POOL_SIZE, ZOOMCAT_HTTP_CONNECT_TIMEOUT,
+ZOOMCAT_HTTP_READ_TIMEOUT and ZOOMCAT_HTTP_POOL_TIMEOUT.
+
+Failed connection attempts are retried (a kept-alive socket that the server
+closed while idle is replaced by a new connection), but requests that reached
+the server are never resent.
+"""
+
+# ===== Imports =====
+import os
+import threading
+from typing import Dict, Optional, Tuple
+
+import urllib3
+from appium.webdriver.appium_connection import AppiumConnection
+
+from .config import Config
+
+# ===== Pool Settings =====
+class PoolSettings:
+    """Size and timeouts of a shared connection pool"""
+
+    def __init__(self, pool_size: Optional[int] = None, connect_timeout: Optional[float] = None,
+                 read_timeout: Optional[float] = None, pool_timeout: Optional[float] = None):
+        self.pool_size = pool_size or int(os.environ.get("ZOOMCAT_HTTP_POOL_SIZE", Config.HTTP_POOL_SIZE))
+        self.connect_timeout = connect_timeout or float(
+            os.environ.get("ZOOMCAT_HTTP_CONNECT_TIMEOUT", Config.HTTP_CONNECT_TIMEOUT))
+        self.read_timeout = read_timeout or float(
+            os.environ.get("ZOOMCAT_HTTP_READ_TIMEOUT", Config.HTTP_READ_TIMEOUT))
+        self.pool_timeout = pool_timeout or float(
+            os.environ.get("ZOOMCAT_HTTP_POOL_TIMEOUT", Config.HTTP_POOL_TIMEOUT))
+
+    @property
+    def key(self) -> Tuple:
+        return self.pool_size, self.connect_timeout, self.read_timeout, self.pool_timeout
+
+    def pool_manager_args(self) -> Dict:
+        return {
+            "maxsize": self.pool_size,
+            # Callers beyond pool_size wait for a free connection instead of opening a throwaway one
+            "block": True,
+            "timeout": urllib3.Timeout(connect=self.connect_timeout, read=self.read_timeout),
+            "retries": urllib3.Retry(connect=2, read=0, redirect=False),
+        }
+
+class BoundedWaitPoolManager(urllib3.PoolManager):
+    """PoolManager whose callers give up waiting for a free connection after pool_timeout seconds"""
+
+    def __init__(self, pool_timeout: float, **kwargs):
+        super().__init__(**kwargs)
+        self.pool_timeout = pool_timeout
+
+    def urlopen(self, method, url, redirect=True, **kwargs):
+        # A starved pool raises EmptyPoolError instead of blocking forever
+        kwargs.setdefault("pool_timeout", self.pool_timeout)
+        return super().urlopen(method, url, redirect=redirect, **kwargs)
+
+# Pool manager for each pool configuration used in this process
+_pools: Dict[Tuple, BoundedWaitPoolManager] = {}
+_lock = threading.Lock()
+
+def shared_pool_manager(settings: PoolSettings, ca_certs: Optional[str] = None) -> BoundedWaitPoolManager:
+    key = settings.key + (ca_certs,)
+    with _lock:
+        manager = _pools.get(key)
+        if manager is None:
+            # Same certificate handling as AppiumConnection's own pool manager
+            certificates = {"cert_reqs": "CERT_REQUIRED", "ca_certs": ca_certs} if ca_certs else {"cert_reqs": "CERT_NONE"}
+            manager = BoundedWaitPoolManager(settings.pool_timeout, **certificates, **settings.pool_manager_args())
+            _pools[key] = manager
+        return manager
+
+def close_shared_pools():
+    """Close every kept-alive connection of the shared pools"""
+    with _lock:
+        for manager in _pools.values():
+            manager.clear()
+        _pools.clear()
+
+# ===== Connection =====
+class SharedPoolConnection(AppiumConnection):
+    """AppiumConnection whose requests go through the process-wide pool"""
+
+    def __init__(self, remote_server_addr: str, settings: Optional[PoolSettings] = None,
+                 ignore_proxy: Optional[bool] = False):
+        self.settings = settings or PoolSettings()
+        super().__init__(remote_server_addr, keep_alive=True, ignore_proxy=ignore_proxy)
+
+    def _get_connection_manager(self):
+        if self._proxy_url:
+            # Proxied servers keep a pool of their own
+            return super()._get_connection_manager()
+        return shared_pool_manager(self.settings, self._ca_certs)
+
+    def close(self):
+        """Leave the shared connections open for the other drivers"""
+        if self._conn not in _pools.values():
+            super().close()
+
+def open_connection(server: str = Config.APPIUM_SERVER, settings: Optional[PoolSettings] = None) -> SharedPoolConnection:
+    """Command executor for webdriver.Remote that reuses the shared kept-alive connections"""
+    return SharedPoolConnection(server, settings)
@@ -0,0 +1,172 @@
+"""
+Process-pool execution of the suite graph across a device farm
+One worker process per device owns that device's session pool and runs the
+suites the parent scheduler hands it. The parent keeps the dependency graph,
+so dependent suites still wait for (and are skipped by) their requirements,
+and the per-device results are merged into one summary. The parent also
+tracks each device's app state (logged in or out) and, before handing a
+suite to a worker whose device is in another state, has that worker run the
+setup for the state on its own device.
+Each worker runs in its own report directory, so suites on different devices
+never share screenshot or report paths. In pipelining mode an idle worker is
+told to pre-warm its session while suites are still running elsewhere.
+"""
+
+# ===== Imports =====
+import importlib.util
+import multiprocessing
+import os
+import queue
+import sys
+import traceback
+from datetime import datetime
+from typing import Dict, List, Optional, Tuple
+
+from .devices import Device
+from .scheduler import SuiteScheduler
+from .sleeps import apply_sleep_budget
+
+# Task asking a worker to start creating its session before its first suite
+PREWARM = "__prewarm__"
+# Prefix of the task asking a worker to bring its device into a state
+SETUP = "__setup__:"
+
+# ===== Worker Process =====
+def load_runner(runner_path: str) -> Tuple[Dict, Dict]:
+    """Import the runner module by path and return its SUITES by name and its SETUPS"""
+    sys.path.insert(0, os.path.dirname(os.path.abspath(runner_path)))
+    spec = importlib.util.spec_from_file_location("zoomcat_runner", runner_path)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return {suite.name: suite for suite in module.SUITES}, getattr(module, "SETUPS", {})
+
+def run_task(run, pool, name: str, label: str, udid: str):
+    """Run one suite or setup on the worker's pool; FAILED if it raised or broke its sleep budget"""
+    try:
+        result = run(pool.acquire(name))
+    except Exception as e:
+        print(f"{label} failed with error on {udid}:", e)
+        traceback.print_exc()
+        result = "FAILED"
+    # Collected on the error path too: a violation left on this thread would fail the worker's next suite
+    return apply_sleep_budget(result)
+
+def device_worker(device: Device, runner_path: str, run_dir: str, options: Dict,
+                  tasks: multiprocessing.Queue, results: multiprocessing.Queue):
+    """Run suite names (and setups) received on tasks on one device until a None arrives"""
+    from .connection import close_shared_pools
+    from .interaction import set_visual_debug
+    from .locators import print_locator_rankings
+    from .profiler import print_command_profile
+    from .recording import set_recording_enabled
+    from .screenshots import flush_screenshots, print_screenshot_report, set_capture_policy, set_output_format
+    from .session_pool import SessionPool
+    from .sleeps import print_sleep_report, set_sleep_policy
+    from .text_entry import print_text_entry_rankings
+    from .waits import print_ready_timings
+
+    worker_dir = os.path.join(run_dir, device.udid)
+    os.makedirs(worker_dir, exist_ok=True)
+    os.chdir(worker_dir)
+    if options.get("screenshots"):
+        set_capture_policy(options["screenshots"])
+    if options.get("screenshot_format"):
+        set_output_format(options["screenshot_format"])
+    if options.get("record"):
+        set_recording_enabled(True)
+    if options.get("visual_debug"):
+        set_visual_debug(True)
+    if options.get("sleeps"):
+        set_sleep_policy(options["sleeps"])
+
+    suites, setups = load_runner(runner_path)
+    pool = SessionPool(device.server, device.capabilities())
+    try:
+        while True:
+            name = tasks.get()
+            if name is None:
+                break
+            if name == PREWARM:
+                pool.prewarm()
+                continue
+            if name.startswith(SETUP):
+                label, run = f"Setup {name[len(SETUP):]}", setups[name[len(SETUP):]]
+            else:
+                label, run = suites[name].label, suites[name].run
+            results.put(run_task(run, pool, name, label, device.udid))
+    finally:
+        flush_screenshots()
+        pool.close()
+        close_shared_pools()
+        print(f"\n=== DEVICE {device.udid} ({device.server}) ===")
+        pool.print_report()
+        print_screenshot_report()
+        print_ready_timings()
+        print_locator_rankings()
+        print_text_entry_rankings()
+        print_command_profile()
+        print_sleep_report()
+
+# ===== Farm Scheduler =====
+class DeviceFarmScheduler(SuiteScheduler):
+    """SuiteScheduler whose suites run in one worker process per device"""
+
+    def __init__(self, suites: List, inventory: List[Device], runner_path: str, options: Dict = None,
+                 pipeline: bool = False, setups: Optional[Dict] = None, initial_state: Optional[str] = None):
+        super().__init__(suites, pool=None, devices=[device.udid for device in inventory], pipeline=pipeline,
+                         setups=setups, initial_state=initial_state)
+        self.inventory = {device.udid: device for device in inventory}
+        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+        self.run_dir = os.path.abspath(os.path.join("reports", f"device_farm_{timestamp}"))
+        self._tasks: Dict[str, multiprocessing.Queue] = {}
+        self._results: Dict[str, multiprocessing.Queue] = {}
+        self._workers: Dict[str, multiprocessing.Process] = {}
+        for udid, device in self.inventory.items():
+            self._tasks[udid] = multiprocessing.Queue()
+            self._results[udid] = multiprocessing.Queue()
+            self._workers[udid] = multiprocessing.Process(
+                target=device_worker, name=f"device-{udid}",
+                args=(device, os.path.abspath(runner_path), self.run_dir, options or {},
+                      self._tasks[udid], self._results[udid])
+            )
+
+    def _prewarm(self, device: str):
+        if self._workers[device].is_alive():
+            self._tasks[device].put(PREWARM)
+
+    def _run_on_device(self, suite, device: str):
+        return self._run_task(suite.name, suite.label, device)
+
+    def _run_setup(self, state: str, device: str):
+        return self._run_task(SETUP + state, f"setup {state}", device)
+
+    def _run_task(self, task: str, label: str, device: str):
+        """Hand one task to the device's worker and wait for its result"""
+        if not self._workers[device].is_alive():
+            print(f"Worker for device {device} is not running, {label} cannot start")
+            return "FAILED"
+        self._tasks[device].put(task)
+        while True:
+            try:
+                return self._results[device].get(timeout=1)
+            except queue.Empty:
+                if not self._workers[device].is_alive():
+                    print(f"Worker for device {device} exited while running {label}")
+                    return "FAILED"
+
+    def run(self):
+        print(f"Running suites on {len(self.inventory)} devices, reports in {self.run_dir}")
+        for worker in self._workers.values():
+            worker.start()
+        try:
+            return super().run()
+        finally:
+            self.close()
+
+    def close(self):
+        """Stop every worker once its queue is drained"""
+        for udid, worker in self._workers.items():
+            if worker.is_alive():
+                self._tasks[udid].put(None)
+        for worker in self._workers.values():
+            worker.join()
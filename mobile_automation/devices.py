@@ -0,0 +1,71 @@
+"""
+Device inventory for the ZoomCat suites
+Lists the phones (and the Appium server driving each of them) a run may use.
+The inventory is read from, in order of precedence:
+  * a JSON file (runner --devices-file), a list of objects such as
+    {"udid": "10AE9G0SJS001BT", "server": "http://localhost:4723", "systemPort": 8200}
+  * a device list (runner --devices or ZOOMCAT_DEVICES), comma separated
+    entries of the form UDID or UDID@http://host:port
+  * the single device configured in config.py
+"""
+
+# ===== Imports =====
+import json
+import os
+from pathlib import Path
+from typing import Dict, List, Optional
+
+from .config import Config
+
+BASE_SYSTEM_PORT = 8200
+
+# ===== Device =====
+class Device:
+    """One phone and the Appium server that drives it"""
+
+    def __init__(self, udid: str, server: str = Config.APPIUM_SERVER, system_port: Optional[int] = None):
+        self.udid = udid
+        self.server = server
+        self.system_port = system_port
+
+    def capabilities(self, base: Optional[Dict] = None) -> Dict:
+        """Session capabilities for this device, on top of the configured ones"""
+        capabilities = dict(base or Config.CAPABILITIES)
+        capabilities["appium:deviceName"] = self.udid
+        capabilities["appium:udid"] = self.udid
+        if self.system_port:
+            # Each UiAutomator2 session on a server needs its own device-side port
+            capabilities["appium:systemPort"] = self.system_port
+        return capabilities
+
+    def __repr__(self):
+        return f"{self.udid}@{self.server}"
+
+# ===== Inventory =====
+def parse_devices(spec: str) -> List[Device]:
+    """Parse 'UDID[@SERVER],UDID[@SERVER],...'"""
+    devices = []
+    for entry in filter(None, (part.strip() for part in spec.split(","))):
+        udid, _, server = entry.partition("@")
+        devices.append(Device(udid, server or Config.APPIUM_SERVER))
+    return devices
+
+def read_devices_file(path) -> List[Device]:
+    entries = json.loads(Path(path).read_text())
+    return [Device(entry["udid"], entry.get("server", Config.APPIUM_SERVER), entry.get("systemPort"))
+            for entry in entries]
+
+def load_inventory(devices_file: Optional[str] = None, devices: Optional[str] = None) -> List[Device]:
+    """The devices available to this run, each with a distinct systemPort"""
+    if devices_file:
+        inventory = read_devices_file(devices_file)
+    elif devices or os.environ.get("ZOOMCAT_DEVICES"):
+        inventory = parse_devices(devices or os.environ["ZOOMCAT_DEVICES"])
+    else:
+        inventory = [Device(Config.CAPABILITIES["appium:deviceName"], Config.APPIUM_SERVER)]
+    if len({device.udid for device in inventory}) != len(inventory):
+        raise ValueError("Device inventory lists the same udid more than once")
+    if len(inventory) > 1:
+        for index, device in enumerate(inventory):
+            device.system_port = device.system_port or BASE_SYSTEM_PORT + index
+    return inventory
@@ -0,0 +1,135 @@
+"""
+Element interaction layer for the ZoomCat suites
+Highlighting an element with a CSS border only works inside a webview. On
+the native Android screens the suites drive, execute_script always fails,
+so highlighting there cost a failing round trip, an exception and a fixed
+sleep on every interaction.
+
+Whether highlighting is possible is now checked once per session (the
+driver's current context). In a webview, the border is drawn live as before.
+On native screens, nothing is sent to the device. In visual-debug mode
+(--visual-debug or ZOOMCAT_VISUAL_DEBUG=1), the element's bounds are
+remembered instead, and the next screenshot of the session gets a red box
+drawn around them when it is written to disk. Drawing the overlay needs
+Pillow; without it, the screenshots are written unmarked.
+The clicks and fills the suites make (UiSnapshot actions, fill_field and
+click below) mark their element through mark_interaction, which sends
+nothing at all unless visual debug is on.
+"""
+
+# ===== Imports =====
+import io
+import os
+import threading
+import time
+from collections import deque
+from typing import Deque, Dict, List, Optional, Tuple
+
+try:
+    from PIL import Image, ImageDraw
+except ImportError:  # Pillow is only needed for visual-debug overlays
+    Image = ImageDraw = None
+
+VISUAL_DEBUG = os.environ.get("ZOOMCAT_VISUAL_DEBUG", "").lower() in ("1", "true", "yes")
+HIGHLIGHT_STYLE = "arguments[0].style.border='3px solid red'"
+OVERLAY_COLOR = (255, 0, 0)
+OVERLAY_WIDTH = 6
+
+Box = Tuple[int, int, int, int]
+
+# Whether each session's context supports live highlighting
+_live_highlight: Dict[str, bool] = {}
+# Element bounds waiting to be drawn on each session's next screenshot
+_pending: Dict[str, Deque[Box]] = {}
+_lock = threading.Lock()
+_warned_no_pillow = False
+
+def set_visual_debug(enabled: bool):
+    global VISUAL_DEBUG
+    VISUAL_DEBUG = enabled
+    print(f"Visual debug overlays: {'on' if enabled else 'off'}")
+
+# ===== Highlighting =====
+def highlight_supported(driver) -> bool:
+    """Whether the session is in a webview, where elements can be styled; checked once per session"""
+    session = driver.session_id
+    if session not in _live_highlight:
+        try:
+            _live_highlight[session] = "WEBVIEW" in (driver.current_context or "").upper()
+        except Exception:
+            _live_highlight[session] = False
+    return _live_highlight[session]
+
+def highlight_element(driver, element, rect: Optional[Dict] = None) -> bool:
+    """
+    Highlight an element: live in a webview, or on the next screenshot in
+    visual-debug mode. Returns True only when the highlight is visible on the
+    device, i.e. when waiting for a human to see it makes sense. Pass rect
+    when the element's bounds are already known, to save reading them.
+    """
+    if highlight_supported(driver):
+        try:
+            driver.execute_script(HIGHLIGHT_STYLE, element)
+            return True
+        except Exception:
+            return False
+    if VISUAL_DEBUG:
+        rect = rect or element.rect
+        box = (rect["x"], rect["y"], rect["x"] + rect["width"], rect["y"] + rect["height"])
+        with _lock:
+            _pending.setdefault(driver.session_id, deque(maxlen=8)).append(box)
+    return False
+
+def mark_interaction(driver, element, rect: Optional[Dict] = None):
+    """Highlight an element a suite is about to act on, in visual-debug mode only; no commands otherwise"""
+    if VISUAL_DEBUG:
+        highlight_element(driver, element, rect)
+
+def click(driver, element):
+    """Click an element, marking it for the next screenshot in visual-debug mode"""
+    mark_interaction(driver, element)
+    element.click()
+
+def take_highlights(driver) -> List[Box]:
+    """The element bounds to draw on the screenshot being captured now"""
+    with _lock:
+        pending = _pending.pop(getattr(driver, "session_id", None), None)
+    return list(pending or ())
+
+def interact(driver, element, action: str, highlight_seconds: float = 1, **kwargs):
+    """
+    Highlight an element and perform click, send_keys, clear or clear_and_send
+    on it. Only a live (webview) highlight is held for highlight_seconds.
+    """
+    if highlight_element(driver, element) and highlight_seconds:
+        time.sleep(highlight_seconds)
+    if action == "click":
+        element.click()
+    elif action == "send_keys":
+        element.send_keys(kwargs.get("keys", ""))
+    elif action == "clear":
+        element.clear()
+    elif action == "clear_and_send":
+        element.clear()
+        element.send_keys(kwargs.get("keys", ""))
+    else:
+        raise ValueError(f"Unknown interaction '{action}'")
+
+# ===== Overlay =====
+def draw_highlights(png: bytes, boxes: List[Box]) -> bytes:
+    """Draw a box around each highlighted element on a PNG screenshot"""
+    global _warned_no_pillow
+    if not boxes:
+        return png
+    if Image is None:
+        if not _warned_no_pillow:
+            _warned_no_pillow = True
+            print("Pillow is not installed; screenshots are written without visual-debug overlays")
+        return png
+    image = Image.open(io.BytesIO(png)).convert("RGB")
+    draw = ImageDraw.Draw(image)
+    for box in boxes:
+        draw.rectangle(box, outline=OVERLAY_COLOR, width=OVERLAY_WIDTH)
+    output = io.BytesIO()
+    image.save(output, format="PNG")
+    return output.getvalue()
@@ -0,0 +1,165 @@
+"""
+Locator compiler for the ZoomCat suites
+XPath lookups make UiAutomator2 serialise the whole hierarchy on every call,
+which is the slowest strategy the server offers. The compiler rewrites the
+XPaths in the Locators classes into cheaper equivalents:
+  * //Class[@content-desc="X"]                 -> accessibility id "X"
+  * //Class[@resource-id="R" and @text="T"]    -> UiSelector chain
+  * (//Class[...])[n]                          -> UiSelector chain with instance(n - 1)
+  * //Class                                    -> class name
+Anything else (absolute or positional paths) stays XPath and is listed by the
+compile report:
+
+    python -m mobile_automation.locator_compiler [file.py ...]
+"""
+
+# ===== Imports =====
+import ast
+import re
+import sys
+from functools import lru_cache
+from pathlib import Path
+from typing import Dict, List, NamedTuple, Tuple
+
+from appium.webdriver.common.appiumby import AppiumBy
+
+REPO_ROOT = Path(__file__).resolve().parent.parent
+
+_LITERAL = r'"[^"]*"|\'[^\']*\''
+_STEP = re.compile(r"^//(?P<cls>[A-Za-z_][\w.]*|\*)(?:\[(?P<predicates>[^\[\]]+)\])?$")
+_INDEXED = re.compile(r"^\((?P<inner>//[^()]+)\)\[(?P<index>\d+)\]$")
+_PREDICATE = re.compile(rf"^@(?P<attribute>[\w-]+)\s*=\s*(?P<value>{_LITERAL})$")
+_AND = re.compile(rf"\s+and\s+(?=(?:[^\"']|{_LITERAL})*$)")
+
+# XPath attribute -> UiSelector method
+UISELECTOR_METHODS = {
+    "resource-id": "resourceId",
+    "text": "text",
+    "content-desc": "description",
+}
+
+class CompiledLocator(NamedTuple):
+    name: str
+    xpath: str
+    locator: Tuple[str, str]
+    reason: str
+
+    @property
+    def compiled(self) -> bool:
+        return self.locator[0] != AppiumBy.XPATH
+
+# ===== Compiler =====
+def _uiselector_string(value: str) -> str:
+    escaped = value.replace("\\", "\\\\").replace('"', '\\"')
+    return f'"{escaped}"'
+
+def explain_xpath(xpath: str) -> Tuple[Tuple[str, str], str]:
+    """Compile one XPath; returns the cheapest equivalent locator and how it was chosen"""
+    xpath = xpath.strip()
+    index = None
+    indexed = _INDEXED.match(xpath)
+    if indexed:
+        xpath_step, index = indexed.group("inner"), int(indexed.group("index"))
+    else:
+        xpath_step = xpath
+    step = _STEP.match(xpath_step)
+    if not step:
+        return (AppiumBy.XPATH, xpath), "hierarchy path has no single-step equivalent"
+
+    class_name = step.group("cls")
+    attributes: Dict[str, str] = {}
+    for predicate in _AND.split(step.group("predicates") or ""):
+        if not predicate.strip():
+            continue
+        match = _PREDICATE.match(predicate.strip())
+        if not match or match.group("attribute") not in UISELECTOR_METHODS or match.group("attribute") in attributes:
+            return (AppiumBy.XPATH, xpath), f"unsupported predicate [{predicate.strip()}]"
+        attributes[match.group("attribute")] = match.group("value")[1:-1]
+
+    if not attributes and index is None:
+        if class_name == "*":
+            return (AppiumBy.XPATH, xpath), "matches any element"
+        return (AppiumBy.CLASS_NAME, class_name), "class name"
+    if list(attributes) == ["content-desc"] and index is None:
+        return (AppiumBy.ACCESSIBILITY_ID, attributes["content-desc"]), "content-desc"
+
+    selector = "new UiSelector()"
+    if class_name != "*":
+        selector += f".className({_uiselector_string(class_name)})"
+    for attribute, value in attributes.items():
+        selector += f".{UISELECTOR_METHODS[attribute]}({_uiselector_string(value)})"
+    if index is not None:
+        selector += f".instance({index - 1})"
+    return (AppiumBy.ANDROID_UIAUTOMATOR, selector), "UiSelector"
+
+@lru_cache(maxsize=None)
+def compile_locator(xpath: str) -> Tuple[str, str]:
+    """The cheapest locator equivalent to the XPath, or the XPath itself"""
+    locator, _ = explain_xpath(xpath)
+    return locator
+
+def compiled_candidates(xpath: str) -> List[Tuple[str, str]]:
+    """The compiled locator followed by the original XPath as an exact fallback"""
+    locator = compile_locator(xpath)
+    if locator[0] == AppiumBy.XPATH:
+        return [locator]
+    return [locator, (AppiumBy.XPATH, xpath)]
+
+# ===== Specificity =====
+# Tiers, most specific first: a strategy is never ranked ahead of a more specific one
+PRECISE, XPATH, CLASS_ONLY = 0, 1, 2
+
+_CLASS_ONLY_SELECTOR = re.compile(r'^new UiSelector\(\)(\.className\("[^"]*"\))?(\.instance\(\d+\))?;?$')
+_CLASS_ONLY_XPATH = re.compile(r"^\(?//[A-Za-z_][\w.]*\)?(\[\d+\])?$")
+
+def locator_specificity(locator: Tuple[str, str]) -> int:
+    """
+    PRECISE for accessibility ids, ids and attribute UiSelectors, XPATH for
+    XPaths, CLASS_ONLY for strategies that match any element of a class
+    """
+    by, value = locator
+    if by == AppiumBy.CLASS_NAME:
+        return CLASS_ONLY
+    if by == AppiumBy.ANDROID_UIAUTOMATOR and _CLASS_ONLY_SELECTOR.match(value.strip()):
+        return CLASS_ONLY
+    if by == AppiumBy.XPATH:
+        return CLASS_ONLY if _CLASS_ONLY_XPATH.match(value.strip()) else XPATH
+    return PRECISE
+
+# ===== Report =====
+def compile_locators(locators: Dict[str, str]) -> List[CompiledLocator]:
+    return [CompiledLocator(name, xpath, *explain_xpath(xpath)) for name, xpath in locators.items()]
+
+def locators_in_file(path: Path) -> Dict[str, str]:
+    """String attributes of every `class Locators` in a source file, read without importing it"""
+    found = {}
+    for node in ast.walk(ast.parse(Path(path).read_text(encoding="utf-8"))):
+        if isinstance(node, ast.ClassDef) and node.name == "Locators":
+            for statement in node.body:
+                if (isinstance(statement, ast.Assign) and isinstance(statement.value, ast.Constant)
+                        and isinstance(statement.value.value, str)):
+                    for target in statement.targets:
+                        if isinstance(target, ast.Name):
+                            found[target.id] = statement.value.value
+    return found
+
+def format_report(results: List[CompiledLocator], title: str = "") -> str:
+    """Human-readable compile report, uncompiled locators first"""
+    compiled = sum(result.compiled for result in results)
+    lines = [f"{title}: {compiled}/{len(results)} locators compiled"]
+    for result in sorted(results, key=lambda result: (result.compiled, result.name)):
+        if result.compiled:
+            lines.append(f"  {result.name}: {result.reason} -> {result.locator[1]}")
+        else:
+            lines.append(f"  NOT COMPILED {result.name}: {result.reason}")
+    return "\n".join(lines)
+
+if __name__ == "__main__":
+    """Print the compile report for config.py and the test modules (or the given files)"""
+    paths = [Path(arg) for arg in sys.argv[1:]] or (
+        [REPO_ROOT / "mobile_automation" / "config.py"] + sorted((REPO_ROOT / "tests").glob("*.py"))
+    )
+    for path in paths:
+        locators = locators_in_file(path)
+        if locators:
+            print(format_report(compile_locators(locators), path.name))
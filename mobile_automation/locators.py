@@ -0,0 +1,139 @@
+"""
+Locator resolution for the ZoomCat suites
+LocatorStrategy helpers return several candidate strategies per element. The
+resolver polls all of them against one shared deadline instead of giving each
+strategy its own WebDriverWait, so a stale first XPath no longer burns 10 s
+before the other specific strategies are tried. Class-only fallbacks still
+wait for the full timeout, as they did before. Outcomes are kept in a
+persistent hit-rate cache so later runs try the historically cheapest
+strategy first, within each specificity tier (precise, XPath, class-only).
+Given a UiSnapshot, each poll reads the page source once and checks every
+eligible candidate locally instead of sending one find request per candidate.
+"""
+
+# ===== Imports =====
+import atexit
+import threading
+import time
+from typing import Callable, Dict, List, Optional, Tuple
+
+from selenium.common.exceptions import TimeoutException, WebDriverException
+from selenium.webdriver.support import expected_conditions as EC
+from selenium.webdriver.support.ui import WebDriverWait
+
+from .locator_compiler import CLASS_ONLY, locator_specificity
+from .snapshot import UiSnapshot
+from .strategy_cache import CACHE_DIR, StrategyCache, detect_app_version
+
+# Winning strategy of every lookup made in this process
+RESOLUTIONS: List[Dict] = []
+
+_cache: Optional[StrategyCache] = None
+_cache_lock = threading.Lock()
+
+# ===== Hit-Rate Cache =====
+def strategy_key(locator: Tuple[str, str]) -> str:
+    by, value = locator
+    return f"{by}={value}"
+
+def locator_cache(driver) -> StrategyCache:
+    """The process-wide locator cache, switched to the app version of the driver's session"""
+    global _cache
+    with _cache_lock:
+        if _cache is None:
+            _cache = StrategyCache(CACHE_DIR / "locator_cache.json")
+            atexit.register(save_locator_cache)
+        _cache.use_app_version(detect_app_version(driver))
+        return _cache
+
+def save_locator_cache():
+    if _cache is not None:
+        with _cache_lock:
+            _cache.save()
+
+def print_locator_rankings():
+    """Print the current per-element strategy rankings"""
+    if _cache is not None and _cache.entries:
+        print("\n=== LOCATOR STRATEGY RANKINGS ===")
+        print(_cache.format_rankings(tier=lambda key: locator_specificity(tuple(key.split("=", 1)))))
+
+# ===== Expected Conditions =====
+def first_matching_locator(locators: List[Tuple[str, str]], condition: Callable, fallback_grace: float,
+                           polled: Optional[set] = None, snapshot: Optional[UiSnapshot] = None,
+                           class_only_after: float = 0.0):
+    """
+    An expectation that one of the candidate locators satisfies the condition.
+    Candidates are polled in order; candidate i only becomes eligible after
+    i * fallback_grace seconds, and class-only fallbacks (which match any
+    element of their class) only after class_only_after seconds, so they
+    cannot win while a precise locator's element is still rendering. The
+    ranks that were polled are added to polled. Returns (rank, locator, element).
+    With a snapshot, candidates it can answer are matched against one page
+    source per poll and only the winner's handle is fetched from Appium.
+    """
+    start = time.monotonic()
+    polled = polled if polled is not None else set()
+
+    def _predicate(driver):
+        elapsed = time.monotonic() - start
+        for rank, locator in enumerate(locators):
+            if locator_specificity(locator) == CLASS_ONLY:
+                if elapsed < class_only_after:
+                    break
+            elif elapsed < rank * fallback_grace:
+                break
+            polled.add(rank)
+            try:
+                if snapshot is not None and snapshot.can_answer(locator, condition):
+                    node = snapshot.match(locator, condition)
+                    element = snapshot.element_for(locator, node) if node is not None else None
+                else:
+                    element = condition(locator)(driver)
+            except WebDriverException:
+                continue
+            if element:
+                return rank, locator, element
+        if snapshot is not None:
+            snapshot.invalidate()
+        return False
+
+    return _predicate
+
+# ===== Resolver =====
+def resolve_first(driver, locators: List[Tuple[str, str]], name: str = "element",
+                  condition: Callable = EC.presence_of_element_located, timeout: float = 10,
+                  fallback_grace: float = 1.0, poll_frequency: float = 0.2,
+                  snapshot: Optional[UiSnapshot] = None, fallback_timeout: float = 5):
+    """
+    Find an element with the first candidate strategy that hits before the
+    shared deadline. Candidates are tried in the order learned by the
+    locator cache within their specificity tier, and the cache is updated
+    with the outcome. The specific candidates get the full timeout on their
+    own; class-only fallbacks only join after it, for fallback_timeout more
+    seconds.
+    """
+    cache = locator_cache(driver)
+    locators = cache.rank(name, locators, key=strategy_key, tier=locator_specificity)
+    class_only = [locator_specificity(locator) == CLASS_ONLY for locator in locators]
+    class_only_after = timeout if not all(class_only) else 0.0
+    deadline = timeout + (fallback_timeout if any(class_only) and not all(class_only) else 0)
+    polled = set()
+    start = time.perf_counter()
+    try:
+        rank, (by, value), element = WebDriverWait(driver, deadline, poll_frequency=poll_frequency).until(
+            first_matching_locator(locators, condition, fallback_grace, polled, snapshot, class_only_after)
+        )
+    except TimeoutException:
+        elapsed = time.perf_counter() - start
+        with _cache_lock:
+            for missed in polled:
+                cache.record(name, strategy_key(locators[missed]), False, elapsed)
+        RESOLUTIONS.append({"name": name, "strategy": None, "locator": None, "rank": None, "seconds": elapsed})
+        raise TimeoutException(f"Could not find {name} with any locator strategy")
+    elapsed = time.perf_counter() - start
+    with _cache_lock:
+        for tried in polled:
+            cache.record(name, strategy_key(locators[tried]), tried == rank, elapsed)
+    RESOLUTIONS.append({"name": name, "strategy": by, "locator": value, "rank": rank, "seconds": elapsed})
+    print(f"Found {name} using {by} (strategy {rank + 1}/{len(locators)}, {elapsed:.2f}s)")
+    return element
@@ -0,0 +1,148 @@
+"""
+Appium command latency profiler for the ZoomCat suites
+Every WebDriver call is an HTTP round trip to the Appium server. The profiler
+wraps a driver's command executor and records, per suite and per command, how
+many times the command ran, how long each round trip took (as a latency
+histogram) and how many bytes went over the wire. The runner prints the
+commands that dominate the run next to its final summary.
+
+Commands are attributed to the suite whose step trace is active on the
+driver; commands issued outside a trace (session setup, app resets between
+suites) are grouped under SETUP_SUITE.
+"""
+
+# ===== Imports =====
+import bisect
+import json
+import threading
+import time
+from typing import Dict, List, Optional, Tuple
+
+from .tracing import active_trace
+
+# Upper bounds of the latency histogram buckets, in milliseconds
+LATENCY_BUCKETS_MS = [10, 25, 50, 100, 250, 500, 1000, 2500, 5000]
+SETUP_SUITE = "(session setup)"
+
+# ===== Statistics =====
+class CommandStats:
+    """Count, latency histogram and payload size of one command"""
+
+    def __init__(self):
+        self.count = 0
+        self.seconds = 0.0
+        self.request_bytes = 0
+        self.response_bytes = 0
+        self.histogram = [0] * (len(LATENCY_BUCKETS_MS) + 1)
+        self.latencies: List[float] = []
+
+    def add(self, seconds: float, request_bytes: int, response_bytes: int):
+        self.count += 1
+        self.seconds += seconds
+        self.request_bytes += request_bytes
+        self.response_bytes += response_bytes
+        self.histogram[bisect.bisect_left(LATENCY_BUCKETS_MS, seconds * 1000)] += 1
+        self.latencies.append(seconds)
+
+    def percentile(self, fraction: float) -> float:
+        ordered = sorted(self.latencies)
+        return ordered[min(int(fraction * len(ordered)), len(ordered) - 1)] if ordered else 0.0
+
+    @property
+    def payload_bytes(self) -> int:
+        return self.request_bytes + self.response_bytes
+
+# (suite, command) -> stats for every profiled driver in this process
+PROFILE: Dict[Tuple[str, str], CommandStats] = {}
+_lock = threading.Lock()
+
+def payload_size(payload) -> int:
+    """Approximate JSON size of a request or response payload"""
+    if payload is None:
+        return 0
+    if isinstance(payload, str):
+        return len(payload)
+    try:
+        return len(json.dumps(payload))
+    except (TypeError, ValueError):
+        return len(str(payload))
+
+def record_command(suite: str, command: str, seconds: float, request_bytes: int, response_bytes: int):
+    with _lock:
+        stats = PROFILE.setdefault((suite, command), CommandStats())
+        stats.add(seconds, request_bytes, response_bytes)
+
+# ===== Driver Hook =====
+def profile_driver(driver):
+    """Wrap the driver's command executor so every command is profiled; safe to call twice"""
+    executor = driver.command_executor
+    if getattr(executor, "_zoomcat_profiled", False):
+        return driver
+    original_execute = executor.execute
+
+    def _execute(command, params):
+        start = time.perf_counter()
+        response = None
+        try:
+            response = original_execute(command, params)
+            return response
+        finally:
+            elapsed = time.perf_counter() - start
+            trace = active_trace(driver)
+            value = response.get("value") if isinstance(response, dict) else response
+            record_command(trace.suite_name if trace else SETUP_SUITE, command, elapsed,
+                           payload_size(params), payload_size(value))
+
+    executor.execute = _execute
+    executor._zoomcat_profiled = True
+    return driver
+
+# ===== Reporting =====
+def command_totals(suite: Optional[str] = None) -> Dict[str, CommandStats]:
+    """Stats per command, merged over every suite (or for one suite)"""
+    totals: Dict[str, CommandStats] = {}
+    with _lock:
+        items = list(PROFILE.items())
+    for (suite_name, command), stats in items:
+        if suite is not None and suite_name != suite:
+            continue
+        merged = totals.setdefault(command, CommandStats())
+        merged.count += stats.count
+        merged.seconds += stats.seconds
+        merged.request_bytes += stats.request_bytes
+        merged.response_bytes += stats.response_bytes
+        merged.histogram = [a + b for a, b in zip(merged.histogram, stats.histogram)]
+        merged.latencies.extend(stats.latencies)
+    return totals
+
+def format_histogram(histogram: List[int]) -> str:
+    labels = [f"<{bound}ms" for bound in LATENCY_BUCKETS_MS] + [f">={LATENCY_BUCKETS_MS[-1]}ms"]
+    return " ".join(f"{label}:{count}" for label, count in zip(labels, histogram) if count)
+
+def print_command_profile(top: int = 10):
+    """Print the top commands by total latency, their histograms, and a per-suite breakdown"""
+    totals = command_totals()
+    if not totals:
+        return
+    print(f"\n=== APPIUM COMMAND PROFILE (top {top} by total time) ===")
+    print(f"  {'Command':<24}{'Count':>7}{'Total':>9}{'Mean':>9}{'p95':>9}{'KB':>9}")
+    ranked = sorted(totals.items(), key=lambda item: item[1].seconds, reverse=True)[:top]
+    for command, stats in ranked:
+        print(f"  {command:<24}{stats.count:>7}{stats.seconds:>8.1f}s"
+              f"{stats.seconds / stats.count * 1000:>7.0f}ms{stats.percentile(0.95) * 1000:>7.0f}ms"
+              f"{stats.payload_bytes / 1024:>9.1f}")
+    print("  Latency histograms:")
+    for command, stats in ranked:
+        print(f"    {command}: {format_histogram(stats.histogram)}")
+
+    print("  Per suite:")
+    with _lock:
+        suites = sorted({suite for suite, _ in PROFILE})
+    for suite in suites:
+        suite_totals = command_totals(suite)
+        count = sum(stats.count for stats in suite_totals.values())
+        seconds = sum(stats.seconds for stats in suite_totals.values())
+        size = sum(stats.payload_bytes for stats in suite_totals.values())
+        slowest, slowest_stats = max(suite_totals.items(), key=lambda item: item[1].seconds)
+        print(f"    {suite}: {count} commands, {seconds:.1f}s, {size / 1024:.1f} KB "
+              f"(most time in {slowest}: {slowest_stats.seconds:.1f}s)")
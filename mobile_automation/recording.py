@@ -0,0 +1,108 @@
+"""
+Device-side screen recording for the long ZoomCat flows
+Instead of one synchronous screenshot round trip per step, a suite can record
+the screen once and only mark the time of each step. When the recording is
+stopped the marked moments are extracted as keyframes with ffmpeg, under the
+same file names the step screenshots would have had. The full video is only
+kept for failed runs (or when ffmpeg is not available to extract keyframes).
+
+Recording is off by default; enable it with the runner's --record flag or
+ZOOMCAT_RECORD=1. Error frames are still captured as real screenshots.
+"""
+
+# ===== Imports =====
+import base64
+import json
+import os
+import shutil
+import subprocess
+import time
+from typing import Dict, List, Optional, Tuple
+
+from selenium.common.exceptions import WebDriverException
+
+RECORDING_ENABLED = os.environ.get("ZOOMCAT_RECORD", "").lower() in ("1", "true", "yes")
+
+# Recording in progress for each session id
+_active: Dict[str, "ScreenRecording"] = {}
+
+def set_recording_enabled(enabled: bool):
+    global RECORDING_ENABLED
+    RECORDING_ENABLED = enabled
+
+def active_recording(driver) -> Optional["ScreenRecording"]:
+    """The recording in progress on the driver's session, if any"""
+    return _active.get(getattr(driver, "session_id", None))
+
+# ===== Recording =====
+class ScreenRecording:
+    """One suite's screen recording plus the step timestamps logged during it"""
+
+    VIDEO_NAME = "screen_recording.mp4"
+
+    def __init__(self, driver, report_dir: str, time_limit: int = 1800):
+        self.driver = driver
+        self.report_dir = report_dir
+        self.time_limit = time_limit
+        self.started_at = None
+        self.marks: List[Tuple[float, str]] = []
+
+    def start(self):
+        self.driver.start_recording_screen(timeLimit=str(self.time_limit), forceRestart=True)
+        self.started_at = time.monotonic()
+        _active[self.driver.session_id] = self
+        print(f"Screen recording started for {self.report_dir}")
+
+    def mark(self, path: str):
+        """Remember that the frame for path should be taken from the video at this moment"""
+        self.marks.append((time.monotonic() - self.started_at, path))
+
+    def stop(self, failed: bool):
+        """Stop recording, extract the step keyframes and keep the video only if the run failed"""
+        _active.pop(self.driver.session_id, None)
+        try:
+            payload = self.driver.stop_recording_screen()
+        except WebDriverException as e:
+            print(f"Could not stop screen recording: {e.__class__.__name__}")
+            return
+        video_path = os.path.join(self.report_dir, self.VIDEO_NAME)
+        with open(video_path, "wb") as video:
+            video.write(base64.b64decode(payload))
+        with open(os.path.join(self.report_dir, "recording_steps.json"), "w") as steps:
+            json.dump([{"seconds": round(offset, 3), "frame": os.path.basename(path)} for offset, path in self.marks],
+                      steps, indent=2)
+
+        extracted = self.extract_keyframes(video_path)
+        if failed or not extracted:
+            print(f"Screen recording kept: {video_path}")
+        else:
+            os.remove(video_path)
+            print(f"Extracted {len(self.marks)} keyframes, screen recording discarded")
+
+    def extract_keyframes(self, video_path: str) -> bool:
+        """Write one frame per marked step; returns False if ffmpeg is unavailable or fails"""
+        ffmpeg = shutil.which("ffmpeg")
+        if ffmpeg is None:
+            print("ffmpeg not found, keeping the video and step timestamps instead of keyframes")
+            return False
+        for offset, path in self.marks:
+            result = subprocess.run(
+                [ffmpeg, "-v", "error", "-y", "-ss", f"{offset:.3f}", "-i", video_path, "-frames:v", "1", path],
+                capture_output=True
+            )
+            if result.returncode != 0:
+                print(f"Keyframe extraction failed for {os.path.basename(path)}: {result.stderr.decode().strip()}")
+                return False
+        return True
+
+def start_recording(driver, report_dir: str) -> Optional[ScreenRecording]:
+    """Start recording the suite when recording mode is on; returns None otherwise"""
+    if not RECORDING_ENABLED or driver is None:
+        return None
+    recording = ScreenRecording(driver, report_dir)
+    try:
+        recording.start()
+    except WebDriverException as e:
+        print(f"Screen recording unavailable ({e.__class__.__name__}), taking screenshots instead")
+        return None
+    return recording
@@ -0,0 +1,228 @@
+"""
+Dependency-graph scheduler for the ZoomCat suites
+Each suite declares the suites it requires (it is skipped if one of them does
+not pass) and the suites it only has to run after (ordering without the
+pass/fail gate). The scheduler runs suites in topological order, starts
+independent suites concurrently when more than one device is available, and
+reports the critical path of the run. With pipelining on, idle devices have
+their session pre-warmed while there are suites left to run on them.
+
+Requirements are feature gates, not device state. The app state a suite
+needs on its device (logged in, logged out) is declared separately: each
+suite names the state it needs and the state it leaves the device in when it
+passes, and the scheduler tracks the state of every device. A suite prefers a
+free device that is already in its state; on any other device the setup for
+that state (the login or logout flow) runs first, so dependent suites can
+spread over every device instead of queueing behind the one that ran login.
+"""
+
+# ===== Imports =====
+import time
+import traceback
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from typing import Callable, Dict, List, Optional, Sequence, Tuple
+
+from .sleeps import apply_sleep_budget
+
+# ===== Results =====
+def suite_status(result) -> str:
+    """Collapse a suite result (a status string, or a dict of per-test statuses) into PASSED/FAILED/SKIPPED"""
+    if result == "SKIPPED":
+        return "SKIPPED"
+    if isinstance(result, dict):
+        return "PASSED" if result and all(value == "PASSED" for value in result.values()) else "FAILED"
+    return "PASSED" if result == "PASSED" else "FAILED"
+
+# ===== Suite Graph =====
+class Suite:
+    """One node of the suite graph"""
+
+    def __init__(self, name: str, run: Callable, label: str = "", requires: Sequence[str] = (),
+                 after: Sequence[str] = (), state: Optional[str] = None, leaves: Optional[str] = None):
+        self.name = name
+        self.run = run
+        self.label = label or name.replace("_", " ").title()
+        self.requires = tuple(requires)
+        self.after = tuple(after)
+        self.state = state
+        self.leaves = leaves
+
+    @property
+    def predecessors(self) -> Tuple[str, ...]:
+        return self.requires + self.after
+
+class SuiteScheduler:
+    """Runs a suite graph on the devices of a session pool"""
+
+    def __init__(self, suites: List[Suite], pool, devices: Optional[List[str]] = None, pipeline: bool = False,
+                 setups: Optional[Dict[str, Callable]] = None, initial_state: Optional[str] = None):
+        self.suites = {suite.name: suite for suite in suites}
+        self.pool = pool
+        self.pipeline = pipeline
+        self.devices = list(devices or [pool.default_device])
+        self.setups = dict(setups or {})
+        missing = sorted({suite.state for suite in suites if suite.state and suite.state not in self.setups})
+        if missing:
+            raise ValueError(f"No setup for device state(s): {', '.join(missing)}")
+        self.device_states: Dict[str, Optional[str]] = {device: initial_state for device in self.devices}
+        # (suite name, state, device, seconds) of every setup run before a suite
+        self.setup_runs: List[Tuple[str, str, str, float]] = []
+        self.order = self.topological_order()
+        self.results: Dict[str, object] = {}
+        self.timings: Dict[str, Tuple[float, float]] = {}
+        self.assignments: Dict[str, str] = {}
+        self.wall_clock = 0.0
+        self._free_devices = list(self.devices)
+        self._prewarmed = set()
+        self._started = 0
+
+    def topological_order(self) -> List[str]:
+        """Suite names in dependency order (declaration order among independent suites)"""
+        for suite in self.suites.values():
+            unknown = [name for name in suite.predecessors if name not in self.suites]
+            if unknown:
+                raise ValueError(f"Suite '{suite.name}' depends on unknown suite(s): {', '.join(unknown)}")
+        order, placed = [], set()
+        while len(order) < len(self.suites):
+            ready = [name for name, suite in self.suites.items()
+                     if name not in placed and all(dep in placed for dep in suite.predecessors)]
+            if not ready:
+                cycle = sorted(set(self.suites) - placed)
+                raise ValueError(f"Suite dependencies contain a cycle among: {', '.join(cycle)}")
+            order.append(ready[0])
+            placed.add(ready[0])
+        return order
+
+    # ----- Execution -----
+    def _run_on_device(self, suite: Suite, device: str):
+        """Run one suite on the device's pooled session"""
+        return suite.run(self.pool.acquire(suite.name, device))
+
+    def _run_setup(self, state: str, device: str):
+        """Run the setup for a device state on the device's pooled session"""
+        return self.setups[state](self.pool.acquire(f"setup {state}", device))
+
+    def _prewarm(self, device: str):
+        """Start creating the device's session in the background"""
+        self.pool.prewarm(device)
+
+    def _prepare_device(self, suite: Suite, device: str) -> bool:
+        """Bring the device into the state the suite needs; False if the setup did not pass"""
+        state = self.device_states.get(device)
+        if suite.state is None or state == suite.state:
+            return True
+        print(f"\nSetting up device {device} for {suite.label}: {state or 'unknown state'} -> {suite.state}")
+        start = time.perf_counter()
+        try:
+            result = self._run_setup(suite.state, device)
+        except Exception as e:
+            print(f"Setup {suite.state} failed with error:", e)
+            traceback.print_exc()
+            result = "FAILED"
+        result = apply_sleep_budget(result)
+        self.setup_runs.append((suite.name, suite.state, device, time.perf_counter() - start))
+        if suite_status(result) != "PASSED":
+            print(f"Could not bring device {device} into state {suite.state}, {suite.label} cannot run")
+            return False
+        self.device_states[device] = suite.state
+        return True
+
+    def _execute(self, suite: Suite, device: str):
+        start = time.perf_counter() - self._run_start
+        try:
+            result = self._run_on_device(suite, device) if self._prepare_device(suite, device) else "FAILED"
+        except Exception as e:
+            print(f"{suite.label} failed with error:", e)
+            traceback.print_exc()
+            result = "FAILED"
+        # Collected on the error path too: a violation left on this thread would fail the next suite run on it
+        result = apply_sleep_budget(result)
+        if suite.leaves and suite_status(result) == "PASSED":
+            self.device_states[device] = suite.leaves
+        return result, start, time.perf_counter() - self._run_start
+
+    def _skip(self, suite: Suite, failed: List[str]):
+        labels = ", ".join(self.suites[name].label for name in failed)
+        print(f"\nSkipping {suite.label} because {labels} did not pass.")
+        self.results[suite.name] = "SKIPPED"
+        now = time.perf_counter() - self._run_start
+        self.timings[suite.name] = (now, now)
+
+    def _start_ready(self, pending: List[str], running: Dict, executor: ThreadPoolExecutor):
+        """Skip or start every pending suite whose predecessors have finished"""
+        changed = True
+        while changed:
+            changed = False
+            for name in list(pending):
+                suite = self.suites[name]
+                if not all(dep in self.results for dep in suite.predecessors):
+                    continue
+                failed = [dep for dep in suite.requires if suite_status(self.results[dep]) != "PASSED"]
+                if failed:
+                    pending.remove(name)
+                    self._skip(suite, failed)
+                    changed = True
+                elif self._free_devices:
+                    # Prefer a device that is already in the state the suite needs, to save a setup
+                    device = next((free for free in self._free_devices
+                                   if suite.state is None or self.device_states.get(free) == suite.state),
+                                  self._free_devices[0])
+                    pending.remove(name)
+                    self._free_devices.remove(device)
+                    self.assignments[name] = device
+                    self._started += 1
+                    print(f"\n[{self._started}/{len(self.suites)}] Running {suite.label}..."
+                          + (f" (device {device})" if len(self.devices) > 1 else ""))
+                    running[executor.submit(self._execute, suite, device)] = (name, device)
+        if self.pipeline and pending:
+            # Idle devices will get one of the pending suites; overlap their session start-up with the running ones
+            for device in self._free_devices:
+                if device not in self._prewarmed:
+                    self._prewarmed.add(device)
+                    self._prewarm(device)
+
+    def run(self) -> Dict[str, object]:
+        """Run the whole graph and return the results in declaration order"""
+        self._run_start = time.perf_counter()
+        pending = list(self.order)
+        running: Dict = {}
+        with ThreadPoolExecutor(max_workers=len(self.devices), thread_name_prefix="suite") as executor:
+            self._start_ready(pending, running, executor)
+            while running:
+                done, _ = wait(running, return_when=FIRST_COMPLETED)
+                for future in done:
+                    name, device = running.pop(future)
+                    result, start, end = future.result()
+                    self.results[name] = result
+                    self.timings[name] = (start, end)
+                    self._free_devices.append(device)
+                self._start_ready(pending, running, executor)
+        self.wall_clock = time.perf_counter() - self._run_start
+        return {name: self.results[name] for name in self.suites}
+
+    # ----- Reporting -----
+    def critical_path(self) -> Tuple[float, List[str]]:
+        """The chain of dependent suites with the largest total run time"""
+        longest: Dict[str, Tuple[float, List[str]]] = {}
+        for name in self.order:
+            start, end = self.timings.get(name, (0.0, 0.0))
+            before = max((longest[dep] for dep in self.suites[name].predecessors),
+                         key=lambda item: item[0], default=(0.0, []))
+            longest[name] = (before[0] + (end - start), before[1] + [name])
+        return max(longest.values(), key=lambda item: item[0], default=(0.0, []))
+
+    def print_report(self):
+        """Print per-suite timings and the critical path"""
+        print("\n=== SCHEDULE ===")
+        for name in self.order:
+            start, end = self.timings.get(name, (0.0, 0.0))
+            device = f", device {self.assignments[name]}" if len(self.devices) > 1 and name in self.assignments else ""
+            print(f"  {self.suites[name].label}: {suite_status(self.results.get(name))} "
+                  f"({start:.1f}s -> {end:.1f}s, {end - start:.1f}s{device})")
+        for name, state, device, seconds in self.setup_runs:
+            print(f"  Setup {state} before {self.suites[name].label}: {seconds:.1f}s on device {device} "
+                  f"(included above)")
+        seconds, path = self.critical_path()
+        busy = sum(end - start for start, end in self.timings.values())
+        print(f"  Critical path: {' -> '.join(self.suites[name].label for name in path)} ({seconds:.1f}s)")
+        print(f"  Wall clock: {self.wall_clock:.1f}s on {len(self.devices)} device(s), {busy:.1f}s of suite time")
@@ -0,0 +1,76 @@
+"""
+Perceptual screen hashing for the ZoomCat suites
+A difference hash (dHash) of a screenshot: the frame is converted to
+grayscale, the status bar (clock, battery, notifications) is cropped off, and
+the rest is downscaled to (HASH_SIZE + 1) x HASH_SIZE. Each bit records whether
+a cell is brighter than its right-hand neighbour. Two captures of the same
+screen give the same hash even when their PNG bytes differ, and the number of
+differing bits (the Hamming distance) measures how much the screen changed.
+
+The hashes are used to write a step's screenshot as a copy of the previous
+frame when nothing visible changed (see screenshots.py), and to wait until
+the screen has changed or stopped changing (see waits.py).
+
+Hashing needs NumPy and Pillow. Without them, frame_signature falls back to
+a digest of the PNG bytes, so only byte-identical frames count as the same
+screen.
+"""
+
+# ===== Imports =====
+import hashlib
+import io
+from typing import Optional, Union
+
+try:
+    import numpy as np
+    from PIL import Image
+except ImportError:  # NumPy and Pillow are only needed for perceptual hashing
+    np = Image = None
+
+HASH_SIZE = 16                # 256-bit hash
+STATUS_BAR_FRACTION = 0.04    # top of the frame ignored when hashing
+SAME_SCREEN_DISTANCE = 0      # differing bits still treated as the same screen
+
+Signature = Union[int, str]
+
+_warned_unavailable = False
+
+def perceptual_hashing_available() -> bool:
+    return Image is not None
+
+# ===== Hashing =====
+def dhash(png: bytes, hash_size: int = HASH_SIZE) -> int:
+    """Difference hash of a PNG screenshot, as a hash_size * hash_size bit integer"""
+    image = Image.open(io.BytesIO(png)).convert("L")
+    top = int(image.height * STATUS_BAR_FRACTION)
+    image = image.crop((0, top, image.width, image.height))
+    image = image.resize((hash_size + 1, hash_size), Image.Resampling.BILINEAR)
+    pixels = np.asarray(image, dtype=np.int16)
+    bits = pixels[:, 1:] > pixels[:, :-1]
+    return int.from_bytes(np.packbits(bits).tobytes(), "big")
+
+def hamming(first: int, second: int) -> int:
+    return bin(first ^ second).count("1")
+
+def frame_signature(png: bytes) -> Signature:
+    """The dHash of a frame, or a digest of its bytes when NumPy or Pillow is missing"""
+    global _warned_unavailable
+    if Image is None:
+        if not _warned_unavailable:
+            _warned_unavailable = True
+            print("NumPy/Pillow not installed; screens are compared byte for byte instead of perceptually")
+        return hashlib.sha256(png).hexdigest()
+    return dhash(png)
+
+def same_screen(first: Optional[Signature], second: Optional[Signature],
+                max_distance: int = SAME_SCREEN_DISTANCE) -> bool:
+    """Whether two frame signatures show the same screen"""
+    if first is None or second is None:
+        return False
+    if isinstance(first, int) and isinstance(second, int):
+        return hamming(first, second) <= max_distance
+    return first == second
+
+def screen_signature(driver) -> Signature:
+    """Capture the current screen and return its signature"""
+    return frame_signature(driver.get_screenshot_as_png())
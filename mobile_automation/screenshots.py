@@ -0,0 +1,391 @@
+"""
+Asynchronous screenshot writer for the ZoomCat suites
+Capturing a screenshot has to talk to the device, but decoding the base64
+payload and writing the image does not. take_screenshot only fetches the
+payload; background threads drain a bounded queue and write the files.
+The runner, the device farm workers and every suite's teardown call
+flush_screenshots before closing the driver. The queue is also flushed at
+interpreter exit, so a script that exits without that teardown still keeps
+every frame.
+
+A capture policy decides which steps are captured at all:
+  always     every step (the default)
+  on_error   only error frames (step names containing "error")
+  every:N    every Nth step, plus every error frame
+  ring:K     every step is captured into memory; the last K frames of a
+             report directory are written only when an error frame arrives
+The policy comes from the runner's --screenshots flag or the
+ZOOMCAT_SCREENSHOTS environment variable.
+
+Frames are downscaled and re-encoded by a pool of encoder threads according
+to the output format, FORMAT[:QUALITY[:SCALE]] with FORMAT png, jpeg or webp
+(e.g. webp:80:0.5), from the runner's --screenshot-format flag or the
+ZOOMCAT_SCREENSHOT_FORMAT environment variable. The default, png, writes
+frames exactly as captured. Error frames are always full-size PNG.
+
+Written frames go through the content-addressed BlobStore (blob_store.py):
+each distinct frame is stored once under reports/.blobs and the step file is
+a hard link to it. ZOOMCAT_SCREENSHOT_STORE=files writes plain files instead.
+With NumPy and Pillow installed, a frame that is perceptually identical to
+the previous frame of its report directory (screen_hash.py) is written as a
+copy of that frame, so it shares its blob.
+"""
+
+# ===== Imports =====
+import atexit
+import base64
+import io
+import os
+import queue
+import threading
+import time
+from collections import deque
+from concurrent.futures import Future, ThreadPoolExecutor, wait
+from typing import Deque, Dict, Optional, Set, Tuple, Union
+
+try:
+    from PIL import Image
+except ImportError:  # Pillow is only needed to downscale or recompress screenshots
+    Image = None
+
+from .blob_store import BlobStore
+from .interaction import draw_highlights, take_highlights
+from .recording import active_recording
+from .screen_hash import dhash, perceptual_hashing_available, same_screen
+
+ENCODE_WORKERS = min(4, os.cpu_count() or 1)
+
+# ===== Output Format =====
+class OutputFormat:
+    """How step screenshots are encoded on disk: image format, quality and downscale factor"""
+
+    FORMATS = {"png": ("PNG", ".png"), "jpeg": ("JPEG", ".jpg"), "webp": ("WEBP", ".webp")}
+
+    def __init__(self, image_format: str = "png", quality: int = 80, scale: float = 1.0):
+        if image_format == "jpg":
+            image_format = "jpeg"
+        if image_format not in self.FORMATS:
+            raise ValueError(f"Unknown screenshot format '{image_format}', expected one of {', '.join(self.FORMATS)}")
+        if not 0 < scale <= 1:
+            raise ValueError(f"Screenshot scale must be in (0, 1], got {scale}")
+        if Image is None and (image_format != "png" or scale != 1):
+            print("Pillow is not installed; screenshots are written as captured (full-size PNG)")
+            image_format, scale = "png", 1.0
+        self.image_format = image_format
+        self.quality = max(1, min(100, quality))
+        self.scale = scale
+
+    @classmethod
+    def parse(cls, spec: str) -> "OutputFormat":
+        """Build a format from 'FORMAT[:QUALITY[:SCALE]]', e.g. 'webp:80:0.5' or 'png::0.5'"""
+        image_format, _, rest = spec.strip().lower().partition(":")
+        quality, _, scale = rest.partition(":")
+        return cls(image_format or "png", int(quality) if quality else 80, float(scale) if scale else 1.0)
+
+    @classmethod
+    def from_env(cls) -> "OutputFormat":
+        return cls.parse(os.environ.get("ZOOMCAT_SCREENSHOT_FORMAT", "png"))
+
+    def __str__(self):
+        quality = "" if self.image_format == "png" else f" quality {self.quality}"
+        return f"{self.image_format}{quality} at {self.scale:g}x"
+
+    @property
+    def passthrough(self) -> bool:
+        """Whether captured frames are written exactly as the device sent them"""
+        return self.image_format == "png" and self.scale == 1
+
+    def output_path(self, path: str) -> str:
+        return os.path.splitext(path)[0] + self.FORMATS[self.image_format][1]
+
+    def encode(self, png: bytes) -> bytes:
+        """Downscale and re-encode a captured PNG frame"""
+        if self.passthrough:
+            return png
+        image = Image.open(io.BytesIO(png))
+        if self.scale != 1:
+            size = (max(1, round(image.width * self.scale)), max(1, round(image.height * self.scale)))
+            image = image.resize(size, Image.Resampling.LANCZOS)
+        output = io.BytesIO()
+        if self.image_format == "png":
+            image.save(output, format="PNG", optimize=True)
+        else:
+            # Neither format needs the alpha channel of the device's screenshots
+            image.convert("RGB").save(output, format=self.FORMATS[self.image_format][0], quality=self.quality)
+        return output.getvalue()
+
+# ===== Writer =====
+class ScreenshotWriter:
+    """
+    Writes captured screenshots off the test thread. A background thread takes
+    the frames in capture order, decodes them and drops unchanged screens; a
+    pool of encoder threads then downscales, re-encodes and stores them.
+    Error frames are always kept as the full-resolution PNG the device sent.
+    """
+
+    def __init__(self, max_pending: int = 32, store: Optional[BlobStore] = None,
+                 output_format: Optional[OutputFormat] = None):
+        # Bounded so a slow disk applies back-pressure instead of holding every frame in memory
+        self._queue: queue.Queue = queue.Queue(maxsize=max_pending)
+        self._thread: Optional[threading.Thread] = None
+        self._encoders: Optional[ThreadPoolExecutor] = None
+        self._pending: Set[Future] = set()
+        self._lock = threading.Lock()
+        self._exit_hook = False
+        self.store = store
+        self.output_format = output_format or OutputFormat()
+        # Hash and encoded output of the last frame written to each report directory
+        self._previous: Dict[str, Tuple[int, Future]] = {}
+        self.written = 0
+        self.similar = 0
+        self.failed = 0
+        self.captured_bytes = 0
+        self.output_bytes = 0
+        self.write_seconds = 0.0
+
+    def _ensure_started(self):
+        with self._lock:
+            if self._thread is None or not self._thread.is_alive():
+                self._encoders = ThreadPoolExecutor(max_workers=ENCODE_WORKERS, thread_name_prefix="screenshot-encoder")
+                self._thread = threading.Thread(target=self._run, name="screenshot-writer", daemon=True)
+                self._thread.start()
+                if not self._exit_hook:
+                    # atexit runs after concurrent.futures has shut the encoder pool down, so the frames
+                    # still queued at exit are encoded on the writer thread itself (see _run)
+                    atexit.register(self.flush)
+                    self._exit_hook = True
+
+    def submit(self, payload: str, path: str, highlights: Tuple = ()):
+        """Queue a base64 PNG payload to be written to path, with visual-debug highlights drawn on it"""
+        self._ensure_started()
+        self._queue.put((payload, path, highlights))
+
+    def _run(self):
+        while True:
+            payload, path, highlights = self._queue.get()
+            try:
+                data = base64.b64decode(payload)
+                self.captured_bytes += len(data)
+                source, encoded = self._dedupe(data, path, highlights)
+                try:
+                    future = self._encoders.submit(self._encode_and_store, source, path, highlights, encoded)
+                except RuntimeError:
+                    # The encoder pool is already shut down (interpreter exit): encode on this thread
+                    try:
+                        self._encode_and_store(source, path, highlights, encoded)
+                    except (KeyError, OSError, ValueError):
+                        pass  # already counted and reported
+                    continue
+                with self._lock:
+                    self._pending.add(future)
+                future.add_done_callback(self._finished)
+            except (OSError, ValueError) as e:
+                self.failed += 1
+                print(f"Failed to write screenshot {path}: {e}")
+            finally:
+                self._queue.task_done()
+
+    def _dedupe(self, data: bytes, path: str, highlights: Tuple) -> Tuple[Union[bytes, Future], Optional[Future]]:
+        """
+        The frame to write, or the encoding of the previous frame if the screen
+        has not visibly changed; plus, for a new screen, the future its encoding
+        is published to for the unchanged frames that follow
+        """
+        # Error frames and visual-debug overlays are always kept as captured
+        if not perceptual_hashing_available() or highlights or is_error_frame(path):
+            return data, None
+        report_dir = os.path.dirname(os.path.abspath(path))
+        frame_hash = dhash(data)
+        previous = self._previous.get(report_dir)
+        if previous and same_screen(previous[0], frame_hash):
+            self.similar += 1
+            return previous[1], None
+        encoded = Future()
+        self._previous[report_dir] = (frame_hash, encoded)
+        return data, encoded
+
+    def _encode_and_store(self, source: Union[bytes, Future], path: str, highlights: Tuple,
+                          encoded: Optional[Future]) -> bytes:
+        try:
+            start = time.perf_counter()
+            if isinstance(source, Future):
+                data = source.result()
+            elif is_error_frame(path):
+                data = draw_highlights(source, highlights)
+            else:
+                data = self.output_format.encode(draw_highlights(source, highlights))
+            if encoded is not None:
+                encoded.set_result(data)
+            if self.store is not None:
+                self.store.put(data, path)
+            else:
+                with open(path, "wb") as image_file:
+                    image_file.write(data)
+            with self._lock:
+                self.write_seconds += time.perf_counter() - start
+                self.output_bytes += len(data)
+                self.written += 1
+            return data
+        except (KeyError, OSError, ValueError) as e:
+            with self._lock:
+                self.failed += 1
+            print(f"Failed to write screenshot {path}: {e}")
+            raise
+        finally:
+            # Unchanged frames waiting on this one must not wait forever
+            if encoded is not None and not encoded.done():
+                encoded.set_exception(ValueError(f"{os.path.basename(path)} was not written"))
+
+    def _finished(self, future: Future):
+        with self._lock:
+            self._pending.discard(future)
+
+    def flush(self):
+        """Block until every queued screenshot is on disk, then update the report manifests"""
+        if self._thread is not None:
+            self._queue.join()
+            with self._lock:
+                pending = list(self._pending)
+            wait(pending)
+        if self.store is not None:
+            self.store.write_manifests()
+
+# ===== Capture Policy =====
+def is_error_frame(path: str) -> bool:
+    return "error" in os.path.basename(path).lower()
+
+class CapturePolicy:
+    """Decides which step screenshots are captured and which are written to disk"""
+
+    MODES = ("always", "on_error", "every", "ring")
+
+    def __init__(self, mode: str = "always", every: int = 1, ring_size: int = 10):
+        if mode not in self.MODES:
+            raise ValueError(f"Unknown screenshot mode '{mode}', expected one of {', '.join(self.MODES)}")
+        self.mode = mode
+        self.every = max(1, every)
+        self.ring_size = max(1, ring_size)
+        self.steps = 0
+        self.skipped = 0
+        self.discarded = 0
+        self._rings: Dict[str, Deque[Tuple[str, str, Tuple]]] = {}
+
+    @classmethod
+    def parse(cls, spec: str) -> "CapturePolicy":
+        """Build a policy from 'always', 'on_error', 'every:N' or 'ring:K'"""
+        mode, _, count = spec.strip().lower().partition(":")
+        if mode == "every":
+            return cls("every", every=int(count or 1))
+        if mode == "ring":
+            return cls("ring", ring_size=int(count or 10))
+        return cls(mode)
+
+    @classmethod
+    def from_env(cls) -> "CapturePolicy":
+        return cls.parse(os.environ.get("ZOOMCAT_SCREENSHOTS", "always"))
+
+    def __str__(self):
+        if self.mode == "every":
+            return f"every:{self.every}"
+        if self.mode == "ring":
+            return f"ring:{self.ring_size}"
+        return self.mode
+
+    def should_capture(self, path: str) -> bool:
+        """Whether the frame for this step should be fetched from the device at all"""
+        self.steps += 1
+        if self.mode in ("always", "ring") or is_error_frame(path):
+            return True
+        if self.mode == "every" and self.steps % self.every == 0:
+            return True
+        self.skipped += 1
+        return False
+
+    def route(self, payload: str, path: str, writer: ScreenshotWriter, highlights: Tuple = ()):
+        """Send a captured frame to the writer, or keep it in the ring buffer"""
+        if self.mode != "ring":
+            writer.submit(payload, path, highlights)
+            return
+        ring = self._rings.setdefault(os.path.dirname(path), deque(maxlen=self.ring_size))
+        if not is_error_frame(path):
+            if len(ring) == ring.maxlen:
+                self.discarded += 1
+            ring.append((payload, path, highlights))
+            return
+        print(f"Error frame captured, writing the last {len(ring)} buffered screenshots")
+        while ring:
+            writer.submit(*ring.popleft())
+        writer.submit(payload, path, highlights)
+
+    @property
+    def buffered(self) -> int:
+        """Frames still held in memory, which are never written unless an error frame follows"""
+        return sum(len(ring) for ring in self._rings.values())
+
+STORE_BLOBS = os.environ.get("ZOOMCAT_SCREENSHOT_STORE", "blobs").lower() != "files"
+
+_writer = ScreenshotWriter(store=BlobStore() if STORE_BLOBS else None, output_format=OutputFormat.from_env())
+_policy = CapturePolicy.from_env()
+
+def set_capture_policy(spec: str) -> CapturePolicy:
+    """Select the capture policy for this process, e.g. 'on_error' or 'ring:10'"""
+    global _policy
+    _policy = CapturePolicy.parse(spec)
+    print(f"Screenshot policy: {_policy}")
+    return _policy
+
+def set_output_format(spec: str) -> OutputFormat:
+    """Select how step screenshots are encoded, e.g. 'webp:80:0.5'; error frames stay full-size PNG"""
+    _writer.output_format = OutputFormat.parse(spec)
+    print(f"Screenshot format: {_writer.output_format}")
+    return _writer.output_format
+
+# ===== Capture API =====
+def capture_screenshot(driver, path: str) -> Optional[str]:
+    """
+    Capture the screen for a step if the policy wants it and write it to path
+    in the background. Returns the path written, whose extension follows the
+    output format except for error frames, or None when the step was skipped.
+    While the session is being recorded, non-error steps are only marked and
+    their frames are extracted from the video later.
+    """
+    recording = active_recording(driver)
+    if recording is not None and not is_error_frame(path):
+        recording.mark(path)
+        return path
+    if not _policy.should_capture(path):
+        return None
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+    if not is_error_frame(path):
+        path = _writer.output_format.output_path(path)
+    _policy.route(driver.get_screenshot_as_base64(), path, _writer, tuple(take_highlights(driver)))
+    return path
+
+def flush_screenshots():
+    """Wait until all captured screenshots have been written"""
+    _writer.flush()
+
+def reset_screenshot_store():
+    """Flush, then forget the report directories seen so far and start new store statistics"""
+    _writer.flush()
+    _writer._previous.clear()
+    if _writer.store is not None:
+        _writer.store = BlobStore()
+
+def print_screenshot_report():
+    """Print what the capture policy captured, skipped and wrote"""
+    _writer.flush()
+    print("\n=== SCREENSHOTS ===")
+    print(f"  Policy: {_policy}")
+    print(f"  Steps: {_policy.steps} (skipped {_policy.skipped})")
+    print(f"  Written: {_writer.written} ({_writer.write_seconds:.1f}s off the test thread)")
+    print(f"  Format: {_writer.output_format}, {_writer.captured_bytes / 1024:.0f} KB captured, "
+          f"{_writer.output_bytes / 1024:.0f} KB written (error frames at full size)")
+    if _writer.similar:
+        print(f"  Unchanged screens written as the previous frame: {_writer.similar}")
+    if _writer.store is not None:
+        print(f"  Stored: {_writer.store.summary()}")
+    if _policy.mode == "ring":
+        print(f"  Discarded from ring buffer: {_policy.discarded + _policy.buffered}")
+    if _writer.failed:
+        print(f"  Failed writes: {_writer.failed}")
@@ -0,0 +1,182 @@
+"""
+Appium session pool for the ZoomCat test runner
+Creating a UiAutomator2 session costs 10-30 s on the device farm, so the pool
+keeps one long-lived driver per device and lends it to each suite in turn.
+Between suites the app is restarted with terminate_app/activate_app instead of
+tearing the whole session down. In pipelining mode a device's session can be
+pre-warmed on a background thread while other suites are still running.
+"""
+
+# ===== Imports =====
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Callable, Dict, List, Optional
+
+from appium import webdriver
+from appium.options.android import UiAutomator2Options
+from selenium.common.exceptions import WebDriverException
+
+from .config import Config
+from .connection import open_connection
+from .profiler import profile_driver
+
+# ===== Driver Factory =====
+STABILITY_CAPABILITIES = {
+    "newCommandTimeout": 300,
+    "autoGrantPermissions": True,
+    "autoAcceptAlerts": True,
+    "waitForIdleTimeout": 0,
+    "androidInstallTimeout": 90000,
+    "adbExecTimeout": 60000
+}
+
+def create_driver_options(capabilities: Dict) -> UiAutomator2Options:
+    """Create UiAutomator2Options from a capabilities dict plus the stability capabilities"""
+    options = UiAutomator2Options()
+    for key, value in capabilities.items():
+        if key.startswith("appium:"):
+            options.set_capability(key, value)
+        else:
+            setattr(options, key.lower().replace("name", "_name"), value)
+    for cap, value in STABILITY_CAPABILITIES.items():
+        options.set_capability(cap, value)
+    return options
+
+def create_driver(server: str, capabilities: Dict):
+    """Create a new Appium session"""
+    driver = profile_driver(webdriver.Remote(open_connection(server), options=create_driver_options(capabilities)))
+    # Every lookup goes through an explicit wait; an implicit wait would stall each miss inside it
+    driver.implicitly_wait(0)
+    return driver
+
+# ===== Session Pool =====
+class SessionPool:
+    """Owns one long-lived Appium session per device and lends it to suites"""
+
+    def __init__(self, server: str = Config.APPIUM_SERVER, capabilities: Optional[Dict] = None,
+                 driver_factory: Callable = create_driver):
+        self.server = server
+        self.capabilities = dict(capabilities or Config.CAPABILITIES)
+        self.driver_factory = driver_factory
+        self.app_package = self.capabilities.get("appium:appPackage")
+        self._sessions = {}
+        self.creation_times: List[float] = []
+        self.reset_times: List[float] = []
+        self.reuse_count = 0
+        self.prewarm_waits: List[float] = []
+        self.prewarm_overlap = 0.0
+        self._warming: Dict[str, Future] = {}
+        self._executor: Optional[ThreadPoolExecutor] = None
+
+    @property
+    def default_device(self) -> str:
+        return self.capabilities.get("appium:udid") or self.capabilities.get("appium:deviceName")
+
+    def _create_session(self, device: str):
+        """Create a fresh session for the device and record how long it took"""
+        capabilities = dict(self.capabilities)
+        capabilities["appium:deviceName"] = device
+        print(f"\n=== Session pool: creating Appium session for device {device} ===")
+        start = time.perf_counter()
+        driver = self.driver_factory(self.server, capabilities)
+        elapsed = time.perf_counter() - start
+        self.creation_times.append(elapsed)
+        print(f"Session created in {elapsed:.1f}s")
+        self._sessions[device] = driver
+        return driver
+
+    def prewarm(self, device: Optional[str] = None):
+        """Start creating the device's session on a background thread unless it already has one"""
+        device = device or self.default_device
+        if device in self._sessions or device in self._warming:
+            return
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(thread_name_prefix="prewarm")
+        print(f"\n=== Session pool: pre-warming session for device {device} ===")
+        self._warming[device] = self._executor.submit(self._create_timed_session, device)
+
+    def _create_timed_session(self, device: str):
+        start = time.perf_counter()
+        return self._create_session(device), time.perf_counter() - start
+
+    def _take_prewarmed(self, suite_name: str, device: str):
+        """Wait for the device's pre-warmed session, if one is being created"""
+        warming = self._warming.pop(device, None)
+        if warming is None:
+            return None
+        start = time.perf_counter()
+        try:
+            driver, creation = warming.result()
+        except Exception as e:
+            print(f"Pre-warming the session for device {device} failed ({e.__class__.__name__}), creating it now")
+            return None
+        waited = time.perf_counter() - start
+        self.prewarm_waits.append(waited)
+        self.prewarm_overlap += max(creation - waited, 0.0)
+        print(f"\n=== Session pool: pre-warmed session ready for {suite_name} on device {device} "
+              f"(waited {waited:.1f}s) ===")
+        return driver
+
+    def reset_app_state(self, driver):
+        """Restart the app under test without ending the Appium session"""
+        start = time.perf_counter()
+        driver.terminate_app(self.app_package)
+        driver.activate_app(self.app_package)
+        elapsed = time.perf_counter() - start
+        self.reset_times.append(elapsed)
+        print(f"App state reset in {elapsed:.1f}s")
+
+    def acquire(self, suite_name: str, device: Optional[str] = None):
+        """Return the device's session, creating it on first use and resetting the app otherwise"""
+        device = device or self.default_device
+        driver = self._take_prewarmed(suite_name, device)
+        if driver is not None:
+            return driver
+        driver = self._sessions.get(device)
+        if driver is not None:
+            print(f"\n=== Session pool: reusing session for {suite_name} on device {device} ===")
+            try:
+                self.reset_app_state(driver)
+                self.reuse_count += 1
+            except WebDriverException as e:
+                print(f"Pooled session is no longer usable ({e.__class__.__name__}), recreating it")
+                self._discard(device)
+                driver = None
+        if driver is None:
+            driver = self._create_session(device)
+        return driver
+
+    def _discard(self, device: str):
+        driver = self._sessions.pop(device, None)
+        if driver is not None:
+            try:
+                driver.quit()
+            except WebDriverException:
+                pass
+
+    def close(self):
+        """Quit every pooled session, including ones still being pre-warmed"""
+        if self._executor is not None:
+            self._executor.shutdown(wait=True)
+            self._warming.clear()
+        for device in list(self._sessions):
+            print(f"\n=== Session pool: closing session for device {device} ===")
+            self._discard(device)
+
+    def estimated_time_saved(self) -> float:
+        """Session-creation time avoided by reusing sessions, net of the app resets"""
+        if not self.creation_times:
+            return 0.0
+        average_creation = sum(self.creation_times) / len(self.creation_times)
+        return self.reuse_count * average_creation - sum(self.reset_times)
+
+    def print_report(self):
+        """Print how much session-creation time the pool saved"""
+        print("\n=== SESSION POOL SUMMARY ===")
+        print(f"  Sessions created: {len(self.creation_times)} ({sum(self.creation_times):.1f}s)")
+        print(f"  Sessions reused: {self.reuse_count}")
+        print(f"  App resets: {len(self.reset_times)} ({sum(self.reset_times):.1f}s)")
+        if self.prewarm_waits:
+            print(f"  Pre-warmed sessions: {len(self.prewarm_waits)} "
+                  f"(waited {sum(self.prewarm_waits):.1f}s, {self.prewarm_overlap:.1f}s of start-up overlapped)")
+        print(f"  Estimated time saved: {self.estimated_time_saved():.1f}s")
@@ -0,0 +1,165 @@
+"""
+Sleep accounting and budgets for the ZoomCat suites
+With accounting on, time.sleep is replaced by a wrapper that records every
+sleep issued from the repository's own code (tests/ and mobile_automation/)
+against the suite and step running on the calling thread and the module,
+function and line that slept. Sleeps inside libraries, such as the polling
+of WebDriverWait, are explicit waits and are not counted.
+
+Each suite has a sleep budget (Config.SLEEP_BUDGET_SECONDS, overridden per
+suite by Config.SLEEP_BUDGETS). The policy decides what happens when a suite
+goes over it:
+
+  report        only record, and print the SLEEP ACCOUNTING report
+  warn[:S]      print a warning the first time a suite exceeds its budget
+  fail[:S]      raise SleepBudgetExceeded from the sleep that would exceed it,
+                and fail the suite even if its own error handling swallows it
+
+S overrides the default budget in seconds. The policy is chosen with the
+runner's --sleeps option or the ZOOMCAT_SLEEPS environment variable.
+"""
+
+# ===== Imports =====
+import os
+import sys
+import threading
+import time
+from pathlib import Path
+from typing import Dict, Optional, Tuple
+
+from .config import Config
+from .tracing import current_trace
+
+REPO_ROOT = Path(__file__).resolve().parent.parent
+ACCOUNTED_DIRS = tuple(str(REPO_ROOT / name) + os.sep for name in ("tests", "mobile_automation"))
+OUTSIDE_SUITES = "(outside suites)"
+NO_STEP = "(before first step)"
+
+_original_sleep = time.sleep
+
+class SleepBudgetExceeded(AssertionError):
+    """A suite slept for longer than its budget allows"""
+
+# ===== Policy =====
+class SleepPolicy:
+    """Whether sleeps are accounted and what to do when a suite exceeds its budget"""
+
+    MODES = ("off", "report", "warn", "fail")
+
+    def __init__(self, mode: str = "off", budget: Optional[float] = None):
+        if mode not in self.MODES:
+            raise ValueError(f"Unknown sleep mode '{mode}', expected one of {', '.join(self.MODES)}")
+        self.mode = mode
+        self.budget = Config.SLEEP_BUDGET_SECONDS if budget is None else budget
+
+    @classmethod
+    def parse(cls, spec: str) -> "SleepPolicy":
+        """Build a policy from 'off', 'report', 'warn[:SECONDS]' or 'fail[:SECONDS]'"""
+        mode, _, budget = spec.strip().lower().partition(":")
+        return cls(mode or "off", float(budget) if budget else None)
+
+    @classmethod
+    def from_env(cls) -> "SleepPolicy":
+        return cls.parse(os.environ.get("ZOOMCAT_SLEEPS", "off"))
+
+    @property
+    def enabled(self) -> bool:
+        return self.mode != "off"
+
+    def budget_for(self, suite: str) -> float:
+        return Config.SLEEP_BUDGETS.get(suite, self.budget)
+
+    def __str__(self):
+        return self.mode if self.mode in ("off", "report") else f"{self.mode}:{self.budget:g}s"
+
+# ===== Ledger =====
+class SleepSite:
+    """Sleeps issued from one line of code during one step"""
+
+    def __init__(self):
+        self.count = 0
+        self.seconds = 0.0
+
+# (suite, step, file, function, line) -> site
+LEDGER: Dict[Tuple[str, str, str, str, int], SleepSite] = {}
+_suite_seconds: Dict[str, float] = {}
+_warned = set()
+_lock = threading.Lock()
+# Budget violation raised on each thread, until the scheduler collects it
+_violations = threading.local()
+
+def _caller_in_repo():
+    """The frame that called time.sleep, if it is the repository's own code"""
+    frame = sys._getframe(2)
+    filename = frame.f_code.co_filename
+    if not filename.startswith(ACCOUNTED_DIRS):
+        return None
+    return frame
+
+def _accounted_sleep(seconds):
+    frame = _caller_in_repo()
+    if frame is None:
+        return _original_sleep(seconds)
+    trace = current_trace()
+    suite = trace.suite_name if trace else OUTSIDE_SUITES
+    step = trace.current.name if trace and trace.current else NO_STEP
+    with _lock:
+        total = _suite_seconds.get(suite, 0.0) + seconds
+        over_budget = suite != OUTSIDE_SUITES and total > _policy.budget_for(suite)
+        if over_budget and _policy.mode == "fail":
+            message = (f"{suite} would sleep {total:.1f}s, over its {_policy.budget_for(suite):g}s budget "
+                       f"({Path(frame.f_code.co_filename).name}:{frame.f_lineno})")
+            _violations.message = getattr(_violations, "message", None) or message
+            raise SleepBudgetExceeded(message)
+        _suite_seconds[suite] = total
+        key = (suite, step, Path(frame.f_code.co_filename).name, frame.f_code.co_name, frame.f_lineno)
+        site = LEDGER.setdefault(key, SleepSite())
+        site.count += 1
+        site.seconds += seconds
+        warn = over_budget and _policy.mode == "warn" and suite not in _warned
+        if warn:
+            _warned.add(suite)
+    if warn:
+        print(f"WARNING: {suite} has slept {total:.1f}s, over its {_policy.budget_for(suite):g}s sleep budget "
+              f"({key[2]}:{key[4]})")
+    _original_sleep(seconds)
+
+def set_sleep_policy(spec: str) -> SleepPolicy:
+    """Select the sleep policy for this process, e.g. 'report' or 'fail:20'"""
+    global _policy
+    _policy = SleepPolicy.parse(spec)
+    time.sleep = _accounted_sleep if _policy.enabled else _original_sleep
+    print(f"Sleep policy: {_policy}")
+    return _policy
+
+_policy = SleepPolicy.from_env()
+if _policy.enabled:
+    time.sleep = _accounted_sleep
+
+def apply_sleep_budget(result):
+    """The result of the suite that just ran on this thread, FAILED if it broke its sleep budget"""
+    message, _violations.message = getattr(_violations, "message", None), None
+    if message is None:
+        return result
+    print(f"Sleep budget exceeded: {message}")
+    return "FAILED"
+
+# ===== Reporting =====
+def print_sleep_report(top: int = 5):
+    """Print each suite's sleep time against its budget and the lines that slept the longest"""
+    if not _policy.enabled or not LEDGER:
+        return
+    print(f"\n=== SLEEP ACCOUNTING (policy {_policy}) ===")
+    with _lock:
+        items = list(LEDGER.items())
+        totals = dict(_suite_seconds)
+    for suite, seconds in sorted(totals.items(), key=lambda item: item[1], reverse=True):
+        if suite == OUTSIDE_SUITES:
+            print(f"  {suite}: {seconds:.1f}s")
+        else:
+            budget = _policy.budget_for(suite)
+            print(f"  {suite}: {seconds:.1f}s of {budget:g}s budget{' (OVER BUDGET)' if seconds > budget else ''}")
+        sites = sorted(((key, site) for key, site in items if key[0] == suite),
+                       key=lambda item: item[1].seconds, reverse=True)
+        for (_, step, filename, function, line), site in sites[:top]:
+            print(f"    {site.seconds:>6.1f}s {site.count:>4}x  {filename}:{line} {function}()  [{step}]")
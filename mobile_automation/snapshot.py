@@ -0,0 +1,264 @@
+"""
+Page-source snapshots for the ZoomCat suites
+A UiSnapshot fetches driver.page_source once, parses it with lxml and answers
+XPath queries and attribute reads (enabled, displayed, location, size)
+locally. Only the final element handle lookup and the click or send_keys go
+to Appium. Accessibility-id, id, class name and UiSelector locators are
+resolved natively by UiAutomator2 without serialising the hierarchy, so they
+go straight to find_element instead of the snapshot.
+
+Invalidation rules:
+  * every mutating action made through the snapshot (click, send_keys,
+    clear) drops the parsed tree, so the next query refetches it;
+  * a tree older than max_age seconds is refetched on the next query,
+    since the app also changes on its own (animations, network);
+  * a wait that polls the snapshot refetches the tree on every poll after
+    the first miss.
+"""
+
+# ===== Imports =====
+import re
+import time
+from typing import Dict, List, Optional, Tuple
+
+from lxml import etree
+from selenium.common.exceptions import WebDriverException
+from selenium.webdriver.support import expected_conditions as EC
+from selenium.webdriver.support.ui import WebDriverWait
+
+from .interaction import mark_interaction
+
+# Node attributes each expected condition needs, for the conditions that can be checked locally
+LOCAL_CONDITIONS = {
+    EC.presence_of_element_located: (),
+    EC.visibility_of_element_located: ("displayed",),
+    EC.element_to_be_clickable: ("displayed", "enabled"),
+}
+
+_BOUNDS = re.compile(r"\[(-?\d+),(-?\d+)\]\[(-?\d+),(-?\d+)\]")
+_UISELECTOR_CALL = re.compile(r'\.(\w+)\((?:"((?:[^"\\]|\\.)*)"|(\d+))?\)')
+_UISELECTOR_ATTRIBUTES = {
+    "className": "class",
+    "description": "content-desc",
+    "text": "text",
+    "resourceId": "resource-id",
+}
+
+# ===== Locator Translation =====
+def xpath_literal(value: str) -> str:
+    """Quote a string for use inside an XPath expression"""
+    if '"' not in value:
+        return f'"{value}"'
+    if "'" not in value:
+        return f"'{value}'"
+    parts = value.split('"')
+    return "concat(" + ", '\"', ".join(f'"{part}"' for part in parts) + ")"
+
+def uiselector_to_xpath(selector: str) -> Optional[str]:
+    """Translate a simple `new UiSelector()...` chain, or return None if it uses unsupported calls"""
+    selector = selector.strip()
+    if not selector.startswith("new UiSelector()"):
+        return None
+    chain = selector[len("new UiSelector()"):].rstrip(";")
+    predicates = []
+    instance = None
+    position = 0
+    for call in _UISELECTOR_CALL.finditer(chain):
+        if call.start() != position:
+            return None
+        position = call.end()
+        method, text, number = call.groups()
+        if method == "instance" and number is not None:
+            instance = int(number)
+        elif method in _UISELECTOR_ATTRIBUTES and text is not None:
+            predicates.append(f"@{_UISELECTOR_ATTRIBUTES[method]}={xpath_literal(text)}")
+        else:
+            return None
+    if position != len(chain):
+        return None
+    xpath = "//*" + "".join(f"[{predicate}]" for predicate in predicates)
+    if instance is not None:
+        xpath = f"({xpath})[{instance + 1}]"
+    return xpath
+
+def to_xpath(locator: Tuple[str, str]) -> Optional[str]:
+    """The XPath equivalent of a locator over the UiAutomator2 page source, or None"""
+    by, value = locator
+    if by == "xpath":
+        return value
+    if by == "class name":
+        return f"//*[@class={xpath_literal(value)}]"
+    if by == "accessibility id":
+        return f"//*[@content-desc={xpath_literal(value)}]"
+    if by == "id":
+        return f"//*[@resource-id={xpath_literal(value)}]"
+    if by == "-android uiautomator":
+        return uiselector_to_xpath(value)
+    return None
+
+def node_attributes(node) -> Dict:
+    """Enabled/displayed/location/size of a page-source node, in WebElement's format"""
+    attributes = {
+        "enabled": node.get("enabled", "true") == "true",
+        "displayed": node.get("displayed", "true") == "true",
+        "location": None,
+        "size": None,
+    }
+    bounds = _BOUNDS.match(node.get("bounds", ""))
+    if bounds:
+        left, top, right, bottom = (int(group) for group in bounds.groups())
+        attributes["location"] = {"x": left, "y": top}
+        attributes["size"] = {"height": bottom - top, "width": right - left}
+    return attributes
+
+# ===== Snapshot =====
+class UiSnapshot:
+    """One parsed copy of the page source, shared by every query until it is invalidated"""
+
+    def __init__(self, driver, max_age: float = 2.0):
+        self.driver = driver
+        self.max_age = max_age
+        self._tree = None
+        self._fetched_at = 0.0
+        self._nodes: Dict[str, Dict] = {}
+        self.fetches = 0
+        self.local_queries = 0
+
+    # ----- Tree lifecycle -----
+    @property
+    def tree(self):
+        if self._tree is None or time.monotonic() - self._fetched_at > self.max_age:
+            self.refresh()
+        return self._tree
+
+    def refresh(self):
+        """Fetch and parse the page source"""
+        source = self.driver.page_source
+        self._tree = etree.fromstring(source.encode("utf-8"), parser=etree.XMLParser(huge_tree=True, recover=True))
+        self._fetched_at = time.monotonic()
+        self.fetches += 1
+
+    def invalidate(self):
+        """Drop the parsed tree, and the attributes read from it, so the next query refetches it"""
+        self._tree = None
+        self._nodes.clear()
+
+    # ----- Local queries -----
+    def can_answer(self, locator: Tuple[str, str], condition=EC.presence_of_element_located) -> bool:
+        """Whether the snapshot is the cheaper way to evaluate the locator: XPath only"""
+        return condition in LOCAL_CONDITIONS and locator[0] == "xpath"
+
+    def query(self, locator: Tuple[str, str]) -> List:
+        """All nodes matching the locator in the current tree"""
+        xpath = to_xpath(locator)
+        if xpath is None:
+            raise ValueError(f"Cannot evaluate {locator[0]} locators against a page-source snapshot")
+        self.local_queries += 1
+        try:
+            result = self.tree.xpath(xpath)
+        except etree.XPathError:
+            return []
+        return [node for node in result if isinstance(node, etree._Element)] if isinstance(result, list) else []
+
+    def match(self, locator: Tuple[str, str], condition=EC.presence_of_element_located):
+        """The first node matching the locator and satisfying the condition, or None"""
+        nodes = self.query(locator)
+        if not nodes:
+            return None
+        node = nodes[0]
+        attributes = node_attributes(node)
+        if all(attributes[required] for required in LOCAL_CONDITIONS[condition]):
+            return node
+        return None
+
+    # ----- Remote handles -----
+    def element_for(self, locator: Tuple[str, str], node):
+        """Fetch the WebElement handle for a node found locally"""
+        element = self.driver.find_element(*locator)
+        self._nodes[element.id] = node_attributes(node)
+        return element
+
+    def matching_element(self, locator: Tuple[str, str], condition=EC.presence_of_element_located):
+        """
+        An expectation that the locator matches in the snapshot; returns the
+        WebElement handle. A miss invalidates the tree so the next poll sees
+        a fresh hierarchy.
+        """
+
+        def _predicate(driver):
+            node = self.match(locator, condition)
+            if node is None:
+                self.invalidate()
+                return False
+            try:
+                return self.element_for(locator, node)
+            except WebDriverException:
+                self.invalidate()
+                return False
+
+        return _predicate
+
+    def wait_for_element(self, locator: Tuple[str, str], timeout: float = 10,
+                         condition=EC.presence_of_element_located, poll_frequency: float = 0.3):
+        """Wait until the locator matches (in a fresh snapshot for XPaths) and return its WebElement"""
+        wait = WebDriverWait(self.driver, timeout, poll_frequency=poll_frequency)
+        if not self.can_answer(locator, condition):
+            return wait.until(condition(locator), f"{locator[1]} not found within {timeout}s")
+        return wait.until(self.matching_element(locator, condition),
+                          f"{locator[1]} not found in page source within {timeout}s")
+
+    # ----- Attribute reads -----
+    def describe(self, element) -> Dict:
+        """Enabled/displayed/location/size of an element, read from the snapshot when it was found there"""
+        attributes = self._nodes.get(element.id)
+        if attributes is not None:
+            return attributes
+        rect = element.rect
+        return {
+            "enabled": element.is_enabled(),
+            "displayed": element.is_displayed(),
+            "location": {"x": rect["x"], "y": rect["y"]},
+            "size": {"height": rect["height"], "width": rect["width"]},
+        }
+
+    def print_attributes(self, label: str, element):
+        """Log the attributes of an element without extra round-trips"""
+        attributes = self.describe(element)
+        print(f"{label} attributes:")
+        print(f"  Enabled: {attributes['enabled']}")
+        print(f"  Displayed: {attributes['displayed']}")
+        print(f"  Location: {attributes['location']}")
+        print(f"  Size: {attributes['size']}")
+
+    # ----- Mutating actions -----
+    def mark(self, element):
+        """Mark an element for the visual-debug overlay, with bounds from the snapshot when it was found there"""
+        attributes = self._nodes.get(element.id)
+        rect = None
+        if attributes is not None and attributes["location"] is not None:
+            rect = {**attributes["location"], **attributes["size"]}
+        mark_interaction(self.driver, element, rect)
+
+    def click(self, element):
+        """Click an element and invalidate the snapshot"""
+        self.mark(element)
+        try:
+            element.click()
+        finally:
+            self.invalidate()
+
+    def send_keys(self, element, text: str):
+        """Type into an element and invalidate the snapshot"""
+        self.mark(element)
+        try:
+            element.send_keys(text)
+        finally:
+            self.invalidate()
+
+    def clear(self, element):
+        """Clear an element and invalidate the snapshot"""
+        self.mark(element)
+        try:
+            element.clear()
+        finally:
+            self.invalidate()
@@ -0,0 +1,141 @@
+"""
+Persistent strategy hit-rate cache
+Records, per logical element and app version, how often each candidate
+strategy succeeded and how long it took, so later runs can try the cheapest
+strategy first. Entries are evicted when the app version changes.
+
+History only reorders strategies of the same specificity tier: a broad
+fallback that happened to win on a slow screen is never tried ahead of a
+precise locator. A strategy that has never hit is tried last, but only until
+REPROBE_AFTER_SECONDS have passed since its last attempt, and the primary
+strategy (first in the static order) is never sent to the back at all.
+"""
+
+# ===== Imports =====
+import json
+import os
+import sys
+import time
+from pathlib import Path
+from typing import Callable, Dict, List, Optional
+
+CACHE_DIR = Path(__file__).resolve().parent.parent / ".zoomcat_cache"
+# Strategies that never hit are given another chance after this long
+REPROBE_AFTER_SECONDS = 24 * 3600
+
+# App version of each session, detected once per session id
+_APP_VERSIONS: Dict[str, str] = {}
+
+# ===== App Version Detection =====
+def detect_app_version(driver, package: Optional[str] = None) -> str:
+    """Return the app-under-test version, from ZOOMCAT_APP_VERSION or the device"""
+    if os.environ.get("ZOOMCAT_APP_VERSION"):
+        return os.environ["ZOOMCAT_APP_VERSION"]
+    session_id = getattr(driver, "session_id", None)
+    if session_id in _APP_VERSIONS:
+        return _APP_VERSIONS[session_id]
+    version = "unknown"
+    package = package or (driver.capabilities or {}).get("appPackage")
+    if package:
+        try:
+            # Needs the Appium server to run with --relaxed-security
+            output = driver.execute_script("mobile: shell", {"command": "dumpsys", "args": ["package", package]})
+            for line in str(output).splitlines():
+                if "versionName=" in line:
+                    version = line.split("versionName=", 1)[1].strip()
+                    break
+        except Exception:
+            pass
+    _APP_VERSIONS[session_id] = version
+    return version
+
+# ===== Strategy Cache =====
+class StrategyCache:
+    """On-disk per-strategy success rate and latency, keyed by logical name and app version"""
+
+    def __init__(self, path: Path):
+        self.path = Path(path)
+        self.app_version = None
+        self.entries: Dict[str, Dict[str, Dict]] = {}
+        if self.path.exists():
+            try:
+                data = json.loads(self.path.read_text())
+                self.app_version = data.get("app_version")
+                self.entries = data.get("entries", {})
+            except (OSError, ValueError):
+                print(f"Ignoring unreadable strategy cache: {self.path}")
+
+    def use_app_version(self, app_version: str):
+        """Switch to the given app version, evicting every entry recorded for another version"""
+        if app_version == self.app_version or (app_version == "unknown" and self.app_version):
+            return
+        if self.entries:
+            print(f"App version changed ({self.app_version} -> {app_version}), evicting {self.path.name}")
+        self.app_version = app_version
+        self.entries = {}
+
+    def record(self, name: str, candidate: str, hit: bool, seconds: float):
+        """Record one attempt of a candidate strategy for a logical element"""
+        stats = self.entries.setdefault(name, {}).setdefault(
+            candidate, {"attempts": 0, "hits": 0, "hit_seconds": 0.0}
+        )
+        stats["attempts"] += 1
+        stats["last_attempt"] = time.time()
+        if hit:
+            stats["hits"] += 1
+            stats["hit_seconds"] += seconds
+
+    @staticmethod
+    def expected_cost(stats: Dict) -> float:
+        """Mean latency of a hit divided by the (smoothed) hit rate"""
+        success_rate = (stats["hits"] + 1) / (stats["attempts"] + 2)
+        return (stats["hit_seconds"] / stats["hits"]) / success_rate
+
+    def rank(self, name: str, candidates: List, key=str, tier: Callable = lambda candidate: 0) -> List:
+        """
+        Reorder candidates by tier (most specific first), then within each tier
+        by expected cost: strategies that have hit before come first (cheapest
+        first), untried ones keep their static order, and strategies that have
+        recently failed without ever hitting go last.
+        """
+        history = self.entries.get(name, {})
+        now = time.time()
+
+        def sort_key(item):
+            index, candidate = item
+            stats = history.get(key(candidate))
+            if stats is None:
+                return (tier(candidate), 1, 0.0, index)
+            if stats["hits"] == 0:
+                # Re-probed like an untried strategy: the primary, or one whose misses are old
+                if index == 0 or now - stats.get("last_attempt", 0) > REPROBE_AFTER_SECONDS:
+                    return (tier(candidate), 1, 0.0, index)
+                return (tier(candidate), 2, float(stats["attempts"]), index)
+            return (tier(candidate), 0, self.expected_cost(stats), index)
+
+        return [candidate for _, candidate in sorted(enumerate(candidates), key=sort_key)]
+
+    def save(self):
+        """Write the cache atomically"""
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        # Per-process temporary name: device-farm workers save the same cache
+        tmp_path = self.path.with_suffix(f".{os.getpid()}.tmp")
+        tmp_path.write_text(json.dumps({"app_version": self.app_version, "entries": self.entries}, indent=2))
+        os.replace(tmp_path, self.path)
+
+    def format_rankings(self, tier: Callable = lambda candidate: 0) -> str:
+        """Human-readable table of the current rankings; tier takes a candidate key"""
+        lines = [f"Strategy rankings ({self.path.name}, app version {self.app_version}):"]
+        for name in sorted(self.entries):
+            lines.append(f"  {name}:")
+            history = self.entries[name]
+            for candidate in self.rank(name, list(history), tier=tier):
+                stats = history[candidate]
+                mean = f"{stats['hit_seconds'] / stats['hits']:.2f}s" if stats["hits"] else "-"
+                lines.append(f"    {stats['hits']}/{stats['attempts']} hits, mean {mean}: {candidate}")
+        return "\n".join(lines)
+
+if __name__ == "__main__":
+    """Print the rankings stored in a cache file (default: the locator cache)"""
+    cache_path = Path(sys.argv[1]) if len(sys.argv) > 1 else CACHE_DIR / "locator_cache.json"
+    print(StrategyCache(cache_path).format_rankings())
@@ -0,0 +1,167 @@
+"""
+Text entry engine for the ZoomCat suites
+Filling a field used to mean a cascade of click, double-click, long-press,
+keycode and CTRL+A deletions followed by several typing attempts, with a
+sleep after each. That is about 15 commands and 6 seconds per field.
+
+fill_field() sets the value with a single atomic command where the driver
+supports it (UiAutomator2's mobile: replaceElementValue, which calls
+setText on the view and so replaces any existing content). It then reads
+the text attribute back and only falls back to the next strategy when
+that check fails:
+
+  replace_value    mobile: replaceElementValue (one command)
+  set_value        the element's setValue (send_keys), which UiAutomator2 also
+                   applies with setText
+  clear_and_type   clear(), then send_keys
+  keyboard         tap the field and type through the W3C key actions
+
+Several ZoomCat field locators select the layout that wraps the input, not
+the input itself. Values are set on, and read back from, the EditText: the
+located element when it is editable, otherwise its first EditText
+descendant. Password fields expose their text masked, so they are verified
+by length.
+Every attempt is recorded in a persistent StrategyCache keyed by the field's
+locator and the app version (.zoomcat_cache/text_entry_cache.json). Later
+fills, in this run and the next ones, start from the last known-good strategy
+and try strategies that keep failing last.
+"""
+
+# ===== Imports =====
+import atexit
+import threading
+import time
+from typing import Callable, Dict, List, Optional, Tuple
+
+from appium.webdriver.common.appiumby import AppiumBy
+from selenium.webdriver.common.action_chains import ActionChains
+
+from .interaction import mark_interaction
+from .strategy_cache import CACHE_DIR, StrategyCache, detect_app_version
+
+# Widget classes that hold editable text
+EDITABLE_CLASSES = ("android.widget.EditText", "android.widget.AutoCompleteTextView",
+                    "android.widget.MultiAutoCompleteTextView")
+
+class TextEntryError(Exception):
+    """No strategy could put the value into the field"""
+
+# ===== Strategies =====
+def _replace_value(driver, element, value: str):
+    driver.execute_script("mobile: replaceElementValue", {"elementId": element.id, "text": value})
+
+def _set_value(driver, element, value: str):
+    element.send_keys(value)
+
+def _clear_and_type(driver, element, value: str):
+    element.clear()
+    element.send_keys(value)
+
+def _keyboard(driver, element, value: str):
+    ActionChains(driver).move_to_element(element).click().send_keys(value).perform()
+
+STRATEGIES: List[Tuple[str, Callable]] = [
+    ("replace_value", _replace_value),
+    ("set_value", _set_value),
+    ("clear_and_type", _clear_and_type),
+    ("keyboard", _keyboard),
+]
+
+# ===== Strategy Memo =====
+_cache: Optional[StrategyCache] = None
+_cache_lock = threading.Lock()
+# Whether each field is masked, detected once per (session id, field key)
+_secret_fields: Dict[Tuple[str, str], bool] = {}
+# Whether each field's locator selects the input itself, detected once per (session id, field key)
+_editable_fields: Dict[Tuple[str, str], bool] = {}
+
+def text_entry_cache(driver) -> StrategyCache:
+    """The process-wide text entry memo, switched to the app version of the driver's session"""
+    global _cache
+    with _cache_lock:
+        if _cache is None:
+            _cache = StrategyCache(CACHE_DIR / "text_entry_cache.json")
+            atexit.register(save_text_entry_cache)
+        _cache.use_app_version(detect_app_version(driver))
+        return _cache
+
+def save_text_entry_cache():
+    if _cache is not None:
+        with _cache_lock:
+            _cache.save()
+
+def print_text_entry_rankings():
+    """Print the current per-field text entry strategy rankings"""
+    if _cache is not None and _cache.entries:
+        print("\n=== TEXT ENTRY STRATEGY RANKINGS ===")
+        print(_cache.format_rankings())
+
+def is_editable(element) -> bool:
+    try:
+        return element.tag_name in EDITABLE_CLASSES
+    except Exception:
+        return False
+
+def text_input(driver, element):
+    """The first EditText inside a container element, or the element itself when it has none"""
+    for class_name in EDITABLE_CLASSES:
+        inputs = element.find_elements(AppiumBy.CLASS_NAME, class_name)
+        if inputs:
+            return inputs[0]
+    return element
+
+def is_secret_field(element) -> bool:
+    try:
+        return str(element.get_attribute("password")).lower() == "true"
+    except Exception:
+        return False
+
+def read_back_matches(element, value: str, secret: bool) -> bool:
+    """Whether the field now holds value; masked fields can only be checked by length"""
+    text = element.get_attribute("text") or ""
+    return len(text) == len(value) if secret else text == value
+
+# ===== Fill =====
+def fill_field(driver, element, value: str, name: str = "field", secret: Optional[bool] = None,
+               locator: Optional[str] = None) -> str:
+    """
+    Replace the field's content with value and verify it; returns the name of
+    the strategy that worked. Strategies are tried in the order learned for
+    the field's locator (or its name). A located container is filled through
+    the EditText inside it. Pass secret for password fields to save the
+    one-time attribute lookup.
+    """
+    field = locator or name
+    key = (driver.session_id, field)
+    if key not in _editable_fields:
+        _editable_fields[key] = is_editable(element)
+    if not _editable_fields[key]:
+        element = text_input(driver, element)
+    if secret is None:
+        if key not in _secret_fields:
+            _secret_fields[key] = is_secret_field(element)
+        secret = _secret_fields[key]
+    mark_interaction(driver, element)
+    cache = text_entry_cache(driver)
+    strategies = cache.rank(field, STRATEGIES, key=lambda strategy: strategy[0])
+
+    errors = []
+    for position, (strategy, apply) in enumerate(strategies):
+        start = time.perf_counter()
+        try:
+            apply(driver, element, value)
+            verified = read_back_matches(element, value, secret)
+        except Exception as e:
+            verified = False
+            errors.append(f"{strategy}: {e}".splitlines()[0])
+        else:
+            if not verified:
+                errors.append(f"{strategy}: value did not read back")
+        elapsed = time.perf_counter() - start
+        with _cache_lock:
+            cache.record(field, strategy, verified, elapsed)
+        if verified:
+            print(f"Filled {name} with {strategy} (strategy {position + 1}/{len(strategies)}, "
+                  f"{elapsed:.2f}s, verified)")
+            return strategy
+    raise TextEntryError(f"Could not fill {name}: " + "; ".join(errors))
@@ -0,0 +1,211 @@
+"""
+Per-step timing instrumentation for the ZoomCat suites
+A StepTrace hooks the driver's command execution and attributes every Appium
+command to the step that issued it. For each step it records the start and
+end time, the number of commands, and the time spent on actions (clicks,
+typing, key presses, app control) versus waiting (element lookups, polling
+and sleeps between commands).
+
+When the suite stops the trace, the steps and their commands are written to
+trace.json in the suite's report directory. The file uses the Chrome trace
+event format, so it can be opened in chrome://tracing or ui.perfetto.dev.
+"""
+
+# ===== Imports =====
+import json
+import os
+import threading
+import time
+from contextlib import contextmanager
+from typing import Dict, List, Optional
+
+# Commands that change the UI; everything else a step spends its time on counts as waiting
+ACTION_COMMANDS = {
+    "clickElement", "sendKeysToElement", "clearElement", "hideKeyboard", "pressKeyCode", "longPressKeyCode",
+    "w3cActions", "touchAction", "multiTouchAction", "back", "activateApp", "terminateApp", "executeScript",
+    "setValue", "replaceValue"
+}
+LOOKUP_COMMANDS = {"findElement", "findElements", "findChildElement", "findChildElements", "getPageSource"}
+CAPTURE_COMMANDS = {"screenshot", "elementScreenshot", "startRecordingScreen", "stopRecordingScreen"}
+
+TRACE_FILE = "trace.json"
+
+# Trace in progress for each session id
+_active: Dict[str, "StepTrace"] = {}
+
+def command_category(command: str) -> str:
+    if command in ACTION_COMMANDS:
+        return "action"
+    if command in LOOKUP_COMMANDS:
+        return "lookup"
+    if command in CAPTURE_COMMANDS:
+        return "capture"
+    return "query"
+
+def active_trace(driver) -> Optional["StepTrace"]:
+    """The trace in progress on the driver's session, if any"""
+    return _active.get(getattr(driver, "session_id", None))
+
+def current_trace() -> Optional["StepTrace"]:
+    """The trace in progress on the calling thread, if any"""
+    thread = threading.get_ident()
+    return next((trace for trace in list(_active.values()) if trace._tid == thread), None)
+
+# ===== Step Records =====
+class StepRecord:
+    """Timing of one step and the commands issued during it"""
+
+    def __init__(self, name: str, start: float):
+        self.name = name
+        self.start = start
+        self.end: Optional[float] = None
+        self.commands = 0
+        self.seconds_by_category: Dict[str, float] = {}
+
+    @property
+    def duration(self) -> float:
+        return (self.end or time.perf_counter()) - self.start
+
+    @property
+    def action_seconds(self) -> float:
+        return self.seconds_by_category.get("action", 0.0)
+
+    @property
+    def wait_seconds(self) -> float:
+        """Everything that is not an action: lookups, polling gaps and sleeps"""
+        return max(self.duration - self.action_seconds - self.seconds_by_category.get("capture", 0.0), 0.0)
+
+    def as_dict(self) -> Dict:
+        return {
+            "step": self.name,
+            "seconds": round(self.duration, 3),
+            "commands": self.commands,
+            "action_seconds": round(self.action_seconds, 3),
+            "wait_seconds": round(self.wait_seconds, 3),
+            "lookup_seconds": round(self.seconds_by_category.get("lookup", 0.0), 3),
+            "capture_seconds": round(self.seconds_by_category.get("capture", 0.0), 3),
+        }
+
+# ===== Trace =====
+class StepTrace:
+    """One suite's step timings, collected by wrapping driver.execute"""
+
+    def __init__(self, driver, report_dir: str, suite_name: str = ""):
+        self.driver = driver
+        self.report_dir = report_dir
+        self.suite_name = suite_name or os.path.basename(report_dir)
+        self.steps: List[StepRecord] = []
+        self.events: List[Dict] = []
+        self.current: Optional[StepRecord] = None
+        self._pid = os.getpid()
+        self._tid = threading.get_ident()
+        self._original_execute = None
+        self._shadowed = False
+
+    def start(self):
+        """Start attributing the driver's commands to this trace's steps"""
+        self._original_execute = self.driver.execute
+        self._shadowed = "execute" in vars(self.driver)
+        self.driver.execute = self._execute
+        _active[self.driver.session_id] = self
+
+    def _execute(self, command, params=None):
+        start = time.perf_counter()
+        try:
+            return self._original_execute(command, params)
+        finally:
+            end = time.perf_counter()
+            category = command_category(command)
+            self._event(command, category, start, end)
+            if self.current is not None:
+                self.current.commands += 1
+                self.current.seconds_by_category[category] = \
+                    self.current.seconds_by_category.get(category, 0.0) + end - start
+
+    def _event(self, name: str, category: str, start: float, end: float, args: Optional[Dict] = None):
+        event = {"name": name, "cat": category, "ph": "X", "ts": start * 1e6, "dur": (end - start) * 1e6,
+                 "pid": self._pid, "tid": self._tid}
+        if args:
+            event["args"] = args
+        self.events.append(event)
+
+    # ----- Steps -----
+    def begin_step(self, name: str):
+        """End the current step (if any) and start a new one"""
+        self.end_step()
+        self.current = StepRecord(name, time.perf_counter())
+
+    def end_step(self):
+        step, self.current = self.current, None
+        if step is None:
+            return
+        step.end = time.perf_counter()
+        self.steps.append(step)
+        self._event(step.name, "step", step.start, step.end, step.as_dict())
+
+    @contextmanager
+    def step(self, name: str):
+        """Context manager timing the enclosed block as one step"""
+        self.begin_step(name)
+        try:
+            yield self.current
+        finally:
+            self.end_step()
+
+    # ----- Output -----
+    def stop(self) -> str:
+        """Stop tracing, write trace.json and print the step summary; returns the trace path"""
+        self.end_step()
+        _active.pop(getattr(self.driver, "session_id", None), None)
+        if self._original_execute is not None:
+            if self._shadowed:
+                self.driver.execute = self._original_execute
+            else:
+                del self.driver.execute
+            self._original_execute = None
+        path = os.path.join(self.report_dir, TRACE_FILE)
+        metadata = [
+            {"name": "process_name", "ph": "M", "pid": self._pid, "args": {"name": "ZoomCat"}},
+            {"name": "thread_name", "ph": "M", "pid": self._pid, "tid": self._tid,
+             "args": {"name": self.suite_name}},
+        ]
+        with open(path, "w") as trace_file:
+            json.dump({"traceEvents": metadata + self.events, "displayTimeUnit": "ms",
+                       "otherData": {"suite": self.suite_name}}, trace_file)
+        self.print_report()
+        print(f"Step trace saved: {path}")
+        return path
+
+    def print_report(self):
+        """Print each step's duration, command count and action/wait split"""
+        print(f"\n=== STEP TIMINGS: {self.suite_name} ===")
+        for step in self.steps:
+            print(f"  {step.name}: {step.duration:.1f}s, {step.commands} commands "
+                  f"(actions {step.action_seconds:.1f}s, waiting {step.wait_seconds:.1f}s)")
+        if self.steps:
+            slowest = max(self.steps, key=lambda step: step.duration)
+            print(f"  Slowest step: {slowest.name} ({slowest.duration:.1f}s)")
+
+def start_trace(driver, report_dir: str, suite_name: str = "") -> Optional[StepTrace]:
+    """Start tracing the suite's steps; returns None without a driver"""
+    if driver is None:
+        return None
+    trace = StepTrace(driver, report_dir, suite_name)
+    trace.start()
+    return trace
+
+def begin_step(driver, name: str):
+    """Start a new step on the driver's trace, ending the previous one; no-op when not tracing"""
+    trace = active_trace(driver)
+    if trace is not None:
+        trace.begin_step(name)
+
+@contextmanager
+def step(driver, name: str):
+    """Time the enclosed block as one step of the driver's trace; no-op when not tracing"""
+    trace = active_trace(driver)
+    if trace is None:
+        yield None
+        return
+    with trace.step(name) as record:
+        yield record
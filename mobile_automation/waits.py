@@ -0,0 +1,143 @@
+"""
+Event-driven wait helpers for the ZoomCat suites
+Instead of sleeping for a fixed time, these helpers poll cheap signals (the
+foreground package, a landmark element, page-source stability, the screen's
+perceptual hash) and return as soon as the app is actually interactive or
+the UI has settled after an action.
+"""
+
+# ===== Imports =====
+import hashlib
+import re
+import time
+from typing import Dict, List, Optional, Tuple
+
+from selenium.common.exceptions import TimeoutException
+from selenium.webdriver.support.ui import WebDriverWait
+
+from .screen_hash import Signature, same_screen, screen_signature
+
+# Time-to-ready of every app launch seen in this process
+READY_TIMINGS: List[Dict] = []
+
+# Hierarchy content that changes on its own without the UI moving (the connection timer)
+VOLATILE_PATTERNS = [re.compile(r"\d{2}:\d{2}:\d{2}")]
+
+# ===== Driver Helpers =====
+def page_source_digest(driver) -> str:
+    """Short digest of the current UI hierarchy, used to detect when it stops changing"""
+    source = driver.page_source
+    for pattern in VOLATILE_PATTERNS:
+        source = pattern.sub("", source)
+    return hashlib.md5(source.encode("utf-8")).hexdigest()
+
+# ===== Expected Conditions =====
+def app_is_ready(package: Optional[str], landmark: Optional[Tuple[str, str]] = None):
+    """
+    An expectation that the app is in the foreground and interactive.
+    With a landmark locator the app is ready once the landmark is present;
+    without one it is ready once the page source is unchanged between two polls.
+    """
+    last_digest = None
+
+    def _predicate(driver):
+        nonlocal last_digest
+        if package and driver.current_package != package:
+            last_digest = None
+            return False
+        if landmark:
+            return bool(driver.find_elements(*landmark))
+        digest = page_source_digest(driver)
+        stable = digest == last_digest
+        last_digest = digest
+        return stable
+
+    return _predicate
+
+def ui_settled(target: Optional[Tuple[str, str]] = None, quiet_polls: int = 2):
+    """
+    An expectation that the UI has settled after an action: either the next
+    step's target element is present, or the hierarchy has been unchanged for
+    quiet_polls consecutive polls.
+    """
+    last_digest = None
+    quiet = 0
+
+    def _predicate(driver):
+        nonlocal last_digest, quiet
+        if target and driver.find_elements(*target):
+            return True
+        digest = page_source_digest(driver)
+        quiet = quiet + 1 if digest == last_digest else 0
+        last_digest = digest
+        return quiet >= quiet_polls
+
+    return _predicate
+
+def screen_stable(changed_from: Optional[Signature] = None, quiet_polls: int = 1):
+    """
+    An expectation that the screen has stopped changing: the frame looks the
+    same as in the previous poll for quiet_polls polls in a row. With
+    changed_from, the screen must first look different from that signature.
+    """
+    last_signature = None
+    quiet = 0
+    changed = changed_from is None
+
+    def _predicate(driver):
+        nonlocal last_signature, quiet, changed
+        signature = screen_signature(driver)
+        changed = changed or not same_screen(signature, changed_from)
+        quiet = quiet + 1 if changed and same_screen(signature, last_signature) else 0
+        last_signature = signature
+        return quiet >= quiet_polls
+
+    return _predicate
+
+# ===== Wait Functions =====
+def wait_for_app_ready(driver, wait: WebDriverWait, package: Optional[str],
+                       landmark: Optional[Tuple[str, str]] = None, launch: str = "") -> float:
+    """Wait until the app is interactive, record and return the measured time-to-ready"""
+    start = time.perf_counter()
+    wait.until(app_is_ready(package, landmark))
+    elapsed = time.perf_counter() - start
+    READY_TIMINGS.append({"launch": launch or package or "app", "seconds": elapsed})
+    print(f"App ready after {elapsed:.2f}s")
+    return elapsed
+
+def wait_until_settled(driver, timeout: float, target: Optional[Tuple[str, str]] = None,
+                       poll_frequency: float = 0.3) -> float:
+    """
+    Wait until the UI settles or the target appears, for at most timeout seconds.
+    The timeout is the step's budget: running out of it is not an error, the
+    step simply continues as it did after the old fixed sleep.
+    """
+    start = time.perf_counter()
+    try:
+        WebDriverWait(driver, timeout, poll_frequency=poll_frequency).until(ui_settled(target))
+    except TimeoutException:
+        print(f"UI still changing after {timeout}s budget, continuing")
+    return time.perf_counter() - start
+
+def wait_until_screen_stable(driver, timeout: float, changed_from: Optional[Signature] = None,
+                             poll_frequency: float = 0.3) -> float:
+    """
+    Wait until the screen looks the same in consecutive screenshots (after
+    changing from changed_from, if given), for at most timeout seconds. Catches
+    transitions and animations that do not show in the hierarchy. Like
+    wait_until_settled, running out of the budget is not an error.
+    """
+    start = time.perf_counter()
+    try:
+        WebDriverWait(driver, timeout, poll_frequency=poll_frequency).until(screen_stable(changed_from))
+    except TimeoutException:
+        print(f"Screen still changing after {timeout}s budget, continuing")
+    return time.perf_counter() - start
+
+def print_ready_timings():
+    """Print the time-to-ready of every launch recorded in this process"""
+    if not READY_TIMINGS:
+        return
+    print("\n=== APP READINESS ===")
+    for timing in READY_TIMINGS:
+        print(f"  {timing['launch']}: {timing['seconds']:.2f}s")
@@ -1,12 +1,28 @@
+import argparse
 import sys
-import traceback
 import importlib.util
-import time
+from pathlib import Path
+
+# Shared helpers live in mobile_automation/ at the repository root
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+from mobile_automation.connection import close_shared_pools
+from mobile_automation.device_farm import DeviceFarmScheduler
+from mobile_automation.devices import load_inventory
+from mobile_automation.interaction import set_visual_debug
+from mobile_automation.locators import print_locator_rankings
+from mobile_automation.profiler import print_command_profile
+from mobile_automation.recording import set_recording_enabled
+from mobile_automation.scheduler import Suite, SuiteScheduler, suite_status
+from mobile_automation.screenshots import flush_screenshots, print_screenshot_report, set_capture_policy, set_output_format
+from mobile_automation.session_pool import SessionPool
+from mobile_automation.sleeps import print_sleep_report, set_sleep_policy
+from mobile_automation.text_entry import print_text_entry_rankings
+from mobile_automation.waits import print_ready_timings
 
 # Dynamically import the login test module (filename has spaces)
 def import_login_module():
     module_name = "login_via_verification_code"
-    file_path = "tests/Login via Verification Code.py"
+    file_path = str(Path(__file__).resolve().parent / "Login via Verification Code.py")
     spec = importlib.util.spec_from_file_location(module_name, file_path)
     module = importlib.util.module_from_spec(spec)
     spec.loader.exec_module(module)
@@ -20,124 +36,151 @@ from Connection_Flow_Test import run_zoomcat_connection_flow_tests
 from Complaint_Submission_Test import ComplaintSubmissionTest
 from Login_by_Password import run_zoomcat_password_login_tests
 
-def main():
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Run every ZoomCat test suite")
+    parser.add_argument(
+        "--screenshots", default=None, metavar="POLICY",
+        help="screenshot policy: always, on_error, every:N or ring:K "
+             "(default: $ZOOMCAT_SCREENSHOTS or always)"
+    )
+    parser.add_argument(
+        "--screenshot-format", default=None, metavar="FORMAT",
+        help="how step screenshots are written: png, jpeg or webp, with optional quality and downscale factor, "
+             "e.g. webp:80:0.5; error frames stay full-size PNG (default: $ZOOMCAT_SCREENSHOT_FORMAT or png)"
+    )
+    parser.add_argument(
+        "--record", action="store_true",
+        help="record the screen of the long flows and extract step keyframes instead of taking screenshots"
+    )
+    parser.add_argument(
+        "--visual-debug", action="store_true",
+        help="draw the elements the suites interact with onto their step screenshots (needs Pillow)"
+    )
+    parser.add_argument(
+        "--sleeps", default=None, metavar="POLICY",
+        help="sleep accounting: report, warn[:SECONDS] or fail[:SECONDS] against each suite's sleep budget "
+             "(default: $ZOOMCAT_SLEEPS or off)"
+    )
+    parser.add_argument(
+        "--pipeline", action="store_true",
+        help="create the session of an idle device in the background while suites run on the others "
+             "(device farm only)"
+    )
+    parser.add_argument(
+        "--devices", default=None, metavar="UDID[@SERVER][,...]",
+        help="devices to shard the suites over, one worker process each "
+             "(default: $ZOOMCAT_DEVICES or the configured device)"
+    )
+    parser.add_argument(
+        "--devices-file", default=None, metavar="PATH",
+        help="JSON device inventory: [{\"udid\": ..., \"server\": ..., \"systemPort\": ...}, ...]"
+    )
+    return parser.parse_args(argv)
+
+# ===== Suite Graph =====
+# requires: skipped unless these suites passed; after: only ordered behind them;
+# state: the app state the suite needs on its device; leaves: the state it leaves the device in
+def run_login(driver):
+    return import_login_module().run_zoomcat_login_tests(driver)
+
+def run_purchase_successful_flow(driver):
+    return 'PASSED' if PurchaseSuccessfulFlowTest(driver).run_test() else 'FAILED'
+
+def run_complaint_submission(driver):
+    return 'PASSED' if ComplaintSubmissionTest(driver).run_test() else 'FAILED'
+
+SUITES = [
+    Suite('login', run_login, "Login Test", state='logged_out', leaves='logged_in'),
+    Suite('purchase_successful_flow', run_purchase_successful_flow, "Purchase Successful Flow Test",
+          requires=['login'], state='logged_in'),
+    Suite('purchase_history', run_zoomcat_purchase_history_tests, "Purchase History Test",
+          requires=['purchase_successful_flow'], state='logged_in'),
+    Suite('connection_flow', run_zoomcat_connection_flow_tests, "Connection Flow Test",
+          requires=['purchase_successful_flow'], state='logged_in'),
+    Suite('complaint_submission', run_complaint_submission, "Complaint Submission Test",
+          requires=['login'], state='logged_in'),
+    Suite('logout', run_zoomcat_logout_tests, "Logout Test",
+          requires=['login'], after=['purchase_history', 'connection_flow', 'complaint_submission'],
+          state='logged_in', leaves='logged_out'),
+    # Logs in again and out, so it runs once everything else is done
+    Suite('login_by_password', run_zoomcat_password_login_tests, "Login by Password Test",
+          after=['logout'], state='logged_out', leaves='logged_out'),
+]
+
+# How a device that is in another state is brought into the one a suite needs
+SETUPS = {
+    'logged_in': run_login,
+    'logged_out': run_zoomcat_logout_tests,
+}
+# Devices start signed out, as the login suite expects
+INITIAL_STATE = 'logged_out'
+
+def main(argv=None):
+    args = parse_args(argv)
     print("\n=== ZOOMCAT APP AUTOMATION: MAIN TEST RUNNER ===\n")
-    overall_results = {}
-    
-    # 1. Run Login Test
-    try:
-        print("\n[1/6] Running Login Test...")
-        login_module = import_login_module()
-        login_results = login_module.run_zoomcat_login_tests()
-        overall_results['login'] = login_results
-        login_passed = all(v == 'PASSED' for v in login_results.values())
-    except Exception as e:
-        print("Login test failed with error:", e)
-        traceback.print_exc()
-        overall_results['login'] = 'FAILED'
-        login_passed = False
-    
-    # 2. Run Purchase Successful Flow Test (only if login passed)
-    if login_passed:
-        try:
-            print("\n[2/6] Running Purchase Successful Flow Test...")
-            print("Adding 5-second delay to allow app state to stabilize after login...")
-            time.sleep(5)
-            purchase_flow_test = PurchaseSuccessfulFlowTest()
-            purchase_flow_result = purchase_flow_test.run_test()
-            overall_results['purchase_successful_flow'] = 'PASSED' if purchase_flow_result else 'FAILED'
-        except Exception as e:
-            print("Purchase Successful Flow test failed with error:", e)
-            traceback.print_exc()
-            overall_results['purchase_successful_flow'] = 'FAILED'
-    else:
-        print("\nSkipping Purchase Successful Flow Test because Login did not pass.")
-        overall_results['purchase_successful_flow'] = 'SKIPPED'
+    if args.screenshots:
+        set_capture_policy(args.screenshots)
+    if args.screenshot_format:
+        set_output_format(args.screenshot_format)
+    if args.record:
+        set_recording_enabled(True)
+    if args.visual_debug:
+        set_visual_debug(True)
+    if args.sleeps:
+        set_sleep_policy(args.sleeps)
     
-    # 3. Run Purchase History Test (only if previous tests passed)
-    if login_passed and overall_results.get('purchase_successful_flow') == 'PASSED':
-        try:
-            print("\n[3/6] Running Purchase History Test...")
-            purchase_history_results = run_zoomcat_purchase_history_tests()
-            overall_results['purchase_history'] = purchase_history_results
-        except Exception as e:
-            print("Purchase History test failed with error:", e)
-            traceback.print_exc()
-            overall_results['purchase_history'] = 'FAILED'
-    else:
-        print("\nSkipping Purchase History Test because previous tests did not pass.")
-        overall_results['purchase_history'] = 'SKIPPED'
-    
-    # 4. Run Connection Flow Test (only if previous tests passed)
-    if login_passed and overall_results.get('purchase_successful_flow') == 'PASSED' and (isinstance(overall_results.get('purchase_history'), dict) and all(v == 'PASSED' for v in overall_results.get('purchase_history', {}).values())):
-        try:
-            print("\n[4/6] Running Connection Flow Test...")
-            connection_flow_result = run_zoomcat_connection_flow_tests()
-            overall_results['connection_flow'] = 'PASSED' if connection_flow_result else 'FAILED'
-        except Exception as e:
-            print("Connection Flow test failed with error:", e)
-            traceback.print_exc()
-            overall_results['connection_flow'] = 'FAILED'
+    inventory = load_inventory(args.devices_file, args.devices)
+    if len(inventory) > 1:
+        # One worker process per device; each prints its own pool and screenshot reports
+        pool = None
+        scheduler = DeviceFarmScheduler(SUITES, inventory, __file__,
+                                        {"screenshots": args.screenshots, "screenshot_format": args.screenshot_format,
+                                         "record": args.record, "sleeps": args.sleeps,
+                                         "visual_debug": args.visual_debug},
+                                        pipeline=args.pipeline, setups=SETUPS, initial_state=INITIAL_STATE)
+        overall_results = scheduler.run()
     else:
-        print("\nSkipping Connection Flow Test because previous tests did not pass.")
-        overall_results['connection_flow'] = 'SKIPPED'
-    
-    # 5. Run Complaint Submission Test (only if previous tests passed)
-    if login_passed and overall_results.get('purchase_successful_flow') == 'PASSED' and (isinstance(overall_results.get('purchase_history'), dict) and all(v == 'PASSED' for v in overall_results.get('purchase_history', {}).values())) and overall_results.get('connection_flow') == 'PASSED':
+        # One long-lived Appium session per device is shared by every suite
+        if args.pipeline:
+            print("--pipeline has no effect with a single device: its one session is reused by every suite")
+        pool = SessionPool(inventory[0].server, inventory[0].capabilities())
+        scheduler = SuiteScheduler(SUITES, pool, setups=SETUPS, initial_state=INITIAL_STATE)
         try:
-            print("\n[5/6] Running Complaint Submission Test...")
-            complaint_submission_test = ComplaintSubmissionTest()
-            complaint_submission_result = complaint_submission_test.run_test()
-            overall_results['complaint_submission'] = 'PASSED' if complaint_submission_result else 'FAILED'
-        except Exception as e:
-            print("Complaint Submission test failed with error:", e)
-            traceback.print_exc()
-            overall_results['complaint_submission'] = 'FAILED'
-    else:
-        print("\nSkipping Complaint Submission Test because previous tests did not pass.")
-        overall_results['complaint_submission'] = 'SKIPPED'
-    
-    # 6. Run Logout Test (only if all previous tests passed)
-    if login_passed and overall_results.get('purchase_successful_flow') == 'PASSED' and (isinstance(overall_results.get('purchase_history'), dict) and all(v == 'PASSED' for v in overall_results.get('purchase_history', {}).values())) and overall_results.get('connection_flow') == 'PASSED' and overall_results.get('complaint_submission') == 'PASSED':
-        try:
-            print("\n[6/6] Running Logout Test...")
-            logout_results = run_zoomcat_logout_tests()
-            overall_results['logout'] = logout_results
-        except Exception as e:
-            print("Logout test failed with error:", e)
-            traceback.print_exc()
-            overall_results['logout'] = 'FAILED'
-    else:
-        print("\nSkipping Logout Test because previous tests did not pass.")
-        overall_results['logout'] = 'SKIPPED'
-
-    # 7. Run Login by Password Test (always runs last)
-    try:
-        print("\n[7/7] Running Login by Password Test...")
-        login_by_password_results = run_zoomcat_password_login_tests()
-        overall_results['login_by_password'] = login_by_password_results
-    except Exception as e:
-        print("Login by Password test failed with error:", e)
-        traceback.print_exc()
-        overall_results['login_by_password'] = 'FAILED'
+            overall_results = scheduler.run()
+        finally:
+            # Write out queued screenshots before the sessions go away
+            flush_screenshots()
+            pool.close()
+            close_shared_pools()
 
     # Final summary
     print("\n=== FINAL SUMMARY ===")
+    statuses = {test: suite_status(result) for test, result in overall_results.items()}
     for test, result in overall_results.items():
-        status_icon = "✓" if (isinstance(result, dict) and all(v == 'PASSED' for v in result.values())) or result == 'PASSED' else "✗" if result == 'FAILED' else "⚠"
+        status_icon = "✓" if statuses[test] == 'PASSED' else "✗" if statuses[test] == 'FAILED' else "⚠"
         print(f"{status_icon} {test.replace('_', ' ').title()}: {result}")
     
     # Count results
-    passed_count = sum(1 for result in overall_results.values() 
-                      if (isinstance(result, dict) and all(v == 'PASSED' for v in result.values())) or result == 'PASSED')
-    failed_count = sum(1 for result in overall_results.values() if result == 'FAILED')
-    skipped_count = sum(1 for result in overall_results.values() if result == 'SKIPPED')
+    passed_count = sum(1 for status in statuses.values() if status == 'PASSED')
+    failed_count = sum(1 for status in statuses.values() if status == 'FAILED')
+    skipped_count = sum(1 for status in statuses.values() if status == 'SKIPPED')
     
     print(f"\nOverall Results:")
     print(f"  Passed: {passed_count}")
     print(f"  Failed: {failed_count}")
     print(f"  Skipped: {skipped_count}")
     print(f"  Total: {len(overall_results)}")
+    if pool:
+        print_command_profile()
+
+    scheduler.print_report()
+    if pool:
+        pool.print_report()
+        print_screenshot_report()
+        print_ready_timings()
+        print_locator_rankings()
+        print_text_entry_rankings()
+        print_sleep_report()
     
     # Exit code: 0 if all passed, 1 otherwise
     if failed_count == 0:
@@ -1,14 +1,24 @@
 import os
 import sys
-import time
 import random
 import string
 from datetime import datetime
+from pathlib import Path
 from appium import webdriver
 from selenium.webdriver.common.by import By
 from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
-from selenium.common.exceptions import TimeoutException, NoSuchElementException
+from selenium.common.exceptions import TimeoutException
+
+# Shared helpers live in mobile_automation/ at the repository root
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+from mobile_automation.connection import open_connection
+from mobile_automation.interaction import click, mark_interaction
+from mobile_automation.locator_compiler import compile_locator
+from mobile_automation.profiler import profile_driver
+from mobile_automation.screenshots import capture_screenshot, flush_screenshots
+from mobile_automation.tracing import begin_step, start_trace
+from mobile_automation.waits import wait_for_app_ready, wait_until_settled
 
 # Appium Configuration
 APPIUM_SERVER = "http://localhost:4723"
@@ -36,16 +46,21 @@ class Locators:
     PROFILE_ICON_CONNECT_PAGE = "//android.widget.ScrollView/android.widget.FrameLayout/android.widget.FrameLayout[1]/android.widget.FrameLayout/android.widget.FrameLayout/android.widget.ImageView"
 
 class ComplaintSubmissionTest:
-    def __init__(self):
-        self.driver = None
+    def __init__(self, driver=None):
+        # A driver passed in (e.g. from the runner's session pool) is borrowed, not owned
+        self.driver = driver
+        self.owns_driver = driver is None
         self.report_dir = None
         self.test_name = "Complaint Submission"
         
     def setup_driver(self):
         """Initialize the mobile driver"""
+        if not self.owns_driver:
+            print("=== Using shared mobile driver session ===")
+            return True
         print("=== Starting mobile driver initialization ===")
         try:
-            self.driver = webdriver.Remote(APPIUM_SERVER, CAPABILITIES)
+            self.driver = profile_driver(webdriver.Remote(open_connection(APPIUM_SERVER), CAPABILITIES))
             print("Mobile driver initialized successfully")
             return True
         except Exception as e:
@@ -58,9 +73,10 @@ class ComplaintSubmissionTest:
             timestamp = datetime.now().strftime("%H%M%S")
             filename = f"{step_name}_{timestamp}.png"
             filepath = os.path.join(self.report_dir, filename)
-            self.driver.get_screenshot_as_file(filepath)
-            print(f"Screenshot saved: {filepath}")
-            return filepath
+            filepath = capture_screenshot(self.driver, filepath)
+            if filepath:
+                print(f"Screenshot saved: {filepath}")
+                return filepath
         return None
     
     def wait_for_element(self, locator, timeout=10, element_type="XPATH"):
@@ -68,7 +84,7 @@ class ComplaintSubmissionTest:
         try:
             if element_type == "XPATH":
                 element = WebDriverWait(self.driver, timeout).until(
-                    EC.presence_of_element_located((By.XPATH, locator))
+                    EC.presence_of_element_located(compile_locator(locator))
                 )
             else:
                 element = WebDriverWait(self.driver, timeout).until(
@@ -84,7 +100,7 @@ class ComplaintSubmissionTest:
         element = self.wait_for_element(locator, timeout, element_type)
         if element:
             try:
-                element.click()
+                click(self.driver, element)
                 return True
             except Exception as e:
                 print(f"Failed to click element: {e}")
@@ -96,6 +112,7 @@ class ComplaintSubmissionTest:
         element = self.wait_for_element(locator, timeout, element_type)
         if element:
             try:
+                mark_interaction(self.driver, element)
                 element.clear()
                 element.send_keys(text)
                 return True
@@ -127,6 +144,7 @@ class ComplaintSubmissionTest:
         try:
             # Step 1: Click the Blog tab
             print("--- Step 1: Click Blog Tab ---")
+            begin_step(self.driver, "Step 1: Click Blog Tab")
             if self.click_element(Locators.BLOG_TAB):
                 print("Blog tab clicked successfully")
                 self.take_screenshot("01_blog_tab_clicked")
@@ -136,6 +154,7 @@ class ComplaintSubmissionTest:
             
             # Step 2: Wait for AT_9365 to appear
             print("--- Step 2: Wait for AT_9365 ---")
+            begin_step(self.driver, "Step 2: Wait for AT_9365")
             if self.wait_for_element(Locators.AT_9365):
                 print("AT_9365 appeared successfully")
                 self.take_screenshot("02_at_9365_found")
@@ -145,6 +164,7 @@ class ComplaintSubmissionTest:
             
             # Step 3: Click on AT_9365
             print("--- Step 3: Click on AT_9365 ---")
+            begin_step(self.driver, "Step 3: Click on AT_9365")
             if self.click_element(Locators.AT_9365):
                 print("AT_9365 clicked successfully")
                 self.take_screenshot("03_at_9365_clicked")
@@ -154,6 +174,7 @@ class ComplaintSubmissionTest:
             
             # Step 4: Wait for AT_article_459461 to appear
             print("--- Step 4: Wait for AT_article_459461 ---")
+            begin_step(self.driver, "Step 4: Wait for AT_article_459461")
             if self.wait_for_element(Locators.AT_ARTICLE_459461):
                 print("AT_article_459461 appeared successfully")
                 self.take_screenshot("04_at_article_found")
@@ -163,6 +184,7 @@ class ComplaintSubmissionTest:
             
             # Step 5: Click on AT_article_459461
             print("--- Step 5: Click on AT_article_459461 ---")
+            begin_step(self.driver, "Step 5: Click on AT_article_459461")
             if self.click_element(Locators.AT_ARTICLE_459461):
                 print("AT_article_459461 clicked successfully")
                 self.take_screenshot("05_at_article_clicked")
@@ -172,6 +194,7 @@ class ComplaintSubmissionTest:
             
             # Step 6: Wait for Complaint button to appear
             print("--- Step 6: Wait for Complaint Button ---")
+            begin_step(self.driver, "Step 6: Wait for Complaint Button")
             if self.wait_for_element(Locators.COMPLAINT_BUTTON):
                 print("Complaint button appeared successfully")
                 self.take_screenshot("06_complaint_button_found")
@@ -181,6 +204,7 @@ class ComplaintSubmissionTest:
             
             # Step 7: Click on Complaint button
             print("--- Step 7: Click on Complaint Button ---")
+            begin_step(self.driver, "Step 7: Click on Complaint Button")
             if self.click_element(Locators.COMPLAINT_BUTTON):
                 print("Complaint button clicked successfully")
                 self.take_screenshot("07_complaint_button_clicked")
@@ -190,6 +214,7 @@ class ComplaintSubmissionTest:
             
             # Step 8: Wait for complaint details field
             print("--- Step 8: Wait for Complaint Details Field ---")
+            begin_step(self.driver, "Step 8: Wait for Complaint Details Field")
             if self.wait_for_element(Locators.COMPLAINT_DETAILS_FIELD):
                 print("Complaint details field appeared successfully")
                 self.take_screenshot("08_complaint_field_found")
@@ -199,6 +224,7 @@ class ComplaintSubmissionTest:
             
             # Step 9: Enter random text in the field
             print("--- Step 9: Enter Random Text ---")
+            begin_step(self.driver, "Step 9: Enter Random Text")
             random_text = self.generate_random_text()
             if self.enter_text(Locators.COMPLAINT_DETAILS_FIELD, random_text):
                 print(f"Random text entered successfully: {random_text}")
@@ -209,11 +235,13 @@ class ComplaintSubmissionTest:
             
             # Step 10: Hide keyboard
             print("--- Step 10: Hide Keyboard ---")
+            begin_step(self.driver, "Step 10: Hide Keyboard")
             self.hide_keyboard()
-            time.sleep(2)
+            wait_until_settled(self.driver, 2, target=compile_locator(Locators.SUBMIT_BUTTON))
             
             # Step 11: Look for Submit button
             print("--- Step 11: Look for Submit Button ---")
+            begin_step(self.driver, "Step 11: Look for Submit Button")
             if self.wait_for_element(Locators.SUBMIT_BUTTON):
                 print("Submit button found successfully")
                 self.take_screenshot("10_submit_button_found")
@@ -223,6 +251,7 @@ class ComplaintSubmissionTest:
             
             # Step 12: Click on Submit button
             print("--- Step 12: Click on Submit Button ---")
+            begin_step(self.driver, "Step 12: Click on Submit Button")
             if self.click_element(Locators.SUBMIT_BUTTON):
                 print("Submit button clicked successfully")
                 self.take_screenshot("11_submit_button_clicked")
@@ -232,6 +261,7 @@ class ComplaintSubmissionTest:
             
             # Step 13: Verify Submit successfully message
             print("--- Step 13: Verify Submit Successfully Message ---")
+            begin_step(self.driver, "Step 13: Verify Submit Successfully Message")
             if self.wait_for_element(Locators.SUBMIT_SUCCESSFULLY_MESSAGE):
                 print("Submit successfully message appeared")
                 self.take_screenshot("12_submit_successful")
@@ -239,12 +269,14 @@ class ComplaintSubmissionTest:
                 print("Submit successfully message did not appear")
                 return False
             
-            # Step 14: Wait for 5 seconds
-            print("--- Step 14: Waiting 5 seconds ---")
-            time.sleep(5)
+            # Step 14: Wait for the article page to come back
+            print("--- Step 14: Waiting for UI to settle ---")
+            begin_step(self.driver, "Step 14: Waiting for UI to settle")
+            wait_until_settled(self.driver, 5, target=compile_locator(Locators.BACK_BUTTON))
             
             # Step 15: Click Back button
             print("--- Step 15: Click Back Button ---")
+            begin_step(self.driver, "Step 15: Click Back Button")
             if self.click_element(Locators.BACK_BUTTON):
                 print("Back button clicked successfully")
                 self.take_screenshot("13_back_button_clicked")
@@ -252,12 +284,14 @@ class ComplaintSubmissionTest:
                 print("Failed to click Back button")
                 return False
             
-            # Step 16: Wait for 5 seconds
-            print("--- Step 16: Waiting 5 seconds ---")
-            time.sleep(5)
+            # Step 16: Wait for the tab bar to come back
+            print("--- Step 16: Waiting for UI to settle ---")
+            begin_step(self.driver, "Step 16: Waiting for UI to settle")
+            wait_until_settled(self.driver, 5, target=compile_locator(Locators.CONNECT_TAB))
             
             # Step 17: Click on Connect tab
             print("--- Step 17: Click on Connect Tab ---")
+            begin_step(self.driver, "Step 17: Click on Connect Tab")
             if self.click_element(Locators.CONNECT_TAB):
                 print("Connect tab clicked successfully")
                 self.take_screenshot("14_connect_tab_clicked")
@@ -267,6 +301,7 @@ class ComplaintSubmissionTest:
             
             # Step 18: Verify user is redirected to Connect page
             print("--- Step 18: Verify Connect Page ---")
+            begin_step(self.driver, "Step 18: Verify Connect Page")
             if self.wait_for_element(Locators.PROFILE_ICON_CONNECT_PAGE):
                 print("User redirected to Connect page successfully")
                 self.take_screenshot("15_connect_page_verified")
@@ -274,9 +309,10 @@ class ComplaintSubmissionTest:
                 print("User not redirected to Connect page")
                 return False
             
-            # Step 19: Wait for 5 seconds
-            print("--- Step 19: Waiting 5 seconds ---")
-            time.sleep(5)
+            # Step 19: Let the Connect page settle
+            print("--- Step 19: Waiting for UI to settle ---")
+            begin_step(self.driver, "Step 19: Waiting for UI to settle")
+            wait_until_settled(self.driver, 5)
             
             print(f"{self.test_name} completed: PASSED")
             return True
@@ -299,10 +335,16 @@ class ComplaintSubmissionTest:
         if not self.setup_driver():
             return False
         
+        trace = start_trace(self.driver, self.report_dir, self.test_name)
+        
         try:
             # Wait for app to load
             print("Waiting for app to load completely...")
-            time.sleep(5)
+            try:
+                wait_for_app_ready(self.driver, WebDriverWait(self.driver, 20), CAPABILITIES["appium:appPackage"],
+                                   compile_locator(Locators.BLOG_TAB), launch=self.test_name)
+            except TimeoutException:
+                print("App did not report ready within 20 seconds, continuing")
             self.take_screenshot("1-1_driver_initialized")
             
             # Run the test
@@ -314,9 +356,12 @@ class ComplaintSubmissionTest:
             return success
             
         finally:
+            if trace:
+                trace.stop()
             # Cleanup
-            if self.driver:
+            if self.driver and self.owns_driver:
                 print("=== Cleaning up and closing mobile driver ===")
+                flush_screenshots()
                 self.driver.quit()
 
 def main():
@@ -11,22 +11,31 @@ This script automates the process of:
 """
 
 # ===== Imports =====
-import time
 import pytest
 import os
+import sys
 from datetime import datetime
 from pathlib import Path
 from appium import webdriver
 from appium.options.android import UiAutomator2Options
-from selenium.webdriver.common.by import By
-from appium.webdriver.common.appiumby import AppiumBy
 from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
-from selenium.common.exceptions import TimeoutException, InvalidElementStateException
+from selenium.common.exceptions import TimeoutException
 from selenium.webdriver.common.action_chains import ActionChains
 from appium.webdriver.common.mobileby import MobileBy
 from typing import Tuple, List, Optional
 
+# Shared helpers live in mobile_automation/ at the repository root
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+from mobile_automation.connection import open_connection
+from mobile_automation.interaction import click
+from mobile_automation.locator_compiler import compile_locator
+from mobile_automation.profiler import profile_driver
+from mobile_automation.recording import start_recording
+from mobile_automation.screenshots import capture_screenshot, flush_screenshots
+from mobile_automation.tracing import begin_step, start_trace
+from mobile_automation.waits import wait_for_app_ready, wait_until_screen_stable, wait_until_settled
+
 # ===== Global Configuration =====
 class Config:
     """Centralized configuration class"""
@@ -72,16 +81,18 @@ def create_report_dir(test_name="Connection Flow Test"):
     return test_dir
 
 def take_screenshot(driver, step_name, report_dir):
-    """Takes and saves a screenshot with the given step name"""
+    """Takes a screenshot with the given step name, written to disk in the background"""
     screenshot_path = os.path.join(report_dir, f"{step_name}.png")
-    driver.save_screenshot(screenshot_path)
-    print(f"Screenshot saved: {screenshot_path}")
+    screenshot_path = capture_screenshot(driver, screenshot_path)
+    if screenshot_path:
+        print(f"Screenshot saved: {screenshot_path}")
 
 def wait_for_app_load(driver, wait):
     """Wait for the mobile app to load completely"""
     try:
         print("Waiting for app to load completely...")
-        time.sleep(5)  # Initial wait for app startup
+        wait_for_app_ready(driver, wait, Config.CAPABILITIES["appium:appPackage"],
+                           compile_locator(Config.Locators.CONNECT_BUTTON), launch="Connection Flow Test")
         print("App loaded successfully")
     except Exception:
         print("App load timeout")
@@ -125,8 +136,8 @@ def initialize_mobile_driver(report_dir):
         print("\n=== Starting mobile driver initialization ===")
         
         options = DriverUtils.create_driver_options()
-        driver = webdriver.Remote(Config.APPIUM_SERVER, options=options)
-        driver.implicitly_wait(10)
+        driver = profile_driver(webdriver.Remote(open_connection(Config.APPIUM_SERVER), options=options))
+        driver.implicitly_wait(0)
         
         print("Mobile driver initialized successfully")
         take_screenshot(driver, "1-1_driver_initialized", report_dir)
@@ -150,23 +161,24 @@ def test_connection_flow(driver, report_dir):
         # Step 1: Connect - Success Verification
         try:
             print("\n--- Step 1: Connect - Success Verification ---")
+            begin_step(driver, "Step 1: Connect - Success Verification")
             
             # Click on the Connect button
             connect_button = WebDriverWait(driver, 10).until(
-                EC.element_to_be_clickable((By.XPATH, Config.Locators.CONNECT_BUTTON))
+                EC.element_to_be_clickable(compile_locator(Config.Locators.CONNECT_BUTTON))
             )
-            connect_button.click()
+            click(driver, connect_button)
             print("Connect button clicked successfully")
             
             # Verify the connection timer appears
             connection_timer = WebDriverWait(driver, 15).until(
-                EC.presence_of_element_located((By.XPATH, Config.Locators.CONNECTION_TIMER))
+                EC.presence_of_element_located(compile_locator(Config.Locators.CONNECTION_TIMER))
             )
             print("Connection timer appeared successfully")
             
-            # Wait for 5 seconds
-            print("Waiting for 5 seconds...")
-            time.sleep(5)
+            # Wait for the connected screen to settle
+            print("Waiting for connected screen to settle...")
+            wait_until_settled(driver, 5, target=compile_locator(Config.Locators.IP_LIST_SCROLL_VIEW))
             
             take_screenshot(driver, "1-3_connection_established", report_dir)
             
@@ -178,64 +190,65 @@ def test_connection_flow(driver, report_dir):
         # Step 2: Switch to Different IP
         try:
             print("\n--- Step 2: Switch to Different IP ---")
+            begin_step(driver, "Step 2: Switch to Different IP")
             
             # Click on the Scroll View (IP list)
             ip_list_scroll = WebDriverWait(driver, 10).until(
-                EC.element_to_be_clickable((By.XPATH, Config.Locators.IP_LIST_SCROLL_VIEW))
+                EC.element_to_be_clickable(compile_locator(Config.Locators.IP_LIST_SCROLL_VIEW))
             )
-            ip_list_scroll.click()
+            click(driver, ip_list_scroll)
             print("IP list scroll view clicked successfully")
             
             # Wait until "Sticky IPs" text appears
             sticky_ips_text = WebDriverWait(driver, 15).until(
-                EC.presence_of_element_located((By.XPATH, Config.Locators.STICKY_IPS_TEXT))
+                EC.presence_of_element_located(compile_locator(Config.Locators.STICKY_IPS_TEXT))
             )
             print("Sticky IPs text appeared successfully")
             
             # Click on the Horizontal Scroll View to select akTest_+116
             aktest_116_selection = WebDriverWait(driver, 10).until(
-                EC.element_to_be_clickable((By.XPATH, Config.Locators.AKTEST_116_SELECTION))
+                EC.element_to_be_clickable(compile_locator(Config.Locators.AKTEST_116_SELECTION))
             )
-            aktest_116_selection.click()
+            click(driver, aktest_116_selection)
             print("akTest_+116 selection clicked successfully")
             
-            # Wait for 3 seconds
-            print("Waiting for 3 seconds...")
-            time.sleep(3)
+            # Wait for the IP options to render
+            print("Waiting for IP options to render...")
+            wait_until_settled(driver, 3, target=compile_locator(Config.Locators.RANDOM_OPTION))
             
             # Select the Random option
             random_option = WebDriverWait(driver, 10).until(
-                EC.element_to_be_clickable((By.XPATH, Config.Locators.RANDOM_OPTION))
+                EC.element_to_be_clickable(compile_locator(Config.Locators.RANDOM_OPTION))
             )
-            random_option.click()
+            click(driver, random_option)
             print("Random option selected successfully")
             
             # Wait for the confirmation popup
             confirmation_popup = WebDriverWait(driver, 10).until(
-                EC.presence_of_element_located((By.XPATH, Config.Locators.CONFIRMATION_POPUP))
+                EC.presence_of_element_located(compile_locator(Config.Locators.CONFIRMATION_POPUP))
             )
             print("Confirmation popup appeared")
             
             # Click Confirm
             confirm_button = WebDriverWait(driver, 10).until(
-                EC.element_to_be_clickable((By.XPATH, Config.Locators.CONFIRM_BUTTON))
+                EC.element_to_be_clickable(compile_locator(Config.Locators.CONFIRM_BUTTON))
             )
-            confirm_button.click()
+            click(driver, confirm_button)
             print("Confirm button clicked successfully")
             
-            # Wait for 5 seconds
-            print("Waiting for 5 seconds...")
-            time.sleep(5)
+            # Wait for the reconnection to start
+            print("Waiting for reconnection...")
+            wait_until_settled(driver, 5, target=compile_locator(Config.Locators.CONNECTION_TIMER_AFTER_IP_SWITCH))
             
             # Verify the connection timer appears again
             connection_timer_again = WebDriverWait(driver, 15).until(
-                EC.presence_of_element_located((By.XPATH, Config.Locators.CONNECTION_TIMER_AFTER_IP_SWITCH))
+                EC.presence_of_element_located(compile_locator(Config.Locators.CONNECTION_TIMER_AFTER_IP_SWITCH))
             )
             print("Connection timer appeared again - IP switch successful")
             
-            # Wait another 5 seconds
-            print("Waiting another 5 seconds...")
-            time.sleep(5)
+            # Wait for the reconnected screen to settle
+            print("Waiting for reconnected screen to settle...")
+            wait_until_settled(driver, 5, target=compile_locator(Config.Locators.DISCONNECT_BUTTON))
             
             take_screenshot(driver, "1-4_ip_switch_completed", report_dir)
             
@@ -247,27 +260,28 @@ def test_connection_flow(driver, report_dir):
         # Step 3: Disconnect - Final Check
         try:
             print("\n--- Step 3: Disconnect - Final Check ---")
+            begin_step(driver, "Step 3: Disconnect - Final Check")
             
             # Click the Disconnect button
             disconnect_button = WebDriverWait(driver, 10).until(
-                EC.element_to_be_clickable((By.XPATH, Config.Locators.DISCONNECT_BUTTON))
+                EC.element_to_be_clickable(compile_locator(Config.Locators.DISCONNECT_BUTTON))
             )
-            disconnect_button.click()
+            click(driver, disconnect_button)
             print("Disconnect button clicked successfully")
             
-            # Wait for 5 seconds
-            print("Waiting for 5 seconds...")
-            time.sleep(5)
+            # Wait for the disconnection to finish
+            print("Waiting for disconnection...")
+            wait_until_settled(driver, 5, target=compile_locator(Config.Locators.CONNECT_BUTTON))
             
             # Verify the Connect button appears
             connect_button_final = WebDriverWait(driver, 10).until(
-                EC.presence_of_element_located((By.XPATH, Config.Locators.CONNECT_BUTTON))
+                EC.presence_of_element_located(compile_locator(Config.Locators.CONNECT_BUTTON))
             )
             print("Connect button appears - Final disconnection successful")
             
-            # Wait for 5 seconds
-            print("Waiting for 5 seconds...")
-            time.sleep(5)
+            # Let the disconnected screen settle
+            print("Waiting for disconnected screen to settle...")
+            wait_until_screen_stable(driver, 5)
             
             take_screenshot(driver, "1-5_final_disconnection", report_dir)
             return True
@@ -283,7 +297,7 @@ def test_connection_flow(driver, report_dir):
         raise
 
 # ===== Main Test Function =====
-def run_zoomcat_connection_flow_tests():
+def run_zoomcat_connection_flow_tests(driver=None):
     """Main function to run all ZoomCat connection flow tests"""
     report_dir = create_report_dir("Connection Flow Test")
     print(f"\n=== Running ZoomCat Mobile Connection Flow Tests with report directory: {report_dir} ===")
@@ -293,14 +307,22 @@ def run_zoomcat_connection_flow_tests():
         "connection_flow": "NOT_RUN"
     }
     
-    driver = None
+    owns_driver = driver is None
+    trace = None
+    recording = None
     
     try:
         # Initialize mobile driver
         print("\n" + "="*60)
         print("INITIALIZING MOBILE DRIVER")
         print("="*60)
-        driver = initialize_mobile_driver(report_dir)
+        if owns_driver:
+            driver = initialize_mobile_driver(report_dir)
+        else:
+            print("Using shared mobile driver session")
+            take_screenshot(driver, "1-1_driver_attached", report_dir)
+        trace = start_trace(driver, report_dir, "Connection Flow Test")
+        recording = start_recording(driver, report_dir)
         
         # Test: Connection flow
         print("\n" + "="*60)
@@ -341,8 +363,13 @@ def run_zoomcat_connection_flow_tests():
         raise
         
     finally:
-        if driver:
+        if trace:
+            trace.stop()
+        if recording:
+            recording.stop(failed=test_results["connection_flow"] != "PASSED")
+        if driver and owns_driver:
             print("\n=== Cleaning up and closing mobile driver ===")
+            flush_screenshots()
             driver.quit()
 
 # ===== Script Execution =====
@@ -12,19 +12,29 @@ This script automates the process of:
 import time
 import pytest
 import os
+import sys
 from datetime import datetime
 from pathlib import Path
 from appium import webdriver
 from appium.options.android import UiAutomator2Options
-from selenium.webdriver.common.by import By
-from appium.webdriver.common.appiumby import AppiumBy
 from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
-from selenium.common.exceptions import TimeoutException, InvalidElementStateException
-from selenium.webdriver.common.action_chains import ActionChains
+from selenium.common.exceptions import TimeoutException
 from appium.webdriver.common.mobileby import MobileBy
 from typing import Tuple, List, Optional
-from selenium.webdriver.common.keys import Keys
+
+# Shared helpers live in mobile_automation/ at the repository root
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+from mobile_automation.connection import open_connection
+from mobile_automation.interaction import highlight_element, interact
+from mobile_automation.locator_compiler import compile_locator, compiled_candidates
+from mobile_automation.locators import resolve_first
+from mobile_automation.profiler import profile_driver
+from mobile_automation.screenshots import capture_screenshot, flush_screenshots
+from mobile_automation.snapshot import UiSnapshot
+from mobile_automation.text_entry import fill_field
+from mobile_automation.tracing import begin_step, start_trace
+from mobile_automation.waits import wait_for_app_ready, wait_until_screen_stable, wait_until_settled
 
 # ===== Global Configuration =====
 class Config:
@@ -67,36 +77,22 @@ def create_report_dir(test_name="Login via Verification Code test"):
     return test_dir
 
 def take_screenshot(driver, step_name, report_dir):
-    """Takes and saves a screenshot with the given step name"""
+    """Takes a screenshot with the given step name, written to disk in the background"""
     screenshot_path = os.path.join(report_dir, f"{step_name}.png")
-    driver.save_screenshot(screenshot_path)
-    print(f"Screenshot saved: {screenshot_path}")
+    screenshot_path = capture_screenshot(driver, screenshot_path)
+    if screenshot_path:
+        print(f"Screenshot saved: {screenshot_path}")
 
 def highlight_and_wait(driver, element, wait_time=1):
-    """Highlights an element with a red border and waits"""
-    try:
-        driver.execute_script("arguments[0].style.border='3px solid red'", element)
-        time.sleep(wait_time)
-    except Exception:
-        # Mobile elements don't support style modification, just wait
+    """Highlights an element and waits only if the highlight is visible on the device (webview)"""
+    if highlight_element(driver, element):
         time.sleep(wait_time)
 
 def interact_with_element(driver, element, action, step_name, report_dir, wait_time=1, **kwargs):
     """Handles element interaction with screenshots and highlighting"""
     try:
-        highlight_and_wait(driver, element, 1)
-        
-        if action == "click":
-            element.click()
-        elif action == "send_keys":
-            element.send_keys(kwargs.get('keys', ''))
-        elif action == "clear":
-            element.clear()
-        elif action == "clear_and_send":
-            element.clear()
-            element.send_keys(kwargs.get('keys', ''))
-        
-        time.sleep(wait_time)
+        interact(driver, element, action, **kwargs)
+        wait_until_settled(driver, wait_time)
         take_screenshot(driver, step_name, report_dir)
         
     except Exception as e:
@@ -107,7 +103,8 @@ def wait_for_app_load(driver, wait):
     """Wait for the mobile app to load completely"""
     try:
         print("Waiting for app to load completely...")
-        time.sleep(5)  # Initial wait for app startup
+        wait_for_app_ready(driver, wait, Config.CAPABILITIES["appium:appPackage"],
+                           compile_locator(Config.Locators.EMAIL_FIELD), launch="Login via Verification Code test")
         print("App loaded successfully")
     except Exception:
         print("App load timeout")
@@ -151,7 +148,7 @@ class LocatorStrategy:
     def get_input_field_locators(field_xpath: str, instance: int = 0) -> List[Tuple[str, str]]:
         """Get multiple locator strategies for input fields"""
         return [
-            (By.XPATH, field_xpath),
+            *compiled_candidates(field_xpath),
             (MobileBy.CLASS_NAME, "android.widget.EditText"),
             (MobileBy.ANDROID_UIAUTOMATOR, f'new UiSelector().className("android.widget.EditText").instance({instance})')
         ]
@@ -161,7 +158,7 @@ class LocatorStrategy:
         """Get multiple locator strategies for checkboxes"""
         return [
             (MobileBy.ANDROID_UIAUTOMATOR, 'new UiSelector().className("android.widget.CheckBox").instance(0)'),
-            (By.XPATH, checkbox_xpath),
+            *compiled_candidates(checkbox_xpath),
             (MobileBy.CLASS_NAME, "android.widget.CheckBox")
         ]
     
@@ -169,7 +166,7 @@ class LocatorStrategy:
     def get_button_locators(button_xpath: str) -> List[Tuple[str, str]]:
         """Get multiple locator strategies for buttons"""
         return [
-            (By.XPATH, button_xpath),
+            *compiled_candidates(button_xpath),
             (MobileBy.CLASS_NAME, "android.widget.Button")
         ]
 
@@ -180,8 +177,8 @@ def initialize_mobile_driver(report_dir):
         print("\n=== Starting mobile driver initialization ===")
         
         options = DriverUtils.create_driver_options()
-        driver = webdriver.Remote(Config.APPIUM_SERVER, options=options)
-        driver.implicitly_wait(10)
+        driver = profile_driver(webdriver.Remote(open_connection(Config.APPIUM_SERVER), options=options))
+        driver.implicitly_wait(0)
         
         print("Mobile driver initialized successfully")
         take_screenshot(driver, "1-1_driver_initialized", report_dir)
@@ -196,6 +193,7 @@ def test_email_login_flow(driver, report_dir):
     """Test case for email-based login with verification code"""
     try:
         print("\n=== Starting Email Login Flow Test ===")
+        snapshot = UiSnapshot(driver)
         
         # Wait for app to load completely
         print("Waiting for app to load completely...")
@@ -205,101 +203,15 @@ def test_email_login_flow(driver, report_dir):
         # Step 1: Enter email
         try:
             print("\n--- Step 1: Entering Email Address ---")
+            begin_step(driver, "Step 1: Entering Email Address")
             
             # Try multiple locator strategies for email field
             locators = LocatorStrategy.get_input_field_locators(Config.Locators.EMAIL_FIELD, 0)
-            email_field = None
+            email_field = resolve_first(driver, locators, "email field", EC.presence_of_element_located, snapshot=snapshot)
             
-            for by, locator in locators:
-                try:
-                    print(f"Trying to find email field using {by}...")
-                    email_field = WebDriverWait(driver, 10).until(
-                        EC.presence_of_element_located((by, locator))
-                    )
-                    print(f"Found email field using {by}")
-                    break
-                except TimeoutException:
-                    continue
-            
-            if not email_field:
-                raise Exception("Could not find email field with any locator strategy")
-            
-            # Step 1a: Click on email field and delete existing content
-            try:
-                print("Clicking on email field to focus it...")
-                email_field.click()
-                time.sleep(1)
-                
-                print("Deleting existing email content...")
-                # Try multiple deletion strategies focused on select all + delete
-                deletion_strategies = [
-                    # Strategy 1: Double click to select all, then delete
-                    lambda: (email_field.click(), time.sleep(0.5), email_field.click(), time.sleep(0.5), email_field.send_keys(Keys.DELETE)),
-                    # Strategy 2: Long press to select all, then delete
-                    lambda: ActionChains(driver).move_to_element(email_field).click_and_hold().pause(2).release().pause(1).send_keys(Keys.DELETE).perform(),
-                    # Strategy 3: Use Android keycodes for select all and delete
-                    lambda: (driver.press_keycode(123), time.sleep(0.5), driver.press_keycode(67), time.sleep(0.5), driver.press_keycode(112)),
-                    # Strategy 4: Clear method
-                    lambda: email_field.clear(),
-                    # Strategy 5: ActionChains with keyboard shortcuts
-                    lambda: ActionChains(driver).move_to_element(email_field).click().pause(1).send_keys(Keys.CONTROL + "a").pause(1).send_keys(Keys.DELETE).perform(),
-                    # Strategy 6: Direct keyboard shortcuts
-                    lambda: email_field.send_keys(Keys.CONTROL + "a" + Keys.DELETE),
-                ]
-                
-                content_deleted = False
-                for i, strategy in enumerate(deletion_strategies):
-                    try:
-                        print(f"Trying deletion strategy {i+1}...")
-                        strategy()
-                        time.sleep(1)
-                        content_deleted = True
-                        print("Email field content deleted successfully")
-                        break
-                    except Exception as e:
-                        print(f"Deletion strategy {i+1} failed: {str(e)}")
-                        continue
-                
-                if not content_deleted:
-                    print("Warning: Could not delete email field content, proceeding anyway")
-                
-                # Click back to ensure field is focused
-                print("Clicking back on email field to ensure focus...")
-                email_field.click()
-                time.sleep(1)
-                
-            except Exception as e:
-                print(f"Could not delete email field content: {str(e)}")
-            
-            # Clear the field first to ensure clean input
-            try:
-                print("Clearing email field first...")
-                email_field.clear()
-                time.sleep(1)
-            except Exception as e:
-                print(f"Could not clear email field: {str(e)}")
-            
-            # Try multiple input strategies
-            input_strategies = [
-                lambda: email_field.send_keys(Config.TEST_EMAIL),
-                lambda: ActionChains(driver).move_to_element(email_field).click().pause(1).send_keys(Config.TEST_EMAIL).perform(),
-                lambda: email_field.send_keys(Config.TEST_EMAIL)
-            ]
-            
-            email_entered = False
-            for i, strategy in enumerate(input_strategies):
-                try:
-                    print(f"Trying email input strategy {i+1}...")
-                    strategy()
-                    email_entered = True
-                    print("Email entered successfully")
-                    break
-                except Exception as e:
-                    print(f"Email input strategy {i+1} failed: {str(e)}")
-                    continue
-            
-            if not email_entered:
-                raise Exception("Failed to enter email with any input strategy")
+            # One verified set-value instead of the delete/clear/type cascades
+            fill_field(driver, email_field, Config.TEST_EMAIL, "email field", secret=False,
+                       locator=Config.Locators.EMAIL_FIELD)
             
             take_screenshot(driver, "1-3_email_entered", report_dir)
             
@@ -311,57 +223,17 @@ def test_email_login_flow(driver, report_dir):
         # Step 2: Enter verification code
         try:
             print("\n--- Step 2: Entering Verification Code ---")
+            begin_step(driver, "Step 2: Entering Verification Code")
             
             # Try multiple locator strategies for verification code field
             locators = LocatorStrategy.get_input_field_locators(Config.Locators.VERIFICATION_CODE_FIELD, 1)
-            code_field = None
-            
-            for by, locator in locators:
-                try:
-                    print(f"Trying to find verification code field using {by}...")
-                    code_field = WebDriverWait(driver, 10).until(
-                        EC.presence_of_element_located((by, locator))
-                    )
-                    print(f"Found verification code field using {by}")
-                    break
-                except TimeoutException:
-                    continue
-            
-            if not code_field:
-                raise Exception("Could not find verification code field with any locator strategy")
+            code_field = resolve_first(driver, locators, "verification code field", EC.presence_of_element_located, snapshot=snapshot)
             
             # Log field attributes for debugging
-            print(f"Verification code field attributes:")
-            print(f"  Enabled: {code_field.is_enabled()}")
-            print(f"  Displayed: {code_field.is_displayed()}")
-            print(f"  Location: {code_field.location}")
-            print(f"  Size: {code_field.size}")
-            
-            # Try multiple input strategies
-            code_entered = False
-            for i, strategy in enumerate(input_strategies):
-                try:
-                    print(f"Trying verification code input strategy {i+1}...")
-                    if i == 2:  # Clear and send strategy
-                        code_field.clear()
-                        time.sleep(1)
-                        code_field.send_keys(Config.TEST_VERIFICATION_CODE)
-                    else:
-                        # Adapt strategy for verification code
-                        if i == 0:
-                            code_field.send_keys(Config.TEST_VERIFICATION_CODE)
-                        else:
-                            ActionChains(driver).move_to_element(code_field).click().pause(1).send_keys(Config.TEST_VERIFICATION_CODE).perform()
-                    
-                    code_entered = True
-                    print("Verification code entered successfully")
-                    break
-                except Exception as e:
-                    print(f"Verification code input strategy {i+1} failed: {str(e)}")
-                    continue
+            snapshot.print_attributes("Verification code field", code_field)
             
-            if not code_entered:
-                raise Exception("Failed to enter verification code with any input strategy")
+            fill_field(driver, code_field, Config.TEST_VERIFICATION_CODE, "verification code field", secret=False,
+                       locator=Config.Locators.VERIFICATION_CODE_FIELD)
             
             # Hide keyboard after entering code
             print("Hiding keyboard after entering verification code...")
@@ -371,7 +243,7 @@ def test_email_login_flow(driver, report_dir):
             except Exception as e:
                 print(f"Could not hide keyboard: {str(e)}")
             
-            time.sleep(1)  # Let the UI settle
+            wait_until_settled(driver, 1)  # Let the UI settle
             take_screenshot(driver, "1-4_verification_code_entered", report_dir)
             
         except Exception as e:
@@ -382,6 +254,7 @@ def test_email_login_flow(driver, report_dir):
         # Step 3: Accept terms and conditions
         try:
             print("\n--- Step 3: Accepting Terms and Conditions ---")
+            begin_step(driver, "Step 3: Accepting Terms and Conditions")
             
             # Hide keyboard before handling checkbox
             print("Ensuring keyboard is hidden before checkbox interaction...")
@@ -390,7 +263,7 @@ def test_email_login_flow(driver, report_dir):
                 print("Keyboard hidden successfully")
             except Exception:
                 print("No keyboard to hide or hide failed")
-            time.sleep(1)  # Let the UI settle
+            wait_until_settled(driver, 1)  # Let the UI settle
             
             # Try multiple locator strategies for checkbox
             locators = LocatorStrategy.get_checkbox_locators(Config.Locators.TERMS_CHECKBOX)
@@ -400,42 +273,32 @@ def test_email_login_flow(driver, report_dir):
             for attempt in range(max_attempts):
                 print(f"Terms acceptance attempt {attempt + 1}/{max_attempts}")
                 
-                for by, locator in locators:
-                    try:
-                        print(f"Trying to find checkbox using {by}...")
-                        checkbox = WebDriverWait(driver, 10).until(
-                            EC.presence_of_element_located((by, locator))
-                        )
-                        print(f"Found checkbox using {by}")
-                        break
-                    except TimeoutException:
-                        continue
+                try:
+                    checkbox = resolve_first(driver, locators, "checkbox", EC.presence_of_element_located, snapshot=snapshot)
+                except TimeoutException:
+                    checkbox = None
                 
                 if checkbox:
                     # Log checkbox attributes
-                    print(f"Checkbox attributes:")
-                    print(f"  Enabled: {checkbox.is_enabled()}")
-                    print(f"  Displayed: {checkbox.is_displayed()}")
-                    print(f"  Location: {checkbox.location}")
-                    print(f"  Size: {checkbox.size}")
+                    snapshot.print_attributes("Checkbox", checkbox)
                     
                     # Try to click the checkbox
                     try:
                         print("Clicking checkbox...")
-                        checkbox.click()
+                        snapshot.click(checkbox)
                         print("Checkbox clicked successfully")
                         break
                     except Exception as e:
                         print(f"Checkbox click failed: {str(e)}")
                         if attempt < max_attempts - 1:
-                            time.sleep(2)
+                            wait_until_settled(driver, 2)
                             continue
                         else:
                             raise
                 else:
                     if attempt < max_attempts - 1:
                         print("Checkbox not found, retrying...")
-                        time.sleep(2)
+                        wait_until_settled(driver, 2)
                         continue
                     else:
                         raise Exception("Could not find checkbox with any locator strategy")
@@ -450,37 +313,20 @@ def test_email_login_flow(driver, report_dir):
         # Step 4: Click login button
         try:
             print("\n--- Step 4: Clicking Login Button ---")
+            begin_step(driver, "Step 4: Clicking Login Button")
             
             # Try multiple locator strategies for login button
             locators = LocatorStrategy.get_button_locators(Config.Locators.LOGIN_BUTTON)
-            login_button = None
-            
-            for by, locator in locators:
-                try:
-                    print(f"Trying to find login button using {by}...")
-                    login_button = WebDriverWait(driver, 10).until(
-                        EC.presence_of_element_located((by, locator))
-                    )
-                    print(f"Found login button using {by}")
-                    break
-                except TimeoutException:
-                    continue
-            
-            if not login_button:
-                raise Exception("Could not find login button with any locator strategy")
+            login_button = resolve_first(driver, locators, "login button", EC.presence_of_element_located, snapshot=snapshot)
             
             # Log login button attributes
-            print(f"Login button attributes:")
-            print(f"  Enabled: {login_button.is_enabled()}")
-            print(f"  Displayed: {login_button.is_displayed()}")
-            print(f"  Location: {login_button.location}")
-            print(f"  Size: {login_button.size}")
+            snapshot.print_attributes("Login button", login_button)
             
             # Click the login button
             print("Clicking login button...")
-            login_button.click()
+            snapshot.click(login_button)
             print("Login button clicked successfully")
-            time.sleep(1)  # Let the UI settle
+            wait_until_settled(driver, 1)  # Let the UI settle
             
             take_screenshot(driver, "1-6_login_button_clicked", report_dir)
             
@@ -492,15 +338,16 @@ def test_email_login_flow(driver, report_dir):
         # Step 5: Verify login success
         try:
             print("\n--- Step 5: Verifying Login Success ---")
+            begin_step(driver, "Step 5: Verifying Login Success")
             
             # Wait for PROFILE ICON to appear
             print("Waiting for PROFILE ICON to appear...")
             PROFILE_ICON = WebDriverWait(driver, 20).until(
-                EC.presence_of_element_located((AppiumBy.XPATH, Config.Locators.PROFILE_ICON))
+                EC.presence_of_element_located(compile_locator(Config.Locators.PROFILE_ICON))
             )
             
             # Verify the PROFILE ICON is displayed
-            time.sleep(5)  # Wait 5 seconds after profile icon verification
+            wait_until_screen_stable(driver, 5)  # Let the home screen settle after profile icon verification
             if PROFILE_ICON.is_displayed():
                 print("PROFILE ICON found and displayed - Login successful!")
                 take_screenshot(driver, "1-7_login_success", report_dir)
@@ -523,7 +370,7 @@ def test_email_login_flow(driver, report_dir):
         raise
 
 # ===== Main Test Function =====
-def run_zoomcat_login_tests():
+def run_zoomcat_login_tests(driver=None):
     """Main function to run all ZoomCat login tests"""
     report_dir = create_report_dir("Login via Verification Code test")
     print(f"\n=== Running ZoomCat Mobile Login Tests with report directory: {report_dir} ===")
@@ -533,14 +380,20 @@ def run_zoomcat_login_tests():
         "email_login_flow": "NOT_RUN"
     }
     
-    driver = None
+    owns_driver = driver is None
+    trace = None
     
     try:
         # Initialize mobile driver
         print("\n" + "="*60)
         print("INITIALIZING MOBILE DRIVER")
         print("="*60)
-        driver = initialize_mobile_driver(report_dir)
+        if owns_driver:
+            driver = initialize_mobile_driver(report_dir)
+        else:
+            print("Using shared mobile driver session")
+            take_screenshot(driver, "1-1_driver_attached", report_dir)
+        trace = start_trace(driver, report_dir, "Login via Verification Code test")
         
         # Test: Email login flow
         print("\n" + "="*60)
@@ -581,8 +434,11 @@ def run_zoomcat_login_tests():
         raise
         
     finally:
-        if driver:
+        if trace:
+            trace.stop()
+        if driver and owns_driver:
             print("\n=== Cleaning up and closing mobile driver ===")
+            flush_screenshots()
             driver.quit()
 
 # ===== Pytest Integration =====
@@ -620,6 +476,7 @@ class TestZoomCatLogin:
             
         finally:
             if driver:
+                flush_screenshots()
                 driver.quit()
 
 # ===== Script Execution =====
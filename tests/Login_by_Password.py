@@ -13,19 +13,29 @@ This script automates the process of:
 import time
 import pytest
 import os
+import sys
 from datetime import datetime
 from pathlib import Path
 from appium import webdriver
 from appium.options.android import UiAutomator2Options
-from selenium.webdriver.common.by import By
-from appium.webdriver.common.appiumby import AppiumBy
 from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
-from selenium.common.exceptions import TimeoutException, InvalidElementStateException
-from selenium.webdriver.common.action_chains import ActionChains
+from selenium.common.exceptions import TimeoutException
 from appium.webdriver.common.mobileby import MobileBy
 from typing import Tuple, List, Optional
-from selenium.webdriver.common.keys import Keys
+
+# Shared helpers live in mobile_automation/ at the repository root
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+from mobile_automation.connection import open_connection
+from mobile_automation.interaction import highlight_element, interact
+from mobile_automation.locator_compiler import compile_locator, compiled_candidates
+from mobile_automation.locators import resolve_first
+from mobile_automation.profiler import profile_driver
+from mobile_automation.screenshots import capture_screenshot, flush_screenshots
+from mobile_automation.snapshot import UiSnapshot
+from mobile_automation.text_entry import fill_field
+from mobile_automation.tracing import begin_step, start_trace
+from mobile_automation.waits import wait_for_app_ready, wait_until_screen_stable, wait_until_settled
 
 # ===== Global Configuration =====
 class Config:
@@ -77,36 +87,22 @@ def create_report_dir(test_name="Login by Password test"):
     return test_dir
 
 def take_screenshot(driver, step_name, report_dir):
-    """Takes and saves a screenshot with the given step name"""
+    """Takes a screenshot with the given step name, written to disk in the background"""
     screenshot_path = os.path.join(report_dir, f"{step_name}.png")
-    driver.save_screenshot(screenshot_path)
-    print(f"Screenshot saved: {screenshot_path}")
+    screenshot_path = capture_screenshot(driver, screenshot_path)
+    if screenshot_path:
+        print(f"Screenshot saved: {screenshot_path}")
 
 def highlight_and_wait(driver, element, wait_time=1):
-    """Highlights an element with a red border and waits"""
-    try:
-        driver.execute_script("arguments[0].style.border='3px solid red'", element)
-        time.sleep(wait_time)
-    except Exception:
-        # Mobile elements don't support style modification, just wait
+    """Highlights an element and waits only if the highlight is visible on the device (webview)"""
+    if highlight_element(driver, element):
         time.sleep(wait_time)
 
 def interact_with_element(driver, element, action, step_name, report_dir, wait_time=1, **kwargs):
     """Handles element interaction with screenshots and highlighting"""
     try:
-        highlight_and_wait(driver, element, 1)
-        
-        if action == "click":
-            element.click()
-        elif action == "send_keys":
-            element.send_keys(kwargs.get('keys', ''))
-        elif action == "clear":
-            element.clear()
-        elif action == "clear_and_send":
-            element.clear()
-            element.send_keys(kwargs.get('keys', ''))
-        
-        time.sleep(wait_time)
+        interact(driver, element, action, **kwargs)
+        wait_until_settled(driver, wait_time)
         take_screenshot(driver, step_name, report_dir)
         
     except Exception as e:
@@ -117,7 +113,8 @@ def wait_for_app_load(driver, wait):
     """Wait for the mobile app to load completely"""
     try:
         print("Waiting for app to load completely...")
-        time.sleep(5)  # Initial wait for app startup
+        wait_for_app_ready(driver, wait, Config.CAPABILITIES["appium:appPackage"],
+                           compile_locator(Config.Locators.PASSWORD_BUTTON), launch="Login by Password test")
         print("App loaded successfully")
     except Exception:
         print("App load timeout")
@@ -161,7 +158,7 @@ class LocatorStrategy:
     def get_button_locators(button_xpath: str) -> List[Tuple[str, str]]:
         """Get multiple locator strategies for buttons"""
         return [
-            (By.XPATH, button_xpath),
+            *compiled_candidates(button_xpath),
             (MobileBy.CLASS_NAME, "android.widget.Button"),
             (MobileBy.ANDROID_UIAUTOMATOR, 'new UiSelector().className("android.view.View")')
         ]
@@ -170,7 +167,7 @@ class LocatorStrategy:
     def get_input_field_locators(field_xpath: str, instance: int = 0) -> List[Tuple[str, str]]:
         """Get multiple locator strategies for input fields"""
         return [
-            (By.XPATH, field_xpath),
+            *compiled_candidates(field_xpath),
             (MobileBy.CLASS_NAME, "android.widget.EditText"),
             (MobileBy.ANDROID_UIAUTOMATOR, f'new UiSelector().className("android.widget.EditText").instance({instance})')
         ]
@@ -179,7 +176,7 @@ class LocatorStrategy:
     def get_image_view_locators(image_xpath: str) -> List[Tuple[str, str]]:
         """Get multiple locator strategies for image views (profile icon)"""
         return [
-            (By.XPATH, image_xpath),
+            *compiled_candidates(image_xpath),
             (MobileBy.CLASS_NAME, "android.widget.ImageView"),
             (MobileBy.ANDROID_UIAUTOMATOR, 'new UiSelector().className("android.widget.ImageView")')
         ]
@@ -188,7 +185,7 @@ class LocatorStrategy:
     def get_section_locators(section_xpath: str) -> List[Tuple[str, str]]:
         """Get multiple locator strategies for sections"""
         return [
-            (By.XPATH, section_xpath),
+            *compiled_candidates(section_xpath),
             (MobileBy.CLASS_NAME, "android.widget.FrameLayout")
         ]
     
@@ -196,7 +193,7 @@ class LocatorStrategy:
     def get_popup_locators(popup_xpath: str) -> List[Tuple[str, str]]:
         """Get multiple locator strategies for popups"""
         return [
-            (By.XPATH, popup_xpath),
+            *compiled_candidates(popup_xpath),
             (MobileBy.CLASS_NAME, "android.widget.FrameLayout")
         ]
     
@@ -205,7 +202,7 @@ class LocatorStrategy:
         """Get multiple locator strategies for checkboxes"""
         return [
             (MobileBy.ANDROID_UIAUTOMATOR, 'new UiSelector().className("android.widget.CheckBox").instance(0)'),
-            (By.XPATH, checkbox_xpath),
+            *compiled_candidates(checkbox_xpath),
             (MobileBy.CLASS_NAME, "android.widget.CheckBox")
         ]
 
@@ -216,8 +213,8 @@ def initialize_mobile_driver(report_dir):
         print("\n=== Starting mobile driver initialization ===")
         
         options = DriverUtils.create_driver_options()
-        driver = webdriver.Remote(Config.APPIUM_SERVER, options=options)
-        driver.implicitly_wait(10)
+        driver = profile_driver(webdriver.Remote(open_connection(Config.APPIUM_SERVER), options=options))
+        driver.implicitly_wait(0)
         
         print("Mobile driver initialized successfully")
         take_screenshot(driver, "1-1_driver_initialized", report_dir)
@@ -232,6 +229,7 @@ def test_password_login_flow(driver, report_dir):
     """Test case for password-based login flow"""
     try:
         print("\n=== Starting Password Login Flow Test ===")
+        snapshot = UiSnapshot(driver)
         
         # Wait for app to load completely
         print("Waiting for app to load completely...")
@@ -241,37 +239,20 @@ def test_password_login_flow(driver, report_dir):
         # Step 1: Click on the "Password" button
         try:
             print("\n--- Step 1: Clicking Password Button ---")
+            begin_step(driver, "Step 1: Clicking Password Button")
             
             # Try multiple locator strategies for password button
             locators = LocatorStrategy.get_button_locators(Config.Locators.PASSWORD_BUTTON)
-            password_button = None
-            
-            for by, locator in locators:
-                try:
-                    print(f"Trying to find password button using {by}...")
-                    password_button = WebDriverWait(driver, 10).until(
-                        EC.element_to_be_clickable((by, locator))
-                    )
-                    print(f"Found password button using {by}")
-                    break
-                except TimeoutException:
-                    continue
-            
-            if not password_button:
-                raise Exception("Could not find password button with any locator strategy")
+            password_button = resolve_first(driver, locators, "password button", EC.element_to_be_clickable, snapshot=snapshot)
             
             # Log password button attributes
-            print(f"Password button attributes:")
-            print(f"  Enabled: {password_button.is_enabled()}")
-            print(f"  Displayed: {password_button.is_displayed()}")
-            print(f"  Location: {password_button.location}")
-            print(f"  Size: {password_button.size}")
+            snapshot.print_attributes("Password button", password_button)
             
             # Click the password button
             print("Clicking password button...")
-            password_button.click()
+            snapshot.click(password_button)
             print("Password button clicked successfully")
-            time.sleep(2)  # Wait for password login screen to load
+            wait_until_settled(driver, 2)  # Wait for password login screen to load
             
             take_screenshot(driver, "1-3_password_button_clicked", report_dir)
             
@@ -283,8 +264,9 @@ def test_password_login_flow(driver, report_dir):
         # Step 2: Wait for the password login screen to fully load
         try:
             print("\n--- Step 2: Waiting for Password Login Screen to Load ---")
+            begin_step(driver, "Step 2: Waiting for Password Login Screen to Load")
             print("Waiting for password login screen to fully load...")
-            time.sleep(3)  # Wait for screen transition
+            wait_until_screen_stable(driver, 3)  # Wait for the screen transition to finish
             take_screenshot(driver, "1-4_password_screen_loaded", report_dir)
             
         except Exception as e:
@@ -295,101 +277,15 @@ def test_password_login_flow(driver, report_dir):
         # Step 3: Enter email
         try:
             print("\n--- Step 3: Entering Email Address ---")
+            begin_step(driver, "Step 3: Entering Email Address")
             
             # Try multiple locator strategies for email field
             locators = LocatorStrategy.get_input_field_locators(Config.Locators.EMAIL_FIELD, 0)
-            email_field = None
-            
-            for by, locator in locators:
-                try:
-                    print(f"Trying to find email field using {by}...")
-                    email_field = WebDriverWait(driver, 10).until(
-                        EC.presence_of_element_located((by, locator))
-                    )
-                    print(f"Found email field using {by}")
-                    break
-                except TimeoutException:
-                    continue
-            
-            if not email_field:
-                raise Exception("Could not find email field with any locator strategy")
+            email_field = resolve_first(driver, locators, "email field", EC.presence_of_element_located, snapshot=snapshot)
             
-            # Step 3a: Click on email field and delete existing content
-            try:
-                print("Clicking on email field to focus it...")
-                email_field.click()
-                time.sleep(1)
-                
-                print("Deleting existing email content...")
-                # Try multiple deletion strategies focused on select all + delete
-                deletion_strategies = [
-                    # Strategy 1: Double click to select all, then delete
-                    lambda: (email_field.click(), time.sleep(0.5), email_field.click(), time.sleep(0.5), email_field.send_keys(Keys.DELETE)),
-                    # Strategy 2: Long press to select all, then delete
-                    lambda: ActionChains(driver).move_to_element(email_field).click_and_hold().pause(2).release().pause(1).send_keys(Keys.DELETE).perform(),
-                    # Strategy 3: Use Android keycodes for select all and delete
-                    lambda: (driver.press_keycode(123), time.sleep(0.5), driver.press_keycode(67), time.sleep(0.5), driver.press_keycode(112)),
-                    # Strategy 4: Clear method
-                    lambda: email_field.clear(),
-                    # Strategy 5: ActionChains with keyboard shortcuts
-                    lambda: ActionChains(driver).move_to_element(email_field).click().pause(1).send_keys(Keys.CONTROL + "a").pause(1).send_keys(Keys.DELETE).perform(),
-                    # Strategy 6: Direct keyboard shortcuts
-                    lambda: email_field.send_keys(Keys.CONTROL + "a" + Keys.DELETE),
-                ]
-                
-                content_deleted = False
-                for i, strategy in enumerate(deletion_strategies):
-                    try:
-                        print(f"Trying deletion strategy {i+1}...")
-                        strategy()
-                        time.sleep(1)
-                        content_deleted = True
-                        print("Email field content deleted successfully")
-                        break
-                    except Exception as e:
-                        print(f"Deletion strategy {i+1} failed: {str(e)}")
-                        continue
-                
-                if not content_deleted:
-                    print("Warning: Could not delete email field content, proceeding anyway")
-                
-                # Click back to ensure field is focused
-                print("Clicking back on email field to ensure focus...")
-                email_field.click()
-                time.sleep(1)
-                
-            except Exception as e:
-                print(f"Could not delete email field content: {str(e)}")
-            
-            # Clear the field first to ensure clean input
-            try:
-                print("Clearing email field first...")
-                email_field.clear()
-                time.sleep(1)
-            except Exception as e:
-                print(f"Could not clear email field: {str(e)}")
-            
-            # Try multiple input strategies
-            input_strategies = [
-                lambda: email_field.send_keys(Config.TEST_EMAIL),
-                lambda: ActionChains(driver).move_to_element(email_field).click().pause(1).send_keys(Config.TEST_EMAIL).perform(),
-                lambda: email_field.send_keys(Config.TEST_EMAIL)
-            ]
-            
-            email_entered = False
-            for i, strategy in enumerate(input_strategies):
-                try:
-                    print(f"Trying email input strategy {i+1}...")
-                    strategy()
-                    email_entered = True
-                    print("Email entered successfully")
-                    break
-                except Exception as e:
-                    print(f"Email input strategy {i+1} failed: {str(e)}")
-                    continue
-            
-            if not email_entered:
-                raise Exception("Failed to enter email with any input strategy")
+            # One verified set-value instead of the delete/clear/type cascades
+            fill_field(driver, email_field, Config.TEST_EMAIL, "email field", secret=False,
+                       locator=Config.Locators.EMAIL_FIELD)
             
             take_screenshot(driver, "1-5_email_entered", report_dir)
             
@@ -401,57 +297,17 @@ def test_password_login_flow(driver, report_dir):
         # Step 4: Enter password
         try:
             print("\n--- Step 4: Entering Password ---")
+            begin_step(driver, "Step 4: Entering Password")
             
             # Try multiple locator strategies for password field
             locators = LocatorStrategy.get_input_field_locators(Config.Locators.PASSWORD_FIELD, 1)
-            password_field = None
-            
-            for by, locator in locators:
-                try:
-                    print(f"Trying to find password field using {by}...")
-                    password_field = WebDriverWait(driver, 10).until(
-                        EC.presence_of_element_located((by, locator))
-                    )
-                    print(f"Found password field using {by}")
-                    break
-                except TimeoutException:
-                    continue
-            
-            if not password_field:
-                raise Exception("Could not find password field with any locator strategy")
+            password_field = resolve_first(driver, locators, "password field", EC.presence_of_element_located, snapshot=snapshot)
             
             # Log field attributes for debugging
-            print(f"Password field attributes:")
-            print(f"  Enabled: {password_field.is_enabled()}")
-            print(f"  Displayed: {password_field.is_displayed()}")
-            print(f"  Location: {password_field.location}")
-            print(f"  Size: {password_field.size}")
-            
-            # Try multiple input strategies
-            password_entered = False
-            for i, strategy in enumerate(input_strategies):
-                try:
-                    print(f"Trying password input strategy {i+1}...")
-                    if i == 2:  # Clear and send strategy
-                        password_field.clear()
-                        time.sleep(1)
-                        password_field.send_keys(Config.TEST_PASSWORD)
-                    else:
-                        # Adapt strategy for password
-                        if i == 0:
-                            password_field.send_keys(Config.TEST_PASSWORD)
-                        else:
-                            ActionChains(driver).move_to_element(password_field).click().pause(1).send_keys(Config.TEST_PASSWORD).perform()
-                    
-                    password_entered = True
-                    print("Password entered successfully")
-                    break
-                except Exception as e:
-                    print(f"Password input strategy {i+1} failed: {str(e)}")
-                    continue
+            snapshot.print_attributes("Password field", password_field)
             
-            if not password_entered:
-                raise Exception("Failed to enter password with any input strategy")
+            fill_field(driver, password_field, Config.TEST_PASSWORD, "password field", secret=True,
+                       locator=Config.Locators.PASSWORD_FIELD)
             
             # Hide keyboard after entering password
             print("Hiding keyboard after entering password...")
@@ -461,7 +317,7 @@ def test_password_login_flow(driver, report_dir):
             except Exception as e:
                 print(f"Could not hide keyboard: {str(e)}")
             
-            time.sleep(1)  # Let the UI settle
+            wait_until_settled(driver, 1)  # Let the UI settle
             take_screenshot(driver, "1-6_password_entered", report_dir)
             
         except Exception as e:
@@ -472,6 +328,7 @@ def test_password_login_flow(driver, report_dir):
         # Step 5: Accept terms and conditions
         try:
             print("\n--- Step 5: Accepting Terms and Conditions ---")
+            begin_step(driver, "Step 5: Accepting Terms and Conditions")
             
             # Hide keyboard before handling checkbox
             print("Ensuring keyboard is hidden before checkbox interaction...")
@@ -480,7 +337,7 @@ def test_password_login_flow(driver, report_dir):
                 print("Keyboard hidden successfully")
             except Exception:
                 print("No keyboard to hide or hide failed")
-            time.sleep(1)  # Let the UI settle
+            wait_until_settled(driver, 1)  # Let the UI settle
             
             # Try multiple locator strategies for checkbox
             locators = LocatorStrategy.get_checkbox_locators(Config.Locators.TERMS_CHECKBOX)
@@ -490,42 +347,32 @@ def test_password_login_flow(driver, report_dir):
             for attempt in range(max_attempts):
                 print(f"Terms acceptance attempt {attempt + 1}/{max_attempts}")
                 
-                for by, locator in locators:
-                    try:
-                        print(f"Trying to find checkbox using {by}...")
-                        checkbox = WebDriverWait(driver, 10).until(
-                            EC.presence_of_element_located((by, locator))
-                        )
-                        print(f"Found checkbox using {by}")
-                        break
-                    except TimeoutException:
-                        continue
+                try:
+                    checkbox = resolve_first(driver, locators, "checkbox", EC.presence_of_element_located, snapshot=snapshot)
+                except TimeoutException:
+                    checkbox = None
                 
                 if checkbox:
                     # Log checkbox attributes
-                    print(f"Checkbox attributes:")
-                    print(f"  Enabled: {checkbox.is_enabled()}")
-                    print(f"  Displayed: {checkbox.is_displayed()}")
-                    print(f"  Location: {checkbox.location}")
-                    print(f"  Size: {checkbox.size}")
+                    snapshot.print_attributes("Checkbox", checkbox)
                     
                     # Try to click the checkbox
                     try:
                         print("Clicking checkbox...")
-                        checkbox.click()
+                        snapshot.click(checkbox)
                         print("Checkbox clicked successfully")
                         break
                     except Exception as e:
                         print(f"Checkbox click failed: {str(e)}")
                         if attempt < max_attempts - 1:
-                            time.sleep(2)
+                            wait_until_settled(driver, 2)
                             continue
                         else:
                             raise
                 else:
                     if attempt < max_attempts - 1:
                         print("Checkbox not found, retrying...")
-                        time.sleep(2)
+                        wait_until_settled(driver, 2)
                         continue
                     else:
                         raise Exception("Could not find checkbox with any locator strategy")
@@ -540,37 +387,20 @@ def test_password_login_flow(driver, report_dir):
         # Step 6: Click login button
         try:
             print("\n--- Step 6: Clicking Login Button ---")
+            begin_step(driver, "Step 6: Clicking Login Button")
             
             # Try multiple locator strategies for login button
             locators = LocatorStrategy.get_button_locators(Config.Locators.LOGIN_BUTTON)
-            login_button = None
-            
-            for by, locator in locators:
-                try:
-                    print(f"Trying to find login button using {by}...")
-                    login_button = WebDriverWait(driver, 10).until(
-                        EC.element_to_be_clickable((by, locator))
-                    )
-                    print(f"Found login button using {by}")
-                    break
-                except TimeoutException:
-                    continue
-            
-            if not login_button:
-                raise Exception("Could not find login button with any locator strategy")
+            login_button = resolve_first(driver, locators, "login button", EC.element_to_be_clickable, snapshot=snapshot)
             
             # Log login button attributes
-            print(f"Login button attributes:")
-            print(f"  Enabled: {login_button.is_enabled()}")
-            print(f"  Displayed: {login_button.is_displayed()}")
-            print(f"  Location: {login_button.location}")
-            print(f"  Size: {login_button.size}")
+            snapshot.print_attributes("Login button", login_button)
             
             # Click the login button
             print("Clicking login button...")
-            login_button.click()
+            snapshot.click(login_button)
             print("Login button clicked successfully")
-            time.sleep(2)  # Let the UI settle
+            wait_until_settled(driver, 2, target=compile_locator(Config.Locators.PROFILE_ICON))  # Let the UI settle
             
             take_screenshot(driver, "1-8_login_button_clicked", report_dir)
             
@@ -582,15 +412,16 @@ def test_password_login_flow(driver, report_dir):
         # Step 7: Verify login success
         try:
             print("\n--- Step 7: Verifying Login Success ---")
+            begin_step(driver, "Step 7: Verifying Login Success")
             
             # Wait for PROFILE ICON to appear
             print("Waiting for PROFILE ICON to appear...")
             PROFILE_ICON = WebDriverWait(driver, 20).until(
-                EC.presence_of_element_located((AppiumBy.XPATH, Config.Locators.PROFILE_ICON))
+                EC.presence_of_element_located(compile_locator(Config.Locators.PROFILE_ICON))
             )
             
             # Verify the PROFILE ICON is displayed
-            time.sleep(5)  # Wait 5 seconds after profile icon verification
+            wait_until_screen_stable(driver, 5)  # Let the home screen settle after profile icon verification
             if PROFILE_ICON.is_displayed():
                 print("PROFILE ICON found and displayed - Login successful!")
                 take_screenshot(driver, "1-9_login_success", report_dir)
@@ -616,41 +447,25 @@ def test_logout_flow(driver, report_dir):
     """Test case for logout flow (reused from Logout_Test.py)"""
     try:
         print("\n=== Starting Logout Flow Test ===")
+        snapshot = UiSnapshot(driver)
         
         # Step 1: Click on the profile icon
         try:
             print("\n--- Step 1: Clicking Profile Icon ---")
+            begin_step(driver, "Step 1: Clicking Profile Icon")
             
             # Try multiple locator strategies for profile icon
             locators = LocatorStrategy.get_image_view_locators(Config.Locators.PROFILE_ICON)
-            profile_icon = None
-            
-            for by, locator in locators:
-                try:
-                    print(f"Trying to find profile icon using {by}...")
-                    profile_icon = WebDriverWait(driver, 10).until(
-                        EC.element_to_be_clickable((by, locator))
-                    )
-                    print(f"Found profile icon using {by}")
-                    break
-                except TimeoutException:
-                    continue
-            
-            if not profile_icon:
-                raise Exception("Could not find profile icon with any locator strategy")
+            profile_icon = resolve_first(driver, locators, "profile icon", EC.element_to_be_clickable, snapshot=snapshot)
             
             # Log profile icon attributes
-            print(f"Profile icon attributes:")
-            print(f"  Enabled: {profile_icon.is_enabled()}")
-            print(f"  Displayed: {profile_icon.is_displayed()}")
-            print(f"  Location: {profile_icon.location}")
-            print(f"  Size: {profile_icon.size}")
+            snapshot.print_attributes("Profile icon", profile_icon)
             
             # Click the profile icon
             print("Clicking profile icon...")
-            profile_icon.click()
+            snapshot.click(profile_icon)
             print("Profile icon clicked successfully")
-            time.sleep(2)  # Wait for navigation
+            wait_until_settled(driver, 2, target=compile_locator(Config.Locators.MY_ACCOUNT_SECTION))  # Wait for navigation
             
             take_screenshot(driver, "2-1_profile_icon_clicked", report_dir)
             
@@ -662,25 +477,20 @@ def test_logout_flow(driver, report_dir):
         # Step 2: Wait until "My account" appears and click on it
         try:
             print("\n--- Step 2: Accessing My Account Section ---")
+            begin_step(driver, "Step 2: Accessing My Account Section")
             
             # Wait for "My account" section to appear
             print("Waiting for 'My account' section to appear...")
-            my_account_section = WebDriverWait(driver, 15).until(
-                EC.presence_of_element_located((By.XPATH, Config.Locators.MY_ACCOUNT_SECTION))
-            )
+            my_account_section = snapshot.wait_for_element(compile_locator(Config.Locators.MY_ACCOUNT_SECTION), 15)
             
             # Log my account section attributes
-            print(f"My account section attributes:")
-            print(f"  Enabled: {my_account_section.is_enabled()}")
-            print(f"  Displayed: {my_account_section.is_displayed()}")
-            print(f"  Location: {my_account_section.location}")
-            print(f"  Size: {my_account_section.size}")
+            snapshot.print_attributes("My account section", my_account_section)
             
             # Click on My account
             print("Clicking on My account...")
-            my_account_section.click()
+            snapshot.click(my_account_section)
             print("My account clicked successfully")
-            time.sleep(2)  # Wait for navigation
+            wait_until_settled(driver, 2, target=compile_locator(Config.Locators.LOGOUT_BUTTON))  # Wait for navigation
             
             take_screenshot(driver, "2-2_my_account_clicked", report_dir)
             
@@ -696,37 +506,20 @@ def test_logout_flow(driver, report_dir):
         # Step 3: Click on the logout button
         try:
             print("\n--- Step 3: Clicking Logout Button ---")
+            begin_step(driver, "Step 3: Clicking Logout Button")
             
             # Try multiple locator strategies for logout button
             locators = LocatorStrategy.get_button_locators(Config.Locators.LOGOUT_BUTTON)
-            logout_button = None
-            
-            for by, locator in locators:
-                try:
-                    print(f"Trying to find logout button using {by}...")
-                    logout_button = WebDriverWait(driver, 10).until(
-                        EC.element_to_be_clickable((by, locator))
-                    )
-                    print(f"Found logout button using {by}")
-                    break
-                except TimeoutException:
-                    continue
-            
-            if not logout_button:
-                raise Exception("Could not find logout button with any locator strategy")
+            logout_button = resolve_first(driver, locators, "logout button", EC.element_to_be_clickable, snapshot=snapshot)
             
             # Log logout button attributes
-            print(f"Logout button attributes:")
-            print(f"  Enabled: {logout_button.is_enabled()}")
-            print(f"  Displayed: {logout_button.is_displayed()}")
-            print(f"  Location: {logout_button.location}")
-            print(f"  Size: {logout_button.size}")
+            snapshot.print_attributes("Logout button", logout_button)
             
             # Click the logout button
             print("Clicking logout button...")
-            logout_button.click()
+            snapshot.click(logout_button)
             print("Logout button clicked successfully")
-            time.sleep(2)  # Wait for popup to appear
+            wait_until_settled(driver, 2, target=compile_locator(Config.Locators.CONFIRMATION_POPUP))  # Wait for popup to appear
             
             take_screenshot(driver, "2-3_logout_button_clicked", report_dir)
             
@@ -738,29 +531,22 @@ def test_logout_flow(driver, report_dir):
         # Step 4: Wait for confirmation popup and click Confirm
         try:
             print("\n--- Step 4: Handling Confirmation Popup ---")
+            begin_step(driver, "Step 4: Handling Confirmation Popup")
             
             # Wait for confirmation popup to appear
             print("Waiting for confirmation popup to appear...")
-            confirmation_popup = WebDriverWait(driver, 10).until(
-                EC.presence_of_element_located((By.XPATH, Config.Locators.CONFIRMATION_POPUP))
-            )
+            confirmation_popup = snapshot.wait_for_element(compile_locator(Config.Locators.CONFIRMATION_POPUP), 10)
             
             # Log popup attributes
-            print(f"Confirmation popup attributes:")
-            print(f"  Enabled: {confirmation_popup.is_enabled()}")
-            print(f"  Displayed: {confirmation_popup.is_displayed()}")
-            print(f"  Location: {confirmation_popup.location}")
-            print(f"  Size: {confirmation_popup.size}")
+            snapshot.print_attributes("Confirmation popup", confirmation_popup)
             
             # Click on Confirm button
             print("Clicking Confirm button...")
-            confirm_button = WebDriverWait(driver, 10).until(
-                EC.element_to_be_clickable((By.XPATH, Config.Locators.CONFIRM_BUTTON))
-            )
+            confirm_button = snapshot.wait_for_element(compile_locator(Config.Locators.CONFIRM_BUTTON), 10, EC.element_to_be_clickable)
             
-            confirm_button.click()
+            snapshot.click(confirm_button)
             print("Confirm button clicked successfully")
-            time.sleep(2)  # Wait for logout process
+            wait_until_settled(driver, 2, target=compile_locator(Config.Locators.LOGIN_PAGE_VERIFICATION))  # Wait for logout process
             
             take_screenshot(driver, "2-4_confirmation_popup_handled", report_dir)
             
@@ -776,20 +562,21 @@ def test_logout_flow(driver, report_dir):
         # Step 5: Verify redirection to Login page
         try:
             print("\n--- Step 5: Verifying Login Page Redirection ---")
+            begin_step(driver, "Step 5: Verifying Login Page Redirection")
             
             # Wait for login page to appear
             print("Waiting for login page to appear...")
             login_page_element = WebDriverWait(driver, 15).until(
-                EC.presence_of_element_located((By.XPATH, Config.Locators.LOGIN_PAGE_VERIFICATION))
+                EC.presence_of_element_located(compile_locator(Config.Locators.LOGIN_PAGE_VERIFICATION))
             )
             
             # Verify the login page element is displayed
             if login_page_element.is_displayed():
                 print("Login page element found and displayed - Logout successful!")
                 
-                # Add short wait after redirection as requested
-                print("Waiting 2 seconds after redirection...")
-                time.sleep(2)
+                # Let the login page settle after redirection
+                print("Waiting for login page to settle after redirection...")
+                wait_until_settled(driver, 2)
                 
                 take_screenshot(driver, "2-5_logout_success", report_dir)
                 return True
@@ -811,7 +598,7 @@ def test_logout_flow(driver, report_dir):
         raise
 
 # ===== Main Test Function =====
-def run_zoomcat_password_login_tests():
+def run_zoomcat_password_login_tests(driver=None):
     """Main function to run all ZoomCat password login tests"""
     report_dir = create_report_dir("Login by Password test")
     print(f"\n=== Running ZoomCat Mobile Password Login Tests with report directory: {report_dir} ===")
@@ -822,14 +609,20 @@ def run_zoomcat_password_login_tests():
         "logout_flow": "NOT_RUN"
     }
     
-    driver = None
+    owns_driver = driver is None
+    trace = None
     
     try:
         # Initialize mobile driver
         print("\n" + "="*60)
         print("INITIALIZING MOBILE DRIVER")
         print("="*60)
-        driver = initialize_mobile_driver(report_dir)
+        if owns_driver:
+            driver = initialize_mobile_driver(report_dir)
+        else:
+            print("Using shared mobile driver session")
+            take_screenshot(driver, "1-1_driver_attached", report_dir)
+        trace = start_trace(driver, report_dir, "Login by Password test")
         
         # Test: Password login flow
         print("\n" + "="*60)
@@ -883,8 +676,11 @@ def run_zoomcat_password_login_tests():
         raise
         
     finally:
-        if driver:
+        if trace:
+            trace.stop()
+        if driver and owns_driver:
             print("\n=== Cleaning up and closing mobile driver ===")
+            flush_screenshots()
             driver.quit()
 
 # ===== Pytest Integration =====
@@ -922,6 +718,7 @@ class TestZoomCatPasswordLogin:
             
         finally:
             if driver:
+                flush_screenshots()
                 driver.quit()
     
     def test_logout_flow_pytest(self, setup_test_environment):
@@ -952,6 +749,7 @@ class TestZoomCatPasswordLogin:
             
         finally:
             if driver:
+                flush_screenshots()
                 driver.quit()
 
 # ===== Script Execution =====
@@ -14,19 +14,30 @@ This script automates the process of:
 import time
 import pytest
 import os
+import sys
 from datetime import datetime
 from pathlib import Path
 from appium import webdriver
 from appium.options.android import UiAutomator2Options
-from selenium.webdriver.common.by import By
-from appium.webdriver.common.appiumby import AppiumBy
 from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
-from selenium.common.exceptions import TimeoutException, InvalidElementStateException
+from selenium.common.exceptions import TimeoutException
 from selenium.webdriver.common.action_chains import ActionChains
 from appium.webdriver.common.mobileby import MobileBy
 from typing import Tuple, List, Optional
 
+# Shared helpers live in mobile_automation/ at the repository root
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+from mobile_automation.connection import open_connection
+from mobile_automation.interaction import highlight_element, interact
+from mobile_automation.locator_compiler import compile_locator, compiled_candidates
+from mobile_automation.locators import resolve_first
+from mobile_automation.profiler import profile_driver
+from mobile_automation.screenshots import capture_screenshot, flush_screenshots
+from mobile_automation.snapshot import UiSnapshot
+from mobile_automation.tracing import begin_step, start_trace
+from mobile_automation.waits import wait_for_app_ready, wait_until_settled
+
 # ===== Global Configuration =====
 class Config:
     """Centralized configuration class"""
@@ -66,36 +77,22 @@ def create_report_dir(test_name="Logout Test"):
     return test_dir
 
 def take_screenshot(driver, step_name, report_dir):
-    """Takes and saves a screenshot with the given step name"""
+    """Takes a screenshot with the given step name, written to disk in the background"""
     screenshot_path = os.path.join(report_dir, f"{step_name}.png")
-    driver.save_screenshot(screenshot_path)
-    print(f"Screenshot saved: {screenshot_path}")
+    screenshot_path = capture_screenshot(driver, screenshot_path)
+    if screenshot_path:
+        print(f"Screenshot saved: {screenshot_path}")
 
 def highlight_and_wait(driver, element, wait_time=1):
-    """Highlights an element with a red border and waits"""
-    try:
-        driver.execute_script("arguments[0].style.border='3px solid red'", element)
-        time.sleep(wait_time)
-    except Exception:
-        # Mobile elements don't support style modification, just wait
+    """Highlights an element and waits only if the highlight is visible on the device (webview)"""
+    if highlight_element(driver, element):
         time.sleep(wait_time)
 
 def interact_with_element(driver, element, action, step_name, report_dir, wait_time=1, **kwargs):
     """Handles element interaction with screenshots and highlighting"""
     try:
-        highlight_and_wait(driver, element, 1)
-        
-        if action == "click":
-            element.click()
-        elif action == "send_keys":
-            element.send_keys(kwargs.get('keys', ''))
-        elif action == "clear":
-            element.clear()
-        elif action == "clear_and_send":
-            element.clear()
-            element.send_keys(kwargs.get('keys', ''))
-        
-        time.sleep(wait_time)
+        interact(driver, element, action, **kwargs)
+        wait_until_settled(driver, wait_time)
         take_screenshot(driver, step_name, report_dir)
         
     except Exception as e:
@@ -106,7 +103,8 @@ def wait_for_app_load(driver, wait):
     """Wait for the mobile app to load completely"""
     try:
         print("Waiting for app to load completely...")
-        time.sleep(5)  # Initial wait for app startup
+        wait_for_app_ready(driver, wait, Config.CAPABILITIES["appium:appPackage"],
+                           compile_locator(Config.Locators.PROFILE_ICON), launch="Logout Test")
         print("App loaded successfully")
     except Exception:
         print("App load timeout")
@@ -150,7 +148,7 @@ class LocatorStrategy:
     def get_image_view_locators(image_xpath: str) -> List[Tuple[str, str]]:
         """Get multiple locator strategies for image views (profile icon)"""
         return [
-            (By.XPATH, image_xpath),
+            *compiled_candidates(image_xpath),
             (MobileBy.CLASS_NAME, "android.widget.ImageView"),
             (MobileBy.ANDROID_UIAUTOMATOR, 'new UiSelector().className("android.widget.ImageView")')
         ]
@@ -159,7 +157,7 @@ class LocatorStrategy:
     def get_section_locators(section_xpath: str) -> List[Tuple[str, str]]:
         """Get multiple locator strategies for sections"""
         return [
-            (By.XPATH, section_xpath),
+            *compiled_candidates(section_xpath),
             (MobileBy.CLASS_NAME, "android.widget.FrameLayout")
         ]
     
@@ -167,7 +165,7 @@ class LocatorStrategy:
     def get_button_locators(button_xpath: str) -> List[Tuple[str, str]]:
         """Get multiple locator strategies for buttons"""
         return [
-            (By.XPATH, button_xpath),
+            *compiled_candidates(button_xpath),
             (MobileBy.CLASS_NAME, "android.widget.Button"),
             (MobileBy.ANDROID_UIAUTOMATOR, 'new UiSelector().className("android.view.View")')
         ]
@@ -176,7 +174,7 @@ class LocatorStrategy:
     def get_popup_locators(popup_xpath: str) -> List[Tuple[str, str]]:
         """Get multiple locator strategies for popups"""
         return [
-            (By.XPATH, popup_xpath),
+            *compiled_candidates(popup_xpath),
             (MobileBy.CLASS_NAME, "android.widget.FrameLayout")
         ]
 
@@ -187,8 +185,8 @@ def initialize_mobile_driver(report_dir):
         print("\n=== Starting mobile driver initialization ===")
         
         options = DriverUtils.create_driver_options()
-        driver = webdriver.Remote(Config.APPIUM_SERVER, options=options)
-        driver.implicitly_wait(10)
+        driver = profile_driver(webdriver.Remote(open_connection(Config.APPIUM_SERVER), options=options))
+        driver.implicitly_wait(0)
         
         print("Mobile driver initialized successfully")
         take_screenshot(driver, "1-1_driver_initialized", report_dir)
@@ -203,6 +201,7 @@ def test_logout_flow(driver, report_dir):
     """Test case for logout flow"""
     try:
         print("\n=== Starting Logout Flow Test ===")
+        snapshot = UiSnapshot(driver)
         
         # Wait for app to load completely
         print("Waiting for app to load completely...")
@@ -212,37 +211,20 @@ def test_logout_flow(driver, report_dir):
         # Step 1: Click on the profile icon
         try:
             print("\n--- Step 1: Clicking Profile Icon ---")
+            begin_step(driver, "Step 1: Clicking Profile Icon")
             
             # Try multiple locator strategies for profile icon
             locators = LocatorStrategy.get_image_view_locators(Config.Locators.PROFILE_ICON)
-            profile_icon = None
-            
-            for by, locator in locators:
-                try:
-                    print(f"Trying to find profile icon using {by}...")
-                    profile_icon = WebDriverWait(driver, 10).until(
-                        EC.element_to_be_clickable((by, locator))
-                    )
-                    print(f"Found profile icon using {by}")
-                    break
-                except TimeoutException:
-                    continue
-            
-            if not profile_icon:
-                raise Exception("Could not find profile icon with any locator strategy")
+            profile_icon = resolve_first(driver, locators, "profile icon", EC.element_to_be_clickable, snapshot=snapshot)
             
             # Log profile icon attributes
-            print(f"Profile icon attributes:")
-            print(f"  Enabled: {profile_icon.is_enabled()}")
-            print(f"  Displayed: {profile_icon.is_displayed()}")
-            print(f"  Location: {profile_icon.location}")
-            print(f"  Size: {profile_icon.size}")
+            snapshot.print_attributes("Profile icon", profile_icon)
             
             # Click the profile icon
             print("Clicking profile icon...")
-            profile_icon.click()
+            snapshot.click(profile_icon)
             print("Profile icon clicked successfully")
-            time.sleep(2)  # Wait for navigation
+            wait_until_settled(driver, 2, target=compile_locator(Config.Locators.MY_ACCOUNT_SECTION))  # Wait for navigation
             
             take_screenshot(driver, "1-3_profile_icon_clicked", report_dir)
             
@@ -254,25 +236,20 @@ def test_logout_flow(driver, report_dir):
         # Step 2: Wait until "My account" appears and click on it
         try:
             print("\n--- Step 2: Accessing My Account Section ---")
+            begin_step(driver, "Step 2: Accessing My Account Section")
             
             # Wait for "My account" section to appear
             print("Waiting for 'My account' section to appear...")
-            my_account_section = WebDriverWait(driver, 15).until(
-                EC.presence_of_element_located((By.XPATH, Config.Locators.MY_ACCOUNT_SECTION))
-            )
+            my_account_section = snapshot.wait_for_element(compile_locator(Config.Locators.MY_ACCOUNT_SECTION), 15)
             
             # Log my account section attributes
-            print(f"My account section attributes:")
-            print(f"  Enabled: {my_account_section.is_enabled()}")
-            print(f"  Displayed: {my_account_section.is_displayed()}")
-            print(f"  Location: {my_account_section.location}")
-            print(f"  Size: {my_account_section.size}")
+            snapshot.print_attributes("My account section", my_account_section)
             
             # Click on My account
             print("Clicking on My account...")
-            my_account_section.click()
+            snapshot.click(my_account_section)
             print("My account clicked successfully")
-            time.sleep(2)  # Wait for navigation
+            wait_until_settled(driver, 2, target=compile_locator(Config.Locators.LOGOUT_BUTTON))  # Wait for navigation
             
             take_screenshot(driver, "1-4_my_account_clicked", report_dir)
             
@@ -288,37 +265,20 @@ def test_logout_flow(driver, report_dir):
         # Step 3: Click on the logout button
         try:
             print("\n--- Step 3: Clicking Logout Button ---")
+            begin_step(driver, "Step 3: Clicking Logout Button")
             
             # Try multiple locator strategies for logout button
             locators = LocatorStrategy.get_button_locators(Config.Locators.LOGOUT_BUTTON)
-            logout_button = None
-            
-            for by, locator in locators:
-                try:
-                    print(f"Trying to find logout button using {by}...")
-                    logout_button = WebDriverWait(driver, 10).until(
-                        EC.element_to_be_clickable((by, locator))
-                    )
-                    print(f"Found logout button using {by}")
-                    break
-                except TimeoutException:
-                    continue
-            
-            if not logout_button:
-                raise Exception("Could not find logout button with any locator strategy")
+            logout_button = resolve_first(driver, locators, "logout button", EC.element_to_be_clickable, snapshot=snapshot)
             
             # Log logout button attributes
-            print(f"Logout button attributes:")
-            print(f"  Enabled: {logout_button.is_enabled()}")
-            print(f"  Displayed: {logout_button.is_displayed()}")
-            print(f"  Location: {logout_button.location}")
-            print(f"  Size: {logout_button.size}")
+            snapshot.print_attributes("Logout button", logout_button)
             
             # Click the logout button
             print("Clicking logout button...")
-            logout_button.click()
+            snapshot.click(logout_button)
             print("Logout button clicked successfully")
-            time.sleep(2)  # Wait for popup to appear
+            wait_until_settled(driver, 2, target=compile_locator(Config.Locators.CONFIRMATION_POPUP))  # Wait for popup to appear
             
             take_screenshot(driver, "1-5_logout_button_clicked", report_dir)
             
@@ -330,29 +290,22 @@ def test_logout_flow(driver, report_dir):
         # Step 4: Wait for confirmation popup and click Confirm
         try:
             print("\n--- Step 4: Handling Confirmation Popup ---")
+            begin_step(driver, "Step 4: Handling Confirmation Popup")
             
             # Wait for confirmation popup to appear
             print("Waiting for confirmation popup to appear...")
-            confirmation_popup = WebDriverWait(driver, 10).until(
-                EC.presence_of_element_located((By.XPATH, Config.Locators.CONFIRMATION_POPUP))
-            )
+            confirmation_popup = snapshot.wait_for_element(compile_locator(Config.Locators.CONFIRMATION_POPUP), 10)
             
             # Log popup attributes
-            print(f"Confirmation popup attributes:")
-            print(f"  Enabled: {confirmation_popup.is_enabled()}")
-            print(f"  Displayed: {confirmation_popup.is_displayed()}")
-            print(f"  Location: {confirmation_popup.location}")
-            print(f"  Size: {confirmation_popup.size}")
+            snapshot.print_attributes("Confirmation popup", confirmation_popup)
             
             # Click on Confirm button
             print("Clicking Confirm button...")
-            confirm_button = WebDriverWait(driver, 10).until(
-                EC.element_to_be_clickable((By.XPATH, Config.Locators.CONFIRM_BUTTON))
-            )
+            confirm_button = snapshot.wait_for_element(compile_locator(Config.Locators.CONFIRM_BUTTON), 10, EC.element_to_be_clickable)
             
-            confirm_button.click()
+            snapshot.click(confirm_button)
             print("Confirm button clicked successfully")
-            time.sleep(2)  # Wait for logout process
+            wait_until_settled(driver, 2, target=compile_locator(Config.Locators.LOGIN_PAGE_VERIFICATION))  # Wait for logout process
             
             take_screenshot(driver, "1-6_confirmation_popup_handled", report_dir)
             
@@ -368,20 +321,21 @@ def test_logout_flow(driver, report_dir):
         # Step 5: Verify redirection to Login page
         try:
             print("\n--- Step 5: Verifying Login Page Redirection ---")
+            begin_step(driver, "Step 5: Verifying Login Page Redirection")
             
             # Wait for login page to appear
             print("Waiting for login page to appear...")
             login_page_element = WebDriverWait(driver, 15).until(
-                EC.presence_of_element_located((By.XPATH, Config.Locators.LOGIN_PAGE_VERIFICATION))
+                EC.presence_of_element_located(compile_locator(Config.Locators.LOGIN_PAGE_VERIFICATION))
             )
             
             # Verify the login page element is displayed
             if login_page_element.is_displayed():
                 print("Login page element found and displayed - Logout successful!")
                 
-                # Add short wait after redirection as requested
-                print("Waiting 2 seconds after redirection...")
-                time.sleep(2)
+                # Let the login page settle after redirection
+                print("Waiting for login page to settle after redirection...")
+                wait_until_settled(driver, 2)
                 
                 take_screenshot(driver, "1-7_logout_success", report_dir)
                 return True
@@ -403,7 +357,7 @@ def test_logout_flow(driver, report_dir):
         raise
 
 # ===== Main Test Function =====
-def run_zoomcat_logout_tests():
+def run_zoomcat_logout_tests(driver=None):
     """Main function to run all ZoomCat logout tests"""
     report_dir = create_report_dir("Logout Test")
     print(f"\n=== Running ZoomCat Mobile Logout Tests with report directory: {report_dir} ===")
@@ -413,14 +367,20 @@ def run_zoomcat_logout_tests():
         "logout_flow": "NOT_RUN"
     }
     
-    driver = None
+    owns_driver = driver is None
+    trace = None
     
     try:
         # Initialize mobile driver
         print("\n" + "="*60)
         print("INITIALIZING MOBILE DRIVER")
         print("="*60)
-        driver = initialize_mobile_driver(report_dir)
+        if owns_driver:
+            driver = initialize_mobile_driver(report_dir)
+        else:
+            print("Using shared mobile driver session")
+            take_screenshot(driver, "1-1_driver_attached", report_dir)
+        trace = start_trace(driver, report_dir, "Logout Test")
         
         # Test: Logout flow
         print("\n" + "="*60)
@@ -461,8 +421,11 @@ def run_zoomcat_logout_tests():
         raise
         
     finally:
-        if driver:
+        if trace:
+            trace.stop()
+        if driver and owns_driver:
             print("\n=== Cleaning up and closing mobile driver ===")
+            flush_screenshots()
             driver.quit()
 
 # ===== Pytest Integration =====
@@ -500,6 +463,7 @@ class TestZoomCatLogout:
             
         finally:
             if driver:
+                flush_screenshots()
                 driver.quit()
 
 # ===== Script Execution =====
@@ -10,22 +10,31 @@ This script automates the process of:
 """
 
 # ===== Imports =====
-import time
 import pytest
 import os
+import sys
 from datetime import datetime
 from pathlib import Path
 from appium import webdriver
 from appium.options.android import UiAutomator2Options
-from selenium.webdriver.common.by import By
-from appium.webdriver.common.appiumby import AppiumBy
 from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
-from selenium.common.exceptions import TimeoutException, InvalidElementStateException
+from selenium.common.exceptions import TimeoutException
 from selenium.webdriver.common.action_chains import ActionChains
 from appium.webdriver.common.mobileby import MobileBy
 from typing import Tuple, List, Optional
 
+# Shared helpers live in mobile_automation/ at the repository root
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+from mobile_automation.connection import open_connection
+from mobile_automation.interaction import click
+from mobile_automation.locator_compiler import compile_locator, compiled_candidates
+from mobile_automation.locators import resolve_first
+from mobile_automation.profiler import profile_driver
+from mobile_automation.screenshots import capture_screenshot, flush_screenshots
+from mobile_automation.tracing import begin_step, start_trace
+from mobile_automation.waits import wait_for_app_ready, wait_until_settled
+
 # ===== Global Configuration =====
 class Config:
     """Centralized configuration class"""
@@ -63,16 +72,18 @@ def create_report_dir(test_name="Purchase History Test"):
     return test_dir
 
 def take_screenshot(driver, step_name, report_dir):
-    """Takes and saves a screenshot with the given step name"""
+    """Takes a screenshot with the given step name, written to disk in the background"""
     screenshot_path = os.path.join(report_dir, f"{step_name}.png")
-    driver.save_screenshot(screenshot_path)
-    print(f"Screenshot saved: {screenshot_path}")
+    screenshot_path = capture_screenshot(driver, screenshot_path)
+    if screenshot_path:
+        print(f"Screenshot saved: {screenshot_path}")
 
 def wait_for_app_load(driver, wait):
     """Wait for the mobile app to load completely"""
     try:
         print("Waiting for app to load completely...")
-        time.sleep(5)  # Initial wait for app startup
+        wait_for_app_ready(driver, wait, Config.CAPABILITIES["appium:appPackage"],
+                           compile_locator(Config.Locators.PROFILE_ICON), launch="Purchase History Test")
         print("App loaded successfully")
     except Exception:
         print("App load timeout")
@@ -116,7 +127,7 @@ class LocatorStrategy:
     def get_image_view_locators(image_xpath: str) -> List[Tuple[str, str]]:
         """Get multiple locator strategies for image views (profile icon)"""
         return [
-            (By.XPATH, image_xpath),
+            *compiled_candidates(image_xpath),
             (MobileBy.CLASS_NAME, "android.widget.ImageView"),
             (MobileBy.ANDROID_UIAUTOMATOR, 'new UiSelector().className("android.widget.ImageView")')
         ]
@@ -125,7 +136,7 @@ class LocatorStrategy:
     def get_copy_button_locators(copy_xpath: str) -> List[Tuple[str, str]]:
         """Get multiple locator strategies for copy buttons"""
         return [
-            (By.XPATH, copy_xpath),
+            *compiled_candidates(copy_xpath),
             (MobileBy.CLASS_NAME, "android.widget.ImageView"),
             (MobileBy.ANDROID_UIAUTOMATOR, 'new UiSelector().className("android.widget.ImageView")')
         ]
@@ -137,8 +148,8 @@ def initialize_mobile_driver(report_dir):
         print("\n=== Starting mobile driver initialization ===")
         
         options = DriverUtils.create_driver_options()
-        driver = webdriver.Remote(Config.APPIUM_SERVER, options=options)
-        driver.implicitly_wait(10)
+        driver = profile_driver(webdriver.Remote(open_connection(Config.APPIUM_SERVER), options=options))
+        driver.implicitly_wait(0)
         
         print("Mobile driver initialized successfully")
         take_screenshot(driver, "1-1_driver_initialized", report_dir)
@@ -162,28 +173,16 @@ def test_purchase_history_flow(driver, report_dir):
         # Step 1: Click on the profile icon
         try:
             print("\n--- Step 1: Clicking Profile Icon ---")
+            begin_step(driver, "Step 1: Clicking Profile Icon")
             
             # Try multiple locator strategies for profile icon
             locators = LocatorStrategy.get_image_view_locators(Config.Locators.PROFILE_ICON)
-            profile_icon = None
-            
-            for by, locator in locators:
-                try:
-                    profile_icon = WebDriverWait(driver, 10).until(
-                        EC.element_to_be_clickable((by, locator))
-                    )
-                    print(f"Found profile icon using {by}")
-                    break
-                except TimeoutException:
-                    continue
-            
-            if not profile_icon:
-                raise Exception("Could not find profile icon with any locator strategy")
+            profile_icon = resolve_first(driver, locators, "profile icon", EC.element_to_be_clickable)
             
             # Click the profile icon
-            profile_icon.click()
+            click(driver, profile_icon)
             print("Profile icon clicked successfully")
-            time.sleep(2)  # Wait for navigation
+            wait_until_settled(driver, 2, target=compile_locator(Config.Locators.ORDER_HISTORY_SECTION))  # Wait for navigation
             
             take_screenshot(driver, "1-3_profile_icon_clicked", report_dir)
             
@@ -195,16 +194,17 @@ def test_purchase_history_flow(driver, report_dir):
         # Step 2: Click on Order history
         try:
             print("\n--- Step 2: Accessing Order History Section ---")
+            begin_step(driver, "Step 2: Accessing Order History Section")
             
             # Wait for "Order history" section to appear
             order_history_section = WebDriverWait(driver, 15).until(
-                EC.element_to_be_clickable((By.XPATH, Config.Locators.ORDER_HISTORY_SECTION))
+                EC.element_to_be_clickable(compile_locator(Config.Locators.ORDER_HISTORY_SECTION))
             )
             
             # Click on Order history
-            order_history_section.click()
+            click(driver, order_history_section)
             print("Order history clicked successfully")
-            time.sleep(3)  # Wait for order history page to load
+            wait_until_settled(driver, 3, target=compile_locator(Config.Locators.COPY_BUTTON))  # Wait for order history page to load
             
             take_screenshot(driver, "1-4_order_history_clicked", report_dir)
             
@@ -220,10 +220,11 @@ def test_purchase_history_flow(driver, report_dir):
         # Step 3: Verify user is on the correct page
         try:
             print("\n--- Step 3: Verifying User is on Order History Page ---")
+            begin_step(driver, "Step 3: Verifying User is on Order History Page")
             
             # Wait for "Order history" page title to appear
             order_history_title = WebDriverWait(driver, 10).until(
-                EC.presence_of_element_located((By.XPATH, Config.Locators.ORDER_HISTORY_SECTION))
+                EC.presence_of_element_located(compile_locator(Config.Locators.ORDER_HISTORY_SECTION))
             )
             
             # Verify the order history title is displayed
@@ -234,10 +235,11 @@ def test_purchase_history_flow(driver, report_dir):
                 # Step 3a: Verify copy button appears on the page
                 try:
                     print("\n--- Step 3a: Verifying Copy Button Appears ---")
+                    begin_step(driver, "Step 3a: Verifying Copy Button Appears")
                     
                     # Wait for copy button to appear
                     copy_button = WebDriverWait(driver, 10).until(
-                        EC.presence_of_element_located((By.XPATH, Config.Locators.COPY_BUTTON))
+                        EC.presence_of_element_located(compile_locator(Config.Locators.COPY_BUTTON))
                     )
                     
                     if copy_button.is_displayed():
@@ -258,16 +260,17 @@ def test_purchase_history_flow(driver, report_dir):
                 # Step 4: Click back button to return to home page
                 try:
                     print("\n--- Step 4: Clicking Back Button ---")
+                    begin_step(driver, "Step 4: Clicking Back Button")
                     
                     # Wait for back button to appear
                     back_button = WebDriverWait(driver, 10).until(
-                        EC.element_to_be_clickable((By.XPATH, Config.Locators.BACK_BUTTON))
+                        EC.element_to_be_clickable(compile_locator(Config.Locators.BACK_BUTTON))
                     )
                     
                     # Click the back button
-                    back_button.click()
+                    click(driver, back_button)
                     print("Back button clicked successfully")
-                    time.sleep(2)  # Wait for navigation
+                    wait_until_settled(driver, 2, target=compile_locator(Config.Locators.PROFILE_ICON))  # Wait for navigation
                     
                     take_screenshot(driver, "1-6_back_button_clicked", report_dir)
                     
@@ -279,10 +282,11 @@ def test_purchase_history_flow(driver, report_dir):
                 # Step 5: Verify user is back to home page
                 try:
                     print("\n--- Step 5: Verifying Return to Home Page ---")
+                    begin_step(driver, "Step 5: Verifying Return to Home Page")
                     
                     # Wait for profile icon to appear (indicating home page)
                     profile_icon_home = WebDriverWait(driver, 10).until(
-                        EC.presence_of_element_located((By.XPATH, Config.Locators.PROFILE_ICON))
+                        EC.presence_of_element_located(compile_locator(Config.Locators.PROFILE_ICON))
                     )
                     
                     # Verify the profile icon is displayed
@@ -290,10 +294,10 @@ def test_purchase_history_flow(driver, report_dir):
                         print("Profile icon found and displayed - User successfully returned to home page!")
                         take_screenshot(driver, "1-7_home_page_verified", report_dir)
                         
-                        # Wait for 5 seconds as requested
-                        print("Waiting for 5 seconds...")
-                        time.sleep(5)
-                        print("5-second wait completed")
+                        # Let the home page settle before handing over to the next suite
+                        print("Waiting for home page to settle...")
+                        waited = wait_until_settled(driver, 5)
+                        print(f"Home page settled after {waited:.1f}s")
                         
                         return True
                     else:
@@ -326,7 +330,7 @@ def test_purchase_history_flow(driver, report_dir):
         raise
 
 # ===== Main Test Function =====
-def run_zoomcat_purchase_history_tests():
+def run_zoomcat_purchase_history_tests(driver=None):
     """Main function to run all ZoomCat purchase history tests"""
     report_dir = create_report_dir("Purchase History Test")
     print(f"\n=== Running ZoomCat Mobile Purchase History Tests with report directory: {report_dir} ===")
@@ -336,14 +340,20 @@ def run_zoomcat_purchase_history_tests():
         "purchase_history_flow": "NOT_RUN"
     }
     
-    driver = None
+    owns_driver = driver is None
+    trace = None
     
     try:
         # Initialize mobile driver
         print("\n" + "="*60)
         print("INITIALIZING MOBILE DRIVER")
         print("="*60)
-        driver = initialize_mobile_driver(report_dir)
+        if owns_driver:
+            driver = initialize_mobile_driver(report_dir)
+        else:
+            print("Using shared mobile driver session")
+            take_screenshot(driver, "1-1_driver_attached", report_dir)
+        trace = start_trace(driver, report_dir, "Purchase History Test")
         
         # Test: Purchase history flow
         print("\n" + "="*60)
@@ -384,8 +394,11 @@ def run_zoomcat_purchase_history_tests():
         raise
         
     finally:
-        if driver:
+        if trace:
+            trace.stop()
+        if driver and owns_driver:
             print("\n=== Cleaning up and closing mobile driver ===")
+            flush_screenshots()
             driver.quit()
 
 # ===== Script Execution =====
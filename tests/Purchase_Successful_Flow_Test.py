@@ -1,12 +1,23 @@
 import os
 import sys
-import time
 from datetime import datetime
+from pathlib import Path
 from appium import webdriver
 from selenium.webdriver.common.by import By
 from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
-from selenium.common.exceptions import TimeoutException, NoSuchElementException
+from selenium.common.exceptions import TimeoutException
+
+# Shared helpers live in mobile_automation/ at the repository root
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+from mobile_automation.connection import open_connection
+from mobile_automation.interaction import click
+from mobile_automation.locator_compiler import compile_locator
+from mobile_automation.profiler import profile_driver
+from mobile_automation.recording import start_recording
+from mobile_automation.screenshots import capture_screenshot, flush_screenshots
+from mobile_automation.tracing import begin_step, start_trace
+from mobile_automation.waits import wait_for_app_ready, wait_until_settled
 
 # Appium Configuration
 APPIUM_SERVER = "http://localhost:4723"
@@ -31,16 +42,21 @@ class Locators:
     PROFILE_ICON_CONNECT_PAGE = "//android.widget.ScrollView/android.widget.FrameLayout/android.widget.FrameLayout[1]/android.widget.FrameLayout/android.widget.FrameLayout/android.widget.ImageView"
 
 class PurchaseSuccessfulFlowTest:
-    def __init__(self):
-        self.driver = None
+    def __init__(self, driver=None):
+        # A driver passed in (e.g. from the runner's session pool) is borrowed, not owned
+        self.driver = driver
+        self.owns_driver = driver is None
         self.report_dir = None
         self.test_name = "Purchase Successful Flow"
         
     def setup_driver(self):
         """Initialize the mobile driver"""
+        if not self.owns_driver:
+            print("=== Using shared mobile driver session ===")
+            return True
         print("=== Starting mobile driver initialization ===")
         try:
-            self.driver = webdriver.Remote(APPIUM_SERVER, CAPABILITIES)
+            self.driver = profile_driver(webdriver.Remote(open_connection(APPIUM_SERVER), CAPABILITIES))
             print("Mobile driver initialized successfully")
             return True
         except Exception as e:
@@ -53,9 +69,10 @@ class PurchaseSuccessfulFlowTest:
             timestamp = datetime.now().strftime("%H%M%S")
             filename = f"{step_name}_{timestamp}.png"
             filepath = os.path.join(self.report_dir, filename)
-            self.driver.get_screenshot_as_file(filepath)
-            print(f"Screenshot saved: {filepath}")
-            return filepath
+            filepath = capture_screenshot(self.driver, filepath)
+            if filepath:
+                print(f"Screenshot saved: {filepath}")
+                return filepath
         return None
     
     def wait_for_element(self, locator, timeout=10, element_type="XPATH"):
@@ -63,7 +80,7 @@ class PurchaseSuccessfulFlowTest:
         try:
             if element_type == "XPATH":
                 element = WebDriverWait(self.driver, timeout).until(
-                    EC.presence_of_element_located((By.XPATH, locator))
+                    EC.presence_of_element_located(compile_locator(locator))
                 )
             else:
                 element = WebDriverWait(self.driver, timeout).until(
@@ -79,7 +96,7 @@ class PurchaseSuccessfulFlowTest:
         element = self.wait_for_element(locator, timeout, element_type)
         if element:
             try:
-                element.click()
+                click(self.driver, element)
                 return True
             except Exception as e:
                 print(f"Failed to click element: {e}")
@@ -93,6 +110,7 @@ class PurchaseSuccessfulFlowTest:
         try:
             # Step 1: Click the Buy tab
             print("--- Step 1: Click Buy Tab ---")
+            begin_step(self.driver, "Step 1: Click Buy Tab")
             if self.click_element(Locators.BUY_TAB):
                 print("Buy tab clicked successfully")
                 self.take_screenshot("01_buy_tab_clicked")
@@ -124,8 +142,8 @@ class PurchaseSuccessfulFlowTest:
                     print("Connect page did not load")
                     return False
                 
-                # Wait a moment for page to stabilize
-                time.sleep(3)
+                # Wait for page to stabilize
+                wait_until_settled(self.driver, 3)
                 
                 # Restart test from Step 1
                 print("--- Restarting test from Step 1 ---")
@@ -133,16 +151,18 @@ class PurchaseSuccessfulFlowTest:
             
             # Step 2: Wait for Purchase page
             print("--- Step 2: Wait for Purchase Page ---")
+            begin_step(self.driver, "Step 2: Wait for Purchase Page")
             if self.wait_for_element(Locators.PURCHASE_BUTTON):
                 print("Purchase page appeared successfully")
                 self.take_screenshot("02_purchase_page_loaded")
             else:
                 print("Purchase page did not appear")
                 return False
-            time.sleep(5)
+            wait_until_settled(self.driver, 5)
             
             # Step 3: Click Purchase button
             print("--- Step 3: Click Purchase Button ---")
+            begin_step(self.driver, "Step 3: Click Purchase Button")
             if self.click_element(Locators.PURCHASE_BUTTON):
                 print("Purchase button clicked successfully")
                 self.take_screenshot("03_purchase_button_clicked")
@@ -152,6 +172,7 @@ class PurchaseSuccessfulFlowTest:
             
             # Step 4: Wait for Google Play payment screen
             print("--- Step 4: Wait for Google Play Payment Screen ---")
+            begin_step(self.driver, "Step 4: Wait for Google Play Payment Screen")
             if self.wait_for_element(Locators.GOOGLE_PLAY_IMAGE):
                 print("Google Play payment screen appeared successfully")
                 self.take_screenshot("04_google_play_screen")
@@ -161,6 +182,7 @@ class PurchaseSuccessfulFlowTest:
             
             # Step 5: Click 1-tap buy button
             print("--- Step 5: Click 1-tap Buy Button ---")
+            begin_step(self.driver, "Step 5: Click 1-tap Buy Button")
             if self.click_element(Locators.ONE_TAP_BUY_BUTTON):
                 print("1-tap buy button clicked successfully")
                 self.take_screenshot("05_one_tap_buy_clicked")
@@ -168,12 +190,14 @@ class PurchaseSuccessfulFlowTest:
                 print("Failed to click 1-tap buy button")
                 return False
             
-            # Step 6: Wait for 5 seconds
-            print("--- Step 6: Waiting 5 seconds ---")
-            time.sleep(5)
+            # Step 6: Wait for the payment to complete
+            print("--- Step 6: Waiting for payment to complete ---")
+            begin_step(self.driver, "Step 6: Waiting for payment to complete")
+            wait_until_settled(self.driver, 5, target=compile_locator(Locators.PURCHASE_SUCCESSFUL_SCREEN))
             
             # Step 7: Verify Purchase successful screen
             print("--- Step 7: Verify Purchase Successful Screen ---")
+            begin_step(self.driver, "Step 7: Verify Purchase Successful Screen")
             if self.wait_for_element(Locators.PURCHASE_SUCCESSFUL_SCREEN):
                 print("Purchase successful screen appeared")
                 self.take_screenshot("06_purchase_successful_screen")
@@ -183,6 +207,7 @@ class PurchaseSuccessfulFlowTest:
             
             # Step 8: Click Go to Connect button
             print("--- Step 8: Click Go to Connect Button ---")
+            begin_step(self.driver, "Step 8: Click Go to Connect Button")
             if self.click_element(Locators.GO_TO_CONNECT_BUTTON):
                 print("Go to Connect button clicked successfully")
                 self.take_screenshot("07_go_to_connect_clicked")
@@ -192,6 +217,7 @@ class PurchaseSuccessfulFlowTest:
             
             # Step 9: Wait for Connect page and locate profile icon
             print("--- Step 9: Wait for Connect Page and Profile Icon ---")
+            begin_step(self.driver, "Step 9: Wait for Connect Page and Profile Icon")
             if self.wait_for_element(Locators.PROFILE_ICON_CONNECT_PAGE):
                 print("Connect page loaded and profile icon found")
                 self.take_screenshot("08_connect_page_loaded")
@@ -199,9 +225,10 @@ class PurchaseSuccessfulFlowTest:
                 print("Connect page did not load or profile icon not found")
                 return False
             
-            # Step 10: Wait for 5 seconds
-            print("--- Step 10: Waiting 5 seconds ---")
-            time.sleep(5)
+            # Step 10: Let the Connect page settle
+            print("--- Step 10: Waiting for UI to settle ---")
+            begin_step(self.driver, "Step 10: Waiting for UI to settle")
+            wait_until_settled(self.driver, 5)
             
             print(f"{self.test_name} completed: PASSED")
             return True
@@ -224,10 +251,18 @@ class PurchaseSuccessfulFlowTest:
         if not self.setup_driver():
             return False
         
+        trace = start_trace(self.driver, self.report_dir, self.test_name)
+        
+        recording = start_recording(self.driver, self.report_dir)
+        success = False
         try:
             # Wait for app to load
             print("Waiting for app to load completely...")
-            time.sleep(5)
+            try:
+                wait_for_app_ready(self.driver, WebDriverWait(self.driver, 20), CAPABILITIES["appium:appPackage"],
+                                   compile_locator(Locators.BUY_TAB), launch=self.test_name)
+            except TimeoutException:
+                print("App did not report ready within 20 seconds, continuing")
             self.take_screenshot("1-1_driver_initialized")
             
             # Run the test
@@ -239,9 +274,14 @@ class PurchaseSuccessfulFlowTest:
             return success
             
         finally:
+            if trace:
+                trace.stop()
+            if recording:
+                recording.stop(failed=not success)
             # Cleanup
-            if self.driver:
+            if self.driver and self.owns_driver:
                 print("=== Cleaning up and closing mobile driver ===")
+                flush_screenshots()
                 self.driver.quit()
 
 def main():
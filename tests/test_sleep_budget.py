@@ -0,0 +1,68 @@
+"""
+Sleep budget enforcement across suites that share a thread
+A suite that breaks its budget with policy fail:S raises SleepBudgetExceeded
+out of its own code. The scheduler thread (one per device) and the device
+farm worker then run the next suite on the same thread, which must not
+inherit the violation.
+"""
+
+import sys
+import time
+from pathlib import Path
+
+import pytest
+
+# Shared helpers live in mobile_automation/ at the repository root
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+from mobile_automation import sleeps
+from mobile_automation.device_farm import run_task
+from mobile_automation.scheduler import Suite, SuiteScheduler
+from mobile_automation.tracing import start_trace
+
+class FakeDriver:
+    """Just enough of a driver for a step trace"""
+
+    def __init__(self, session_id: str):
+        self.session_id = session_id
+
+    def execute(self, command, params=None):
+        return {"value": None}
+
+class FakePool:
+    """A session pool whose sessions are fake drivers"""
+
+    default_device = "emulator-5554"
+
+    def acquire(self, suite_name: str, device=None):
+        return FakeDriver(suite_name)
+
+def traced_suite(name: str, seconds: float, report_dir: Path):
+    """A suite that sleeps for seconds inside its own trace and passes if the sleep returns"""
+    def _run(driver):
+        trace = start_trace(driver, str(report_dir), name)
+        try:
+            time.sleep(seconds)
+        finally:
+            trace.stop()
+        return "PASSED"
+    return _run
+
+@pytest.fixture
+def fail_policy():
+    sleeps.set_sleep_policy("fail:0.05")
+    yield
+    sleeps.set_sleep_policy("off")
+
+def test_scheduler_next_suite_passes_after_budget_violation(tmp_path, fail_policy):
+    suites = [
+        Suite("greedy", traced_suite("scheduler greedy", 0.1, tmp_path)),
+        Suite("innocent", traced_suite("scheduler innocent", 0.01, tmp_path), after=["greedy"]),
+    ]
+    results = SuiteScheduler(suites, FakePool()).run()
+    assert results == {"greedy": "FAILED", "innocent": "PASSED"}
+
+def test_worker_next_suite_passes_after_budget_violation(tmp_path, fail_policy):
+    pool = FakePool()
+    greedy = run_task(traced_suite("worker greedy", 0.1, tmp_path), pool, "greedy", "Greedy", "emulator-5554")
+    innocent = run_task(traced_suite("worker innocent", 0.01, tmp_path), pool, "innocent", "Innocent", "emulator-5554")
+    assert (greedy, innocent) == ("FAILED", "PASSED")
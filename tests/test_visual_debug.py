@@ -0,0 +1,85 @@
+"""
+Visual-debug overlays on the step screenshots
+With visual debug on, the clicks and fills the suites make mark their
+element, and the next screenshot of the session is written with a red box
+around it. With visual debug off, marking sends nothing to the device.
+"""
+
+import base64
+import io
+import sys
+from pathlib import Path
+
+import pytest
+
+Image = pytest.importorskip("PIL.Image")
+
+# Shared helpers live in mobile_automation/ at the repository root
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+from mobile_automation import interaction
+from mobile_automation.interaction import OVERLAY_COLOR, click, set_visual_debug
+from mobile_automation.screenshots import capture_screenshot, flush_screenshots
+from mobile_automation.snapshot import UiSnapshot
+
+BUTTON = {"x": 40, "y": 60, "width": 100, "height": 50}
+
+class FakeElement:
+    """A native element that records the commands it is sent"""
+
+    def __init__(self, commands):
+        self.id = "button"
+        self.commands = commands
+
+    @property
+    def rect(self):
+        self.commands.append("rect")
+        return dict(BUTTON)
+
+    def click(self):
+        self.commands.append("click")
+
+class FakeDriver:
+    """A native-context session whose screen is plain white"""
+
+    def __init__(self, session_id: str):
+        self.session_id = session_id
+        self.current_context = "NATIVE_APP"
+
+    def get_screenshot_as_base64(self):
+        output = io.BytesIO()
+        Image.new("RGB", (240, 200), "white").save(output, format="PNG")
+        return base64.b64encode(output.getvalue()).decode("ascii")
+
+@pytest.fixture
+def visual_debug():
+    set_visual_debug(True)
+    yield
+    set_visual_debug(False)
+
+def overlay_pixels(path: Path) -> int:
+    """How many pixels of the screenshot at path are in the overlay colour"""
+    with Image.open(path) as image:
+        colors = image.convert("RGB").getcolors(maxcolors=image.width * image.height)
+    return dict((color, count) for count, color in colors).get(OVERLAY_COLOR, 0)
+
+def test_snapshot_click_draws_overlay(tmp_path, visual_debug):
+    driver, commands = FakeDriver("snapshot click"), []
+    UiSnapshot(driver).click(FakeElement(commands))
+    path = capture_screenshot(driver, str(tmp_path / "reports" / "run" / "1_clicked.png"))
+    flush_screenshots()
+    assert commands == ["rect", "click"]
+    assert overlay_pixels(Path(path)) > 0
+
+def test_click_draws_overlay(tmp_path, visual_debug):
+    driver, commands = FakeDriver("plain click"), []
+    click(driver, FakeElement(commands))
+    path = capture_screenshot(driver, str(tmp_path / "reports" / "run" / "1_clicked.png"))
+    flush_screenshots()
+    assert overlay_pixels(Path(path)) > 0
+
+def test_click_without_visual_debug_sends_only_the_click():
+    driver, commands = FakeDriver("no visual debug"), []
+    assert not interaction.VISUAL_DEBUG
+    click(driver, FakeElement(commands))
+    assert commands == ["click"]
+    assert interaction.take_highlights(driver) == []